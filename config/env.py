@@ -6,3 +6,80 @@ load_dotenv()
 ALPHAVANTAGE_API_KEY = os.getenv("ALPHAVANTAGE_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
+
+# Alpha Vantage HTTP session: timeouts, retries of connection errors and 5xx
+# responses with jittered exponential backoff, and kept-alive connections
+ALPHAVANTAGE_CONNECT_TIMEOUT_SECONDS = float(
+    os.getenv("ALPHAVANTAGE_CONNECT_TIMEOUT_SECONDS", "5")
+)
+ALPHAVANTAGE_READ_TIMEOUT_SECONDS = float(
+    os.getenv("ALPHAVANTAGE_READ_TIMEOUT_SECONDS", "30")
+)
+ALPHAVANTAGE_MAX_RETRIES = int(os.getenv("ALPHAVANTAGE_MAX_RETRIES", "3"))
+ALPHAVANTAGE_BACKOFF_SECONDS = float(os.getenv("ALPHAVANTAGE_BACKOFF_SECONDS", "1"))
+ALPHAVANTAGE_POOL_SIZE = int(os.getenv("ALPHAVANTAGE_POOL_SIZE", "10"))
+
+# Alpha Vantage quota (free tier: 5 per minute, 25 per day; 0 disables a limit).
+# The state file keeps the daily count across restarts and is shared between
+# processes; set it empty to keep the counters in memory
+ALPHAVANTAGE_REQUESTS_PER_MINUTE = int(
+    os.getenv("ALPHAVANTAGE_REQUESTS_PER_MINUTE", "5")
+)
+ALPHAVANTAGE_REQUESTS_PER_DAY = int(os.getenv("ALPHAVANTAGE_REQUESTS_PER_DAY", "25"))
+# Time zone whose midnight resets the daily quota
+ALPHAVANTAGE_QUOTA_TIMEZONE = os.getenv("ALPHAVANTAGE_QUOTA_TIMEZONE", "UTC")
+# Seconds a request that kept returning rate limit messages is not sent again
+ALPHAVANTAGE_THROTTLE_COOLDOWN_SECONDS = float(
+    os.getenv("ALPHAVANTAGE_THROTTLE_COOLDOWN_SECONDS", "300")
+)
+ALPHAVANTAGE_RATE_LIMIT_STATE_FILE = (
+    os.getenv(
+        "ALPHAVANTAGE_RATE_LIMIT_STATE_FILE", "cache/alpha_vantage_rate_limit.json"
+    )
+    or None
+)
+
+# Source of fundamental data: "alphavantage" (live API behind the cache) or
+# "local" (statement files or a columnar snapshot at LOCAL_DATA_PATH)
+FUNDAMENTAL_DATA_PROVIDER = os.getenv("FUNDAMENTAL_DATA_PROVIDER", "alphavantage")
+LOCAL_DATA_PATH = os.getenv("LOCAL_DATA_PATH", "data/fundamentals")
+
+# Directory of the compressed archive of raw API responses, which the cache can
+# be rebuilt from without API calls; empty disables the archive
+ALPHAVANTAGE_ARCHIVE_DIR = os.getenv("ALPHAVANTAGE_ARCHIVE_DIR", "") or None
+
+# Budget of the in-memory cache tier (0 disables a limit). It bounds the parsed
+# models; the json backend keeps all raw records in memory regardless
+CACHE_MEMORY_MAX_ENTRIES = int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", "2000")) or None
+CACHE_MEMORY_MAX_BYTES = (
+    int(os.getenv("CACHE_MEMORY_MAX_BYTES", str(256 * 1024 * 1024))) or None
+)
+CACHE_MEMORY_BUDGET_SET = any(
+    os.getenv(name) for name in ("CACHE_MEMORY_MAX_ENTRIES", "CACHE_MEMORY_MAX_BYTES")
+)
+
+# Storage engine of the fundamental data cache: "json", "sqlite" or "columnar".
+# Defaults to sqlite, which reads records per key, when a memory budget is set
+CACHE_BACKEND = os.getenv(
+    "CACHE_BACKEND", "sqlite" if CACHE_MEMORY_BUDGET_SET else "json"
+)
+
+# Cache durability: "immediate" persists every change, "write_behind" buffers
+# changes and flushes them on an interval, an operation count and at exit
+CACHE_WRITE_MODE = os.getenv("CACHE_WRITE_MODE", "write_behind")
+CACHE_FLUSH_INTERVAL_SECONDS = float(os.getenv("CACHE_FLUSH_INTERVAL_SECONDS", "5"))
+CACHE_FLUSH_EVERY_OPERATIONS = int(os.getenv("CACHE_FLUSH_EVERY_OPERATIONS", "100"))
+
+# Cache freshness per data type
+CACHE_TTL_OVERVIEW_HOURS = float(os.getenv("CACHE_TTL_OVERVIEW_HOURS", "24"))
+CACHE_TTL_EXCHANGE_RATE_HOURS = float(os.getenv("CACHE_TTL_EXCHANGE_RATE_HOURS", "24"))
+CACHE_TTL_FX_HISTORY_DAYS = float(os.getenv("CACHE_TTL_FX_HISTORY_DAYS", "30"))
+CACHE_TTL_STATEMENTS_DAYS = float(os.getenv("CACHE_TTL_STATEMENTS_DAYS", "365"))
+CACHE_TTL_SYMBOL_QUERY_HOURS = float(os.getenv("CACHE_TTL_SYMBOL_QUERY_HOURS", "168"))
+# Serve stale cache entries immediately and refresh them in the background
+CACHE_STALE_WHILE_REVALIDATE = (
+    os.getenv("CACHE_STALE_WHILE_REVALIDATE", "true").lower() == "true"
+)
+
+# Fold the cache journal into a new snapshot after this many records
+CACHE_JOURNAL_COMPACT_RECORDS = int(os.getenv("CACHE_JOURNAL_COMPACT_RECORDS", "1000"))
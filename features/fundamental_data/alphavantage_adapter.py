@@ -1,52 +1,322 @@
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-import requests
-from config.env import ALPHAVANTAGE_API_KEY
+from typing import Any, Callable, Iterable
 from .model import (
     FundamentalData,
     StockMetaData,
     BalanceSheetReport,
     CashFlowReport,
     IncomeStatementReport,
+    FinancialReport,
+    CalculatedMetrics,
 )
 from .cache import get_cache
+from .http_client import ThrottledError, get_http_client
+from .fx_rates import USD, FxRates, parse_fx_monthly
+from .metrics import calculate_metrics
+from .periods import ALL_PERIODS, ANNUAL_ONLY, PeriodSelection
+from .single_flight import SingleFlight
 
-# Get the cache instance
+# Get the shared cache and HTTP client instances
 cache = get_cache()
+http_client = get_http_client()
+
+# SYMBOL_SEARCH returns at most 10 best matches
+SYMBOL_SEARCH_LIMIT = 10
+
+# Data types fetched together for a ticker, in the order they are returned
+TICKER_DATA_TYPES = ("overview", "balance_sheet", "income_statement", "cash_flow")
 
 
 class DataResult:
     """Container for API results with source information."""
 
-    def __init__(self, data, from_cache: bool, cache_timestamp: str = None):
+    def __init__(
+        self,
+        data,
+        from_cache: bool,
+        cache_timestamp: str = None,
+        source: str | None = None,
+    ):
         self.data = data
         self.from_cache = from_cache
         self.cache_timestamp = cache_timestamp
-        self.source = "cache" if from_cache else "API"
+        self.source = source or ("cache" if from_cache else "API")
+
+
+class ThrottledResult(DataResult):
+    """Empty result of a request the API rate limited; nothing was cached."""
+
+    def __init__(self, data, message: str):
+        super().__init__(data, from_cache=False)
+        self.message = message
+        self.source = "throttled"
+
+
+def _cache_timestamp(data_type: str, symbol: str) -> str | None:
+    """Get the time a cached entry was fetched from its metadata."""
+    metadata = cache.get_entry_metadata(data_type, symbol)
+    return metadata.fetched_at if metadata else None
+
+
+# Background refreshes of stale cache entries (stale-while-revalidate)
+_revalidation_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="cache-revalidate"
+)
+_revalidating: set[tuple[str, str]] = set()
+
+# Concurrent fetches of the data types of a ticker; the shared rate limiter
+# still spaces out the requests that actually reach the API
+_ticker_data_executor = ThreadPoolExecutor(
+    max_workers=2 * len(TICKER_DATA_TYPES), thread_name_prefix="ticker-data"
+)
+_revalidating_lock = threading.Lock()
+
+
+def _revalidate(data_type: str, symbol: str, fetch: Callable[[str], DataResult]):
+    """Refresh a stale entry in the background, once per (data_type, symbol)."""
+    key = (data_type, symbol)
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    def refresh():
+        try:
+            fetch(symbol)
+        except Exception as e:
+            print(f"Error refreshing {data_type} for {symbol}: {e}")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    _revalidation_executor.submit(refresh)
+
+
+def _serve_from_cache(
+    data_type: str,
+    symbol: str,
+    cached_data: Any,
+    fetch: Callable[[str], DataResult],
+) -> DataResult | None:
+    """
+    Return cached data unless it is stale. Stale data is still served when the
+    cache policy allows stale-while-revalidate, and refreshed in the background.
+    """
+    if not cached_data:
+        return None
+
+    if cache.is_stale(data_type, symbol):
+        if not cache.policy.stale_while_revalidate:
+            return None
+        _revalidate(data_type, symbol, fetch)
+
+    return DataResult(
+        cached_data,
+        from_cache=True,
+        cache_timestamp=_cache_timestamp(data_type, symbol),
+    )
+
+
+# Concurrent API fetches of the same (data type, symbol) share one request
+_single_flight = SingleFlight()
+
+
+def _coalesced(data_type: str):
+    """Let concurrent fetches of the same symbol wait for and share one API request."""
+
+    def decorator(fetch: Callable[[str], DataResult]) -> Callable[[str], DataResult]:
+        @functools.wraps(fetch)
+        def wrapper(symbol: str) -> DataResult:
+            return _single_flight.do((data_type, symbol), lambda: fetch(symbol))
+
+        return wrapper
+
+    return decorator
+
+
+def _parse_annual_reports(
+    data: dict, model: type[FinancialReport]
+) -> list[FinancialReport]:
+    """
+    Transform the annual reports of a statement response into models. Quarterly
+    reports are cached raw and only parsed once a period selection asks for them.
+    """
+    return [
+        model(**report, annual_report=True) for report in data.get("annualReports", [])
+    ]
+
+
+# Response handlers shared by API fetches and archive replays: each transforms
+# a response body into models and caches them
+
+
+def _store_symbol_search(keywords: str, data: dict, source: str = "API") -> list[dict]:
+    """Cache the matches of a SYMBOL_SEARCH response."""
+    best_matches = data.get("bestMatches", [])
+
+    # Cache the individual symbol results for future intelligent matching
+    if best_matches:
+        cache.add_symbol_results(best_matches)
+    # Error and rate limit payloads have no bestMatches and are not cached
+    if "bestMatches" in data:
+        cache.set_query_results(keywords, best_matches, source=source)
+
+    return best_matches
+
+
+def _store_overview(symbol: str, data: dict, source: str = "API") -> StockMetaData:
+    """Cache the StockMetaData of an OVERVIEW response."""
+    overview = StockMetaData(**data)
+    cache.set_overview(symbol, overview, source=source)
+    _update_calculated_metrics(symbol)
+    return overview
+
+
+def _cache_statement(
+    data_type: str,
+    symbol: str,
+    data: dict,
+    model: type[FinancialReport],
+    source: str = "API",
+    replace: bool = False,
+) -> list[FinancialReport]:
+    """
+    Cache the annual models and the raw quarterly reports of a statement response.
+    With replace, annual reports of already cached periods are overwritten.
+    """
+    annual_reports = _parse_annual_reports(data, model)
+    quarterly_reports = data.get("quarterlyReports", [])
+
+    # Responses without reports are never cached
+    if annual_reports or quarterly_reports:
+        cache.set_quarterly_payload(data_type, symbol, quarterly_reports)
+        getattr(cache, f"set_{data_type}")(
+            symbol, annual_reports, source=source, replace=replace
+        )
+        _update_calculated_metrics(symbol)
+
+    return annual_reports
+
+
+def _store_exchange_rate(currency: str, data: dict, source: str = "API") -> float:
+    """Cache the rate to USD of a CURRENCY_EXCHANGE_RATE response."""
+    exchange_rate = float(data["Realtime Currency Exchange Rate"]["5. Exchange Rate"])
+    cache.set_exchange_rate(currency, exchange_rate, source=source)
+    return exchange_rate
+
+
+def _store_fx_history(
+    currency: str, data: dict, source: str = "API"
+) -> dict[str, float]:
+    """Cache the month end rates of an FX_MONTHLY response."""
+    history = parse_fx_monthly(data)
+    if history:
+        cache.set_fx_history(currency, history, source=source)
+    return history
+
+
+def _select_periods(
+    data_type: str, symbol: str, result: DataResult, periods: PeriodSelection
+) -> DataResult:
+    """
+    Narrow a freshly fetched statement, which holds the annual reports, down to
+    the selected periods. Fetches shared by concurrent callers stay untouched.
+    """
+    if not result.data:
+        return result
+    selected = cache.get_statement(data_type, symbol, periods)
+    if selected is None or selected == result.data:
+        return result
+    return DataResult(selected, from_cache=False)
+
+
+def _calculate_metrics(
+    symbol: str, periods: PeriodSelection
+) -> list[CalculatedMetrics]:
+    """Calculate the ratios of the selected periods from the cached statements."""
+    income_statement = cache.get_income_statement(symbol, periods)
+    balance_sheet = cache.get_balance_sheet(symbol, periods)
+    cash_flow = cache.get_cash_flow(symbol, periods)
+    if not (income_statement and balance_sheet and cash_flow):
+        return []
+
+    return calculate_metrics(
+        cache.get_overview(symbol), income_statement, balance_sheet, cash_flow
+    )
+
+
+def _update_calculated_metrics(symbol: str):
+    """Recalculate the stored ratios once all three statements of a symbol are cached."""
+    metrics = _calculate_metrics(symbol, ANNUAL_ONLY)
+    if metrics:
+        cache.set_calculated_metrics(symbol, metrics)
+
+
+def _comprehensive_data(
+    symbol: str,
+    results: dict[str, DataResult],
+    periods: PeriodSelection = ALL_PERIODS,
+) -> FundamentalData:
+    """Combine the results of the ticker data types with the calculated metrics."""
+    # Calculated Metrics of annual periods are stored whenever the statements are
+    # fetched; quarters are only parsed on request, so their ratios are calculated
+    # for the response without writing them to the cache
+    calculated_metrics = cache.get_calculated_metrics(symbol) or []
+    if not calculated_metrics or periods.includes_quarters:
+        by_period = {
+            metrics.fiscal_date_ending: metrics
+            for metrics in calculated_metrics + _calculate_metrics(symbol, periods)
+        }
+        calculated_metrics = sorted(
+            by_period.values(),
+            key=lambda metrics: metrics.fiscal_date_ending,
+            reverse=True,
+        )
+
+    return FundamentalData(
+        symbol=symbol,
+        overview=results["overview"].data,
+        balance_sheet=results["balance_sheet"].data,
+        cash_flow=results["cash_flow"].data,
+        income_statement=results["income_statement"].data,
+        calculated_metrics=calculated_metrics or None,
+        last_updated=datetime.now().isoformat(),
+    )
 
 
 class AlphaVantageAPI:
     @staticmethod
     def get_ticker_symbol(stock_name: str) -> DataResult:
         """Search for ticker symbol by company name with intelligent caching."""
+        # Repeated queries return the complete result list of the earlier search
+        query_results = cache.get_query_results(stock_name)
+        if query_results is not None:
+            return DataResult(query_results, from_cache=True)
+
         # Check cache first - search by symbol or company name
-        cached_results = cache.search_symbols(stock_name)
+        cached_results = cache.search_symbols(stock_name, limit=SYMBOL_SEARCH_LIMIT)
         if cached_results:
             return DataResult(cached_results, from_cache=True)
 
+        return AlphaVantageAPI._fetch_ticker_symbol(stock_name)
+
+    @staticmethod
+    @_coalesced("symbol_search")
+    def _fetch_ticker_symbol(stock_name: str) -> DataResult:
+        """Search for ticker symbols with the API and cache the results."""
         print(f"Searching for stock symbol: {stock_name}")
         try:
-            url = f"https://www.alphavantage.co/query?function=SYMBOL_SEARCH&keywords={stock_name}&apikey={ALPHAVANTAGE_API_KEY}"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            best_matches = data.get("bestMatches", [])
-
-            # Cache the individual symbol results for future intelligent matching
-            if best_matches:
-                cache.add_symbol_results(best_matches)
+            data = http_client.get_json("SYMBOL_SEARCH", keywords=stock_name)
+            best_matches = _store_symbol_search(stock_name, data)
 
             return DataResult(best_matches, from_cache=False)
 
+        except ThrottledError as e:
+            print(f"Rate limited searching for symbol '{stock_name}': {e}")
+            return ThrottledResult([], str(e))
         except Exception as e:
             print(f"Error searching for symbol '{stock_name}': {e}")
             return DataResult([], from_cache=False)
@@ -55,232 +325,312 @@ class AlphaVantageAPI:
     def get_ticker_overview(symbol: str) -> DataResult:
         """Get company overview data with caching."""
         # Check cache first
-        overview = cache.get_overview(symbol)
-        if overview:
-            cache_info = cache.get_cache_info()
-            cache_timestamp = (
-                cache_info.get("overview", {})
-                .get(symbol, {})
-                .get("timestamp", "unknown")
-            )
-            return DataResult(
-                overview, from_cache=True, cache_timestamp=cache_timestamp
-            )
+        cached_result = _serve_from_cache(
+            "overview",
+            symbol,
+            cache.get_overview(symbol),
+            AlphaVantageAPI._fetch_ticker_overview,
+        )
+        if cached_result:
+            return cached_result
 
+        return AlphaVantageAPI._fetch_ticker_overview(symbol)
+
+    @staticmethod
+    @_coalesced("overview")
+    def _fetch_ticker_overview(symbol: str) -> DataResult:
+        """Fetch company overview data from the API and cache it."""
         print(f"Getting stock overview for {symbol}")
         try:
-            url = f"https://www.alphavantage.co/query?function=OVERVIEW&symbol={symbol}&apikey={ALPHAVANTAGE_API_KEY}"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
+            data = http_client.get_json("OVERVIEW", symbol=symbol)
 
-            # Transform API response to StockMetaData model
-            overview = StockMetaData(**data)
-
-            # Cache the overview data
-            cache.set_overview(symbol, overview)
+            # Transform API response to StockMetaData model and cache it
+            overview = _store_overview(symbol, data)
 
             return DataResult(overview, from_cache=False)
 
+        except ThrottledError as e:
+            print(f"Rate limited fetching overview for {symbol}: {e}")
+            return ThrottledResult(None, str(e))
         except Exception as e:
             print(f"Error fetching overview for {symbol}: {e}")
             return DataResult(None, from_cache=False)
 
     @staticmethod
-    def get_balance_sheet(symbol: str) -> DataResult:
-        """Get balance sheet data with caching."""
+    def get_balance_sheet(
+        symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        """Get balance sheet data of the selected periods with caching."""
         # Check cache first
-        cached_data = cache.get_balance_sheet(symbol)
-        if cached_data:
-            cache_info = cache.get_cache_info()
-            cache_timestamp = (
-                cache_info.get("balance_sheet", {})
-                .get(symbol, {})
-                .get("timestamp", "unknown")
-            )
-            return DataResult(
-                cached_data, from_cache=True, cache_timestamp=cache_timestamp
-            )
+        cached_result = _serve_from_cache(
+            "balance_sheet",
+            symbol,
+            cache.get_balance_sheet(symbol, periods),
+            AlphaVantageAPI._fetch_balance_sheet,
+        )
+        if cached_result:
+            return cached_result
+
+        result = AlphaVantageAPI._fetch_balance_sheet(symbol)
+        return _select_periods("balance_sheet", symbol, result, periods)
 
+    @staticmethod
+    @_coalesced("balance_sheet")
+    def _fetch_balance_sheet(symbol: str) -> DataResult:
+        """Fetch balance sheet data from the API and cache it."""
         print(f"Getting balance sheet for {symbol}")
         try:
-            url = f"https://www.alphavantage.co/query?function=BALANCE_SHEET&symbol={symbol}&apikey={ALPHAVANTAGE_API_KEY}"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-
-            # Transform API response to BalanceSheetReport models
-            balance_sheet_reports = []
-
-            # Process annual reports
-            if "annualReports" in data:
-                for report in data["annualReports"]:
-                    balance_sheet_reports.append(
-                        BalanceSheetReport(**report, annual_report=True)
-                    )
-
-            # Process quarterly reports
-            if "quarterlyReports" in data:
-                for report in data["quarterlyReports"]:
-                    balance_sheet_reports.append(
-                        BalanceSheetReport(**report, quarter_report=True)
-                    )
-
-            # Cache the data
-            cache.set_balance_sheet(symbol, balance_sheet_reports)
+            data = http_client.get_json("BALANCE_SHEET", symbol=symbol)
+
+            # Transform API response to BalanceSheetReport models and cache them
+            balance_sheet_reports = _cache_statement(
+                "balance_sheet", symbol, data, BalanceSheetReport
+            )
 
             return DataResult(balance_sheet_reports, from_cache=False)
 
+        except ThrottledError as e:
+            print(f"Rate limited fetching balance sheet for {symbol}: {e}")
+            return ThrottledResult([], str(e))
         except Exception as e:
             print(f"Error fetching balance sheet for {symbol}: {e}")
             return DataResult([], from_cache=False)
 
     @staticmethod
-    def get_cash_flow(symbol: str) -> DataResult:
-        """Get cash flow data with caching."""
+    def get_cash_flow(
+        symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        """Get cash flow data of the selected periods with caching."""
         # Check cache first
-        cached_data = cache.get_cash_flow(symbol)
-        if cached_data:
-            cache_info = cache.get_cache_info()
-            cache_timestamp = (
-                cache_info.get("cash_flow", {})
-                .get(symbol, {})
-                .get("timestamp", "unknown")
-            )
-            return DataResult(
-                cached_data, from_cache=True, cache_timestamp=cache_timestamp
-            )
+        cached_result = _serve_from_cache(
+            "cash_flow",
+            symbol,
+            cache.get_cash_flow(symbol, periods),
+            AlphaVantageAPI._fetch_cash_flow,
+        )
+        if cached_result:
+            return cached_result
+
+        result = AlphaVantageAPI._fetch_cash_flow(symbol)
+        return _select_periods("cash_flow", symbol, result, periods)
 
+    @staticmethod
+    @_coalesced("cash_flow")
+    def _fetch_cash_flow(symbol: str) -> DataResult:
+        """Fetch cash flow data from the API and cache it."""
         print(f"Getting cash flow for {symbol}")
         try:
-            url = f"https://www.alphavantage.co/query?function=CASH_FLOW&symbol={symbol}&apikey={ALPHAVANTAGE_API_KEY}"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-
-            # Transform API response to CashFlowReport models
-            cash_flow_reports = []
-
-            # Process annual reports
-            if "annualReports" in data:
-                for report in data["annualReports"]:
-                    cash_flow_reports.append(
-                        CashFlowReport(**report, annual_report=True)
-                    )
-
-            # Process quarterly reports
-            if "quarterlyReports" in data:
-                for report in data["quarterlyReports"]:
-                    cash_flow_reports.append(
-                        CashFlowReport(**report, quarter_report=True)
-                    )
-
-            # Cache the data
-            cache.set_cash_flow(symbol, cash_flow_reports)
+            data = http_client.get_json("CASH_FLOW", symbol=symbol)
+
+            # Transform API response to CashFlowReport models and cache them
+            cash_flow_reports = _cache_statement(
+                "cash_flow", symbol, data, CashFlowReport
+            )
 
             return DataResult(cash_flow_reports, from_cache=False)
 
+        except ThrottledError as e:
+            print(f"Rate limited fetching cash flow for {symbol}: {e}")
+            return ThrottledResult([], str(e))
         except Exception as e:
             print(f"Error fetching cash flow for {symbol}: {e}")
             return DataResult([], from_cache=False)
 
     @staticmethod
-    def get_income_statement(symbol: str) -> DataResult:
-        """Get income statement data with caching."""
+    def get_income_statement(
+        symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        """Get income statement data of the selected periods with caching."""
         # Check cache first
-        cached_data = cache.get_income_statement(symbol)
-        if cached_data:
-            cache_info = cache.get_cache_info()
-            cache_timestamp = (
-                cache_info.get("income_statement", {})
-                .get(symbol, {})
-                .get("timestamp", "unknown")
-            )
-            return DataResult(
-                cached_data, from_cache=True, cache_timestamp=cache_timestamp
-            )
+        cached_result = _serve_from_cache(
+            "income_statement",
+            symbol,
+            cache.get_income_statement(symbol, periods),
+            AlphaVantageAPI._fetch_income_statement,
+        )
+        if cached_result:
+            return cached_result
+
+        result = AlphaVantageAPI._fetch_income_statement(symbol)
+        return _select_periods("income_statement", symbol, result, periods)
 
+    @staticmethod
+    @_coalesced("income_statement")
+    def _fetch_income_statement(symbol: str) -> DataResult:
+        """Fetch income statement data from the API and cache it."""
         print(f"Getting income statement for {symbol}")
         try:
-            url = f"https://www.alphavantage.co/query?function=INCOME_STATEMENT&symbol={symbol}&apikey={ALPHAVANTAGE_API_KEY}"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-
-            # Transform API response to IncomeStatementReport models
-            income_statement_reports = []
-
-            # Process annual reports
-            if "annualReports" in data:
-                for report in data["annualReports"]:
-                    income_statement_reports.append(
-                        IncomeStatementReport(**report, annual_report=True)
-                    )
-
-            # Process quarterly reports
-            if "quarterlyReports" in data:
-                for report in data["quarterlyReports"]:
-                    income_statement_reports.append(
-                        IncomeStatementReport(**report, quarter_report=True)
-                    )
-
-            # Cache the data
-            cache.set_income_statement(symbol, income_statement_reports)
+            data = http_client.get_json("INCOME_STATEMENT", symbol=symbol)
+
+            # Transform API response to IncomeStatementReport models and cache them
+            income_statement_reports = _cache_statement(
+                "income_statement", symbol, data, IncomeStatementReport
+            )
 
             return DataResult(income_statement_reports, from_cache=False)
 
+        except ThrottledError as e:
+            print(f"Rate limited fetching income statement for {symbol}: {e}")
+            return ThrottledResult([], str(e))
         except Exception as e:
             print(f"Error fetching income statement for {symbol}: {e}")
             return DataResult([], from_cache=False)
 
     @staticmethod
-    def get_currency_ratio(symbol: str) -> float:
+    def get_currency_ratio(symbol: str) -> float | None:
+        """Get the currency ratio for a symbol, None if the API could not provide it."""
         # Check cache first
-        exchange_rate = cache.get_exchange_rate(symbol)
-        if exchange_rate:
-            return exchange_rate
-
-        """Get the currency ratio for a symbol."""
-        url = f"https://www.alphavantage.co/query?function=CURRENCY_EXCHANGE_RATE&from_currency={symbol}&to_currency=USD&apikey={ALPHAVANTAGE_API_KEY}"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        exchange_rate = float(
-            data["Realtime Currency Exchange Rate"]["5. Exchange Rate"]
+        cached_result = _serve_from_cache(
+            "exchange_rate",
+            symbol,
+            cache.get_exchange_rate(symbol),
+            AlphaVantageAPI._fetch_currency_ratio,
+        )
+        if cached_result:
+            return cached_result.data
+
+        return AlphaVantageAPI._fetch_currency_ratio(symbol).data
+
+    @staticmethod
+    @_coalesced("exchange_rate")
+    def _fetch_currency_ratio(symbol: str) -> DataResult:
+        """Fetch the currency ratio to USD from the API and cache it."""
+        try:
+            data = http_client.get_json(
+                "CURRENCY_EXCHANGE_RATE", from_currency=symbol, to_currency=USD
+            )
+            exchange_rate = _store_exchange_rate(symbol, data)
+
+            return DataResult(exchange_rate, from_cache=False)
+
+        except ThrottledError as e:
+            print(f"Rate limited fetching currency ratio for {symbol}: {e}")
+            return ThrottledResult(None, str(e))
+        except Exception as e:
+            print(f"Error fetching currency ratio for {symbol}: {e}")
+            return DataResult(None, from_cache=False)
+
+    @staticmethod
+    def get_fx_history(currency: str) -> DataResult:
+        """Get the month end rates of a currency to USD with caching."""
+        cached_result = _serve_from_cache(
+            "fx_history",
+            currency,
+            cache.get_fx_history(currency),
+            AlphaVantageAPI._fetch_fx_history,
         )
-        cache.set_exchange_rate(symbol, exchange_rate)
+        if cached_result:
+            return cached_result
+
+        return AlphaVantageAPI._fetch_fx_history(currency)
 
-        return exchange_rate
+    @staticmethod
+    @_coalesced("fx_history")
+    def _fetch_fx_history(currency: str) -> DataResult:
+        """Fetch the monthly FX history of a currency to USD from the API and cache it."""
+        print(f"Getting FX history for {currency}")
+        try:
+            data = http_client.get_json(
+                "FX_MONTHLY", from_symbol=currency, to_symbol=USD
+            )
+            history = _store_fx_history(currency, data)
+
+            return DataResult(history, from_cache=False)
+
+        except ThrottledError as e:
+            print(f"Rate limited fetching FX history for {currency}: {e}")
+            return ThrottledResult({}, str(e))
+        except Exception as e:
+            print(f"Error fetching FX history for {currency}: {e}")
+            return DataResult({}, from_cache=False)
+
+    @staticmethod
+    def get_fx_rates(currencies: set[str]) -> FxRates:
+        """Get dated rates to USD for the currencies, one history request per currency."""
+        fx_rates = FxRates()
+        for currency in sorted(currencies - {USD}):
+            history = AlphaVantageAPI.get_fx_history(currency).data
+            if history:
+                fx_rates.add(currency, history)
+        return fx_rates
+
+    @staticmethod
+    def get_ticker_data(
+        symbol: str,
+        on_result: Callable[[str, DataResult], None] | None = None,
+        periods: PeriodSelection = ALL_PERIODS,
+    ) -> dict[str, DataResult]:
+        """
+        Get the overview and the three statements of a symbol concurrently.
+
+        Args:
+            symbol: Ticker symbol
+            on_result: Called with (data_type, result) as each data type completes,
+                on the calling thread
+            periods: Statement reports to parse and return
+
+        Returns:
+            Results keyed by data type, in the order of TICKER_DATA_TYPES
+        """
+        getters = {
+            "overview": AlphaVantageAPI.get_ticker_overview,
+            "balance_sheet": functools.partial(
+                AlphaVantageAPI.get_balance_sheet, periods=periods
+            ),
+            "income_statement": functools.partial(
+                AlphaVantageAPI.get_income_statement, periods=periods
+            ),
+            "cash_flow": functools.partial(
+                AlphaVantageAPI.get_cash_flow, periods=periods
+            ),
+        }
+        futures = {
+            _ticker_data_executor.submit(getters[data_type], symbol): data_type
+            for data_type in TICKER_DATA_TYPES
+        }
+
+        results = {}
+        for future in as_completed(futures):
+            data_type = futures[future]
+            results[data_type] = future.result()
+            if on_result:
+                on_result(data_type, results[data_type])
+        return {data_type: results[data_type] for data_type in TICKER_DATA_TYPES}
+
+    @staticmethod
+    def fetch_ticker_data(
+        symbol: str, data_types: Iterable[str]
+    ) -> dict[str, DataResult]:
+        """
+        Fetch data types of a symbol from the API concurrently, bypassing the
+        cache, and cache the responses.
+
+        Args:
+            symbol: Ticker symbol
+            data_types: Data types of TICKER_DATA_TYPES to fetch
+
+        Returns:
+            Results keyed by data type, in the order requested
+        """
+        fetchers = {
+            "overview": AlphaVantageAPI._fetch_ticker_overview,
+            "balance_sheet": AlphaVantageAPI._fetch_balance_sheet,
+            "income_statement": AlphaVantageAPI._fetch_income_statement,
+            "cash_flow": AlphaVantageAPI._fetch_cash_flow,
+        }
+        futures = {
+            data_type: _ticker_data_executor.submit(fetchers[data_type], symbol)
+            for data_type in data_types
+        }
+        return {data_type: future.result() for data_type, future in futures.items()}
 
     @staticmethod
-    def get_comprehensive_data(symbol: str) -> FundamentalData:
+    def get_comprehensive_data(
+        symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> FundamentalData:
         """Get all available data for a symbol, checking cache first, then fetching from API if not cached."""
-        # Overview
-        overview_result = AlphaVantageAPI.get_ticker_overview(symbol)
-        overview = overview_result.data
-
-        # Balance Sheet
-        balance_sheet_result = AlphaVantageAPI.get_balance_sheet(symbol)
-        balance_sheet = balance_sheet_result.data
-
-        # Cash Flow
-        cash_flow_result = AlphaVantageAPI.get_cash_flow(symbol)
-        cash_flow = cash_flow_result.data
-
-        # Income Statement
-        income_statement_result = AlphaVantageAPI.get_income_statement(symbol)
-        income_statement = income_statement_result.data
-
-        # Calculated Metrics (assume only in cache)
-        calculated_metrics = cache.get_calculated_metrics(symbol)
-
-        return FundamentalData(
-            symbol=symbol,
-            overview=overview,
-            balance_sheet=balance_sheet,
-            cash_flow=cash_flow,
-            income_statement=income_statement,
-            calculated_metrics=calculated_metrics,
-            last_updated=datetime.now().isoformat(),
+        return _comprehensive_data(
+            symbol,
+            AlphaVantageAPI.get_ticker_data(symbol, periods=periods),
+            periods,
         )
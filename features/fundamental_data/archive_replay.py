@@ -0,0 +1,113 @@
+import functools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from . import alphavantage_adapter
+from .alphavantage_adapter import (
+    _cache_statement,
+    _store_exchange_rate,
+    _store_fx_history,
+    _store_overview,
+    _store_symbol_search,
+)
+from .model import (
+    ArchivedResponse,
+    BalanceSheetReport,
+    CashFlowReport,
+    IncomeStatementReport,
+)
+from .response_archive import ResponseArchive, get_response_archive
+
+# Source recorded in the metadata of entries restored from the archive
+REPLAY_SOURCE = "archive"
+
+DEFAULT_REPLAY_WORKERS = 8
+
+# Endpoint -> (data type of the cache entry it fills, response handler).
+# Statements replace cached periods, so replaying re-parses them with the
+# current models and parsing rules.
+REPLAY_HANDLERS: dict[str, tuple[str | None, Callable[..., Any]]] = {
+    "SYMBOL_SEARCH": (None, _store_symbol_search),
+    "OVERVIEW": ("overview", _store_overview),
+    "BALANCE_SHEET": (
+        "balance_sheet",
+        functools.partial(
+            _cache_statement, "balance_sheet", model=BalanceSheetReport, replace=True
+        ),
+    ),
+    "INCOME_STATEMENT": (
+        "income_statement",
+        functools.partial(
+            _cache_statement,
+            "income_statement",
+            model=IncomeStatementReport,
+            replace=True,
+        ),
+    ),
+    "CASH_FLOW": (
+        "cash_flow",
+        functools.partial(
+            _cache_statement, "cash_flow", model=CashFlowReport, replace=True
+        ),
+    ),
+    "CURRENCY_EXCHANGE_RATE": ("exchange_rate", _store_exchange_rate),
+    "FX_MONTHLY": ("fx_history", _store_fx_history),
+}
+
+
+def _replay(archive: ResponseArchive, entry: ArchivedResponse) -> str:
+    """Run an archived response through the handler of its endpoint."""
+    if entry.function not in REPLAY_HANDLERS:
+        return "skipped"
+
+    data_type, handler = REPLAY_HANDLERS[entry.function]
+    try:
+        handler(entry.symbol, archive.load(entry.digest), source=REPLAY_SOURCE)
+        if data_type:
+            # Keep the original fetch time so TTLs still apply to restored entries
+            alphavantage_adapter.cache.set_fetched_at(
+                data_type, entry.symbol, entry.fetched_at
+            )
+    except Exception as e:
+        print(f"Error replaying {entry.function} for {entry.symbol}: {e}")
+        return "failed"
+    return "replayed"
+
+
+def replay_archive(
+    archive: ResponseArchive | None = None,
+    max_workers: int = DEFAULT_REPLAY_WORKERS,
+) -> dict[str, int]:
+    """
+    Rebuild the cache from the latest archived response of every request, in
+    parallel and without any API call, e.g. after changing models or parsing rules.
+
+    Args:
+        archive: Archive to replay, defaults to the configured one
+        max_workers: Responses parsed at the same time
+
+    Returns:
+        Number of replayed, failed and skipped responses
+    """
+    archive = archive or get_response_archive()
+    if archive is None:
+        raise ValueError("No response archive configured, set ALPHAVANTAGE_ARCHIVE_DIR")
+
+    entries = archive.latest()
+    with (
+        alphavantage_adapter.cache.deferred_writes(),
+        ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="archive-replay"
+        ) as executor,
+    ):
+        outcomes = Counter(executor.map(lambda entry: _replay(archive, entry), entries))
+
+    summary = {
+        outcome: outcomes[outcome] for outcome in ("replayed", "failed", "skipped")
+    }
+    print(
+        f"Replayed {summary['replayed']} archived responses "
+        f"({summary['failed']} failed, {summary['skipped']} skipped)"
+    )
+    return summary
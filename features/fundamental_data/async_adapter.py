@@ -0,0 +1,167 @@
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, TypeVar
+
+from . import alphavantage_adapter, refresh_planner
+from .alphavantage_adapter import TICKER_DATA_TYPES, AlphaVantageAPI, DataResult
+from .cache import PersistentCache
+from .fx_rates import FxRates
+from .model import FundamentalData, RefreshPlan
+from .periods import ALL_PERIODS, PeriodSelection
+
+T = TypeVar("T")
+
+# Blocking API calls running at the same time; the shared rate limiter decides
+# how many of them actually reach the API per minute
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Symbols completed between two cache flushes of a bulk refresh
+DEFAULT_BATCH_SIZE = 50
+
+
+async def _iterate(symbols: AsyncIterable[str] | Iterable[str]) -> AsyncIterator[str]:
+    if isinstance(symbols, AsyncIterable):
+        async for symbol in symbols:
+            yield symbol
+    else:
+        for symbol in symbols:
+            yield symbol
+
+
+class AsyncAlphaVantageAPI:
+    """
+    Asyncio front end of AlphaVantageAPI for bulk refreshes. Calls run on worker
+    threads through the shared, pooled and rate limited HTTP client, so the
+    cache, the quota and the throttle handling are the same as for blocking use.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """
+        Args:
+            max_concurrency: Maximum number of API calls in flight
+            batch_size: Symbols completed between two cache flushes in refresh()
+        """
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def cache(self) -> PersistentCache:
+        """The cache the blocking adapter reads and writes."""
+        return alphavantage_adapter.cache
+
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        """Run a blocking call on a worker thread within the concurrency bound."""
+        # Created lazily so the semaphore belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await asyncio.to_thread(function, *args)
+
+    async def get_ticker_symbol(self, stock_name: str) -> DataResult:
+        return await self._run(AlphaVantageAPI.get_ticker_symbol, stock_name)
+
+    async def get_ticker_overview(self, symbol: str) -> DataResult:
+        return await self._run(AlphaVantageAPI.get_ticker_overview, symbol)
+
+    async def get_balance_sheet(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        return await self._run(AlphaVantageAPI.get_balance_sheet, symbol, periods)
+
+    async def get_cash_flow(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        return await self._run(AlphaVantageAPI.get_cash_flow, symbol, periods)
+
+    async def get_income_statement(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        return await self._run(AlphaVantageAPI.get_income_statement, symbol, periods)
+
+    async def get_currency_ratio(self, currency: str) -> float | None:
+        return await self._run(AlphaVantageAPI.get_currency_ratio, currency)
+
+    async def get_fx_rates(self, currencies: set[str]) -> FxRates:
+        return await self._run(AlphaVantageAPI.get_fx_rates, currencies)
+
+    async def refresh_ticker(self, symbol: str) -> RefreshPlan:
+        """Re-fetch only the statements of a symbol that have a new period."""
+        return await self._run(refresh_planner.refresh_ticker, symbol)
+
+    async def get_comprehensive_data(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> FundamentalData:
+        """Get the overview and statements of a symbol with concurrent requests."""
+        results = await asyncio.gather(
+            self.get_ticker_overview(symbol),
+            self.get_balance_sheet(symbol, periods),
+            self.get_income_statement(symbol, periods),
+            self.get_cash_flow(symbol, periods),
+        )
+        return await asyncio.to_thread(
+            alphavantage_adapter._comprehensive_data,
+            symbol,
+            dict(zip(TICKER_DATA_TYPES, results)),
+            periods,
+        )
+
+    async def refresh(
+        self,
+        symbols: AsyncIterable[str] | Iterable[str],
+        periods: PeriodSelection = ALL_PERIODS,
+    ) -> AsyncIterator[FundamentalData]:
+        """
+        Fetch the data of every symbol, yielding each as soon as it completes.
+        Symbols are read from the iterator only as capacity frees up. Writes
+        follow the cache's write mode; buffered writes are flushed once per batch
+        of completed symbols and when the refresh ends. Nothing is deferred while
+        the caller holds a yielded result, so other writers are not held back.
+        """
+        in_flight: dict[asyncio.Task, str] = {}
+        pending_symbols = aiter(_iterate(symbols))
+        exhausted = False
+        completed = 0
+
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.max_concurrency:
+                    try:
+                        symbol = await anext(pending_symbols)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.create_task(
+                        self.get_comprehensive_data(symbol, periods)
+                    )
+                    in_flight[task] = symbol
+                if not in_flight:
+                    break
+
+                for data in await self._next_completed(in_flight):
+                    completed += 1
+                    yield data
+                    if completed % self.batch_size == 0:
+                        await asyncio.to_thread(self.cache.flush)
+        finally:
+            for task in in_flight:
+                task.cancel()
+        await asyncio.to_thread(self.cache.flush)
+
+    @staticmethod
+    async def _next_completed(
+        in_flight: dict[asyncio.Task, str],
+    ) -> list[FundamentalData]:
+        """Wait for at least one symbol to complete and remove the finished ones."""
+        done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        results = []
+        for task in done:
+            symbol = in_flight.pop(task)
+            try:
+                results.append(task.result())
+            except Exception as e:
+                print(f"Error refreshing {symbol}: {e}")
+        return results
@@ -1,366 +1,760 @@
+import atexit
 import json
-import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from pathlib import Path
 from typing import Any
+from config.env import (
+    CACHE_BACKEND,
+    CACHE_WRITE_MODE,
+    CACHE_FLUSH_INTERVAL_SECONDS,
+    CACHE_FLUSH_EVERY_OPERATIONS,
+    CACHE_MEMORY_MAX_ENTRIES,
+    CACHE_MEMORY_MAX_BYTES,
+    CACHE_MEMORY_BUDGET_SET,
+)
 from .model import (
-    FundamentalData,
     StockMetaData,
+    FinancialReport,
     BalanceSheetReport,
     CashFlowReport,
     IncomeStatementReport,
     CalculatedMetrics,
+    CacheEntryMetadata,
 )
+from .cache_policy import STATEMENT_TYPES, CachePolicy
+from .lru import LRUCache
+from .periods import ALL_PERIODS, PeriodSelection
+from .symbol_index import SymbolIndex, normalize_query
+from .storage import CacheBackend, create_backend
+
+DEFAULT_CACHE_PATHS = {
+    "json": "cache/alpha_vantage_cache.json",
+    "sqlite": "cache/alpha_vantage_cache.db",
+    "columnar": "cache/alpha_vantage_cache.avcs",
+}
+
+WRITE_MODES = ("immediate", "write_behind")
+
+_MISSING = object()
+
+SECTION_MODELS = {
+    "overview": StockMetaData,
+    "balance_sheet": BalanceSheetReport,
+    "cash_flow": CashFlowReport,
+    "income_statement": IncomeStatementReport,
+    "calculated_metrics": CalculatedMetrics,
+}
 
 
 class PersistentCache:
-    """Persistent file-based cache for responses using strongly-typed models."""
-
-    def __init__(self, cache_file_path: str = "cache/alpha_vantage_cache.json"):
-        # Initialize cache dictionaries
-        self._overview_cache: dict[str, StockMetaData] = {}
-        self._balance_sheet_cache: dict[str, list[BalanceSheetReport]] = {}
-        self._cash_flow_cache: dict[str, list[CashFlowReport]] = {}
-        self._income_statement_cache: dict[str, list[IncomeStatementReport]] = {}
-        self._calculated_metrics_cache: dict[str, list[CalculatedMetrics]] = {}
+    """Persistent cache for responses using strongly-typed models and a pluggable storage backend."""
+
+    def __init__(
+        self,
+        cache_file_path: str | None = None,
+        backend: CacheBackend | str | None = None,
+        write_mode: str | None = None,
+        flush_interval_seconds: float | None = None,
+        flush_every_operations: int | None = None,
+        policy: CachePolicy | None = None,
+        memory_max_entries: int | None = None,
+        memory_max_bytes: int | None = None,
+    ):
+        """
+        Args:
+            cache_file_path: Location of the cache file (defaults per backend)
+            backend: Backend instance or name ("json", "sqlite")
+            write_mode: "immediate" persists every change right away,
+                "write_behind" buffers changes and flushes them together
+            flush_interval_seconds: Max age of buffered changes in write-behind mode
+            flush_every_operations: Number of buffered changes that triggers a flush
+            policy: Staleness rules per data type
+            memory_max_entries: Max number of (section, symbol) entries kept in memory
+            memory_max_bytes: Max serialized size of the entries kept in memory.
+                The budget bounds the parsed models; evicted entries are read
+                again per key from the sqlite and columnar backends, while the
+                json backend keeps all raw records in memory
+        """
+        # In-memory tier of models keyed by (section, symbol). Entries are hydrated
+        # from raw backend records on first access and evicted when over budget.
+        self._models = LRUCache(
+            max_entries=memory_max_entries or CACHE_MEMORY_MAX_ENTRIES,
+            max_bytes=memory_max_bytes or CACHE_MEMORY_MAX_BYTES,
+            on_evict=self._on_evict,
+        )
         self._exchange_rate_cache: dict[str, float] = {}
+        self._fx_history_cache: dict[str, dict[str, float]] = {}
         self._symbol_search_cache: dict[str, dict] = {}  # symbol -> stock_data mapping
+        self._symbol_search_loaded = False
+        self._symbol_index = SymbolIndex()
+        # Normalized query -> {"metadata": ..., "results": [...]}, loaded per query
+        self._symbol_query_cache: dict[str, dict] = {}
+        # Backend generation the in-memory state was read at
+        self._backend_generation: int | None = None
+
+        # Set up storage backend
+        if not isinstance(backend, CacheBackend):
+            backend_name = backend or CACHE_BACKEND
+            backend = create_backend(
+                backend_name,
+                cache_file_path or DEFAULT_CACHE_PATHS.get(backend_name, ""),
+            )
+        self.backend = backend
+        self.cache_file_path = backend.cache_file_path
+        budget_set = memory_max_entries or memory_max_bytes or CACHE_MEMORY_BUDGET_SET
+        if budget_set and backend.holds_records_in_memory:
+            print(
+                "Warning: the json cache backend keeps all records in memory, "
+                "the memory budget only bounds parsed models. "
+                "Use CACHE_BACKEND=sqlite to keep memory use within the budget."
+            )
+        self.policy = policy or CachePolicy()
 
-        # Set up cache file path
-        self.cache_file_path = Path(cache_file_path)
-        self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Load existing cache data
-        self._load_from_file()
+        # Set up write-behind buffering
+        self.write_mode = write_mode or CACHE_WRITE_MODE
+        if self.write_mode not in WRITE_MODES:
+            raise ValueError(
+                f"Unknown cache write mode '{self.write_mode}'. Choose one of: {', '.join(WRITE_MODES)}"
+            )
+        self.flush_interval_seconds = (
+            flush_interval_seconds
+            if flush_interval_seconds is not None
+            else CACHE_FLUSH_INTERVAL_SECONDS
+        )
+        self.flush_every_operations = (
+            flush_every_operations
+            if flush_every_operations is not None
+            else CACHE_FLUSH_EVERY_OPERATIONS
+        )
+        self._lock = threading.RLock()
+        self._pending_entries: dict[tuple[str, str], Any] = {}
+        self._pending_reports: dict[tuple[str, str], list[dict]] = {}
+        self._pending_operations = 0
+        self._deferred_depth = 0
+        self._flush_timer: threading.Timer | None = None
+        atexit.register(self.flush)
+
+    # Write-behind methods
+    @property
+    def dirty_sections(self) -> set[str]:
+        """Sections with changes that have not been persisted yet."""
+        with self._lock:
+            return {section for section, _ in self._pending_entries} | {
+                section for section, _ in self._pending_reports
+            }
 
-    def _save_to_file(self):
-        """Save current cache state to JSON file."""
+    @contextmanager
+    def deferred_writes(self):
+        """
+        Buffer all changes, whatever the write mode, until the block ends or
+        flush() is called, so bulk loads are persisted in a few large batches.
+        """
+        with self._lock:
+            self._deferred_depth += 1
         try:
-            # Convert Pydantic models to dictionaries for JSON serialization
-            cache_data = {
-                "overview": {
-                    symbol: data.model_dump() if data else None
-                    for symbol, data in self._overview_cache.items()
-                },
-                "balance_sheet": {
-                    symbol: [report.model_dump() for report in reports]
-                    if reports
-                    else []
-                    for symbol, reports in self._balance_sheet_cache.items()
-                },
-                "cash_flow": {
-                    symbol: [report.model_dump() for report in reports]
-                    if reports
-                    else []
-                    for symbol, reports in self._cash_flow_cache.items()
-                },
-                "income_statement": {
-                    symbol: [report.model_dump() for report in reports]
-                    if reports
-                    else []
-                    for symbol, reports in self._income_statement_cache.items()
-                },
-                "calculated_metrics": {
-                    symbol: [metric.model_dump() for metric in metrics]
-                    if metrics
-                    else []
-                    for symbol, metrics in self._calculated_metrics_cache.items()
-                },
-                "symbol_search": {
-                    symbol: stock_data
-                    for symbol, stock_data in self._symbol_search_cache.items()
-                },
-                "exchange_rate": self._exchange_rate_cache,
-                "last_updated": datetime.now().isoformat(),
-                "version": "1.0",
-            }
+            yield self
+        finally:
+            with self._lock:
+                self._deferred_depth -= 1
+            self.flush()
+
+    def _persist_entry(self, section: str, key: str, value: Any):
+        """Persist a single entry now or mark it dirty for the next flush."""
+        if self.write_mode == "immediate" and not self._deferred_depth:
+            self.backend.upsert_entry(section, key, value)
+            return
+        with self._lock:
+            self._pending_entries[(section, key)] = value
+            # Metadata rides along with the change it describes
+            self._mark_dirty(count=section != "metadata")
+
+    def _persist_reports(self, section: str, symbol: str, reports: list[dict]):
+        """Persist new reports now or mark them dirty for the next flush."""
+        if not reports:
+            return
+        if self.write_mode == "immediate" and not self._deferred_depth:
+            self.backend.upsert_reports(section, symbol, reports)
+            return
+        with self._lock:
+            self._pending_reports.setdefault((section, symbol), []).extend(reports)
+            self._mark_dirty()
+
+    def _mark_dirty(self, count: bool = True):
+        """Count a buffered change and flush once the operation budget is used up."""
+        self._pending_operations += int(count)
+        if self._deferred_depth:
+            return
+        if self._pending_operations >= self.flush_every_operations:
+            self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval_seconds, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _discard_pending(self, symbol: str | None = None):
+        """Drop buffered changes of a symbol (or all) that are about to be deleted."""
+        with self._lock:
+            if symbol is None:
+                self._pending_entries.clear()
+                self._pending_reports.clear()
+                return
+            for pending in (self._pending_entries, self._pending_reports):
+                for key in [key for key in pending if key[1] == symbol]:
+                    if key[0] not in (
+                        "symbol_search",
+                        "symbol_query",
+                        "exchange_rate",
+                        "fx_history",
+                    ):
+                        del pending[key]
+
+    def flush(self):
+        """Write all buffered changes to the backend in a single batch."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending_entries and not self._pending_reports:
+                return
 
-            # Write to temporary file first, then rename for atomic operation
-            temp_file = self.cache_file_path.with_suffix(".tmp")
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            pending_entries, self._pending_entries = self._pending_entries, {}
+            pending_reports, self._pending_reports = self._pending_reports, {}
+            pending_operations, self._pending_operations = self._pending_operations, 0
+            try:
+                with self.backend.batch():
+                    for (section, key), value in pending_entries.items():
+                        self.backend.upsert_entry(section, key, value)
+                    for (section, symbol), reports in pending_reports.items():
+                        self.backend.upsert_reports(section, symbol, reports)
+            except Exception:
+                # Keep the changes queued so the next flush writes them again
+                self._pending_entries = {**pending_entries, **self._pending_entries}
+                for key, reports in self._pending_reports.items():
+                    pending_reports.setdefault(key, []).extend(reports)
+                self._pending_reports = pending_reports
+                self._pending_operations += pending_operations
+                print(f"Warning: Failed to flush cache to {self.cache_file_path}")
+                raise
+
+    def compact(self):
+        """Flush buffered changes and fold incremental backend changes into its main file."""
+        self.flush()
+        self.backend.compact()
+
+    def close(self):
+        """Flush buffered changes and release the backend."""
+        self.flush()
+        atexit.unregister(self.flush)
+        self.backend.close()
+
+    # Memory tier methods
+    def _on_evict(self, key: tuple[str, str], value: Any):
+        """Persist buffered changes of an evicted entry so the backend has its latest state."""
+        with self._lock:
+            if key in self._pending_entries or key in self._pending_reports:
+                self.flush()
+
+    def memory_stats(self) -> dict[str, int | None]:
+        """Get hit, miss and eviction counters of the in-memory tier."""
+        return self._models.stats()
+
+    def _sync_with_backend(self):
+        """Drop in-memory state after another process changed the stored data."""
+        generation = self.backend.generation()
+        if self._backend_generation is None:
+            self._backend_generation = generation
+            return
+        if generation == self._backend_generation:
+            return
 
-            # Atomic rename
-            temp_file.replace(self.cache_file_path)
+        with self._lock:
+            # Own buffered changes are applied on top of the other process' data
+            self.flush()
+            self._backend_generation = self.backend.generation()
+            self._models.clear()
+            self._exchange_rate_cache.clear()
+            self._fx_history_cache.clear()
+            self._symbol_search_cache.clear()
+            self._symbol_index.clear()
+            self._symbol_search_loaded = False
+            self._symbol_query_cache.clear()
+
+    # Lazy hydration methods
+    def _get_models(self, section: str, symbol: str) -> Any | None:
+        """Return the models of a symbol, validating its raw records on first access."""
+        self._sync_with_backend()
+        models = self._models.get((section, symbol), _MISSING)
+        if models is not _MISSING:
+            return models
+
+        raw = self.backend.get(section, symbol)
+        if not raw:
+            return None
 
+        model = SECTION_MODELS[section]
+        try:
+            if section == "overview":
+                models = model(**raw)
+            else:
+                models = [model(**report_dict) for report_dict in raw]
         except Exception as e:
-            print(f"Warning: Failed to save cache to {self.cache_file_path}: {e}")
-
-    def _load_from_file(self):
-        """Load cache data from JSON file."""
-        if not self.cache_file_path.exists():
             print(
-                f"Cache file {self.cache_file_path} doesn't exist. Starting with empty cache."
+                f"Warning: Failed to load {section.replace('_', ' ')} data for {symbol}: {e}"
             )
-            return
+            return None
 
-        try:
-            with open(self.cache_file_path, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
+        self._models.put((section, symbol), models, size=_payload_size(raw))
+        return models
+
+    def _get_symbol_search_cache(self) -> dict[str, dict]:
+        """Return the symbol search cache, loading it on first use."""
+        self._sync_with_backend()
+        if not self._symbol_search_loaded:
+            self._symbol_search_loaded = True
+            for symbol, stock_data in self.backend.load_section(
+                "symbol_search"
+            ).items():
+                if stock_data and symbol not in self._symbol_search_cache:
+                    self._symbol_search_cache[symbol] = stock_data
+                    self._symbol_index.add(symbol, stock_data.get("2. name", ""))
+        return self._symbol_search_cache
+
+    def _new_reports(
+        self,
+        existing: list[FinancialReport | CalculatedMetrics] | None,
+        new_data: list[FinancialReport | CalculatedMetrics],
+    ) -> list[FinancialReport | CalculatedMetrics]:
+        """Return the reports of new_data not cached yet, based on their period."""
+        if not existing:
+            return list(new_data)
 
-            # Validate cache file structure
-            if not isinstance(cache_data, dict) or "version" not in cache_data:
-                print(f"Warning: Invalid cache file format. Starting with empty cache.")
-                return
+        # Create a set of existing periods for O(1) lookup
+        existing_periods = {_report_key(report) for report in existing}
 
-            # Load overview data
-            if "overview" in cache_data:
-                for symbol, data_dict in cache_data["overview"].items():
-                    if data_dict:
-                        try:
-                            self._overview_cache[symbol] = StockMetaData(**data_dict)
-                        except Exception as e:
-                            print(
-                                f"Warning: Failed to load overview data for {symbol}: {e}"
-                            )
-
-            # Load balance sheet data
-            if "balance_sheet" in cache_data:
-                for symbol, reports_list in cache_data["balance_sheet"].items():
-                    if reports_list:
-                        try:
-                            self._balance_sheet_cache[symbol] = [
-                                BalanceSheetReport(**report_dict)
-                                for report_dict in reports_list
-                            ]
-                        except Exception as e:
-                            print(
-                                f"Warning: Failed to load balance sheet data for {symbol}: {e}"
-                            )
-
-            # Load cash flow data
-            if "cash_flow" in cache_data:
-                for symbol, reports_list in cache_data["cash_flow"].items():
-                    if reports_list:
-                        try:
-                            self._cash_flow_cache[symbol] = [
-                                CashFlowReport(**report_dict)
-                                for report_dict in reports_list
-                            ]
-                        except Exception as e:
-                            print(
-                                f"Warning: Failed to load cash flow data for {symbol}: {e}"
-                            )
-
-            # Load income statement data
-            if "income_statement" in cache_data:
-                for symbol, reports_list in cache_data["income_statement"].items():
-                    if reports_list:
-                        try:
-                            self._income_statement_cache[symbol] = [
-                                IncomeStatementReport(**report_dict)
-                                for report_dict in reports_list
-                            ]
-                        except Exception as e:
-                            print(
-                                f"Warning: Failed to load income statement data for {symbol}: {e}"
-                            )
-
-            # Load calculated metrics data
-            if "calculated_metrics" in cache_data:
-                for symbol, metrics_list in cache_data["calculated_metrics"].items():
-                    if metrics_list:
-                        try:
-                            self._calculated_metrics_cache[symbol] = [
-                                CalculatedMetrics(**metric_dict)
-                                for metric_dict in metrics_list
-                            ]
-                        except Exception as e:
-                            print(
-                                f"Warning: Failed to load calculated metrics for {symbol}: {e}"
-                            )
-
-            # Load symbol search data
-            if "symbol_search" in cache_data:
-                for symbol, stock_data in cache_data["symbol_search"].items():
-                    if stock_data:
-                        try:
-                            self._symbol_search_cache[symbol] = stock_data
-                        except Exception as e:
-                            print(
-                                f"Warning: Failed to load symbol search data for '{symbol}': {e}"
-                            )
-
-            # Load exchange rate data
-            if "exchange_rate" in cache_data:
-                self._exchange_rate_cache = cache_data["exchange_rate"]
-
-            # Print cache statistics
-            total_symbols = len(self.get_cached_symbols())
-            total_overview = len(self._overview_cache)
-            total_balance_sheet = sum(
-                len(reports) for reports in self._balance_sheet_cache.values()
+        # Only add reports that don't exist yet
+        return [
+            report for report in new_data if _report_key(report) not in existing_periods
+        ]
+
+    def _append_reports(
+        self,
+        section: str,
+        symbol: str,
+        data: list[FinancialReport | CalculatedMetrics],
+        source: str,
+        replace: bool = False,
+    ):
+        """
+        Append new reports to the in-memory cache and upsert only those rows.
+        With replace, reports of already cached periods are overwritten as well.
+        """
+        # Merge with the cached reports without losing a concurrent update
+        with self._lock:
+            existing = self._get_models(section, symbol)
+            added = list(data) if replace else self._new_reports(existing, data)
+            by_period = {
+                _report_key(report): report for report in (existing or []) + added
+            }
+            # Keep the newest period first, like the API responses
+            merged = sorted(
+                by_period.values(),
+                key=lambda report: (
+                    report.fiscal_date_ending,
+                    not _report_key(report)[1],
+                ),
+                reverse=True,
             )
-            total_cash_flow = sum(
-                len(reports) for reports in self._cash_flow_cache.values()
+            added_records = [report.model_dump() for report in added]
+
+            # Metadata is recorded first so a flush triggered by the data includes it
+            previous = self.get_entry_metadata(section, symbol)
+            if replace:
+                payload_bytes = _payload_size(
+                    [report.model_dump() for report in merged]
+                )
+            else:
+                payload_bytes = (
+                    previous.payload_bytes if previous else 0
+                ) + _payload_size(added_records)
+            self._record_metadata(
+                section,
+                symbol,
+                source=source,
+                payload_bytes=payload_bytes,
+                report_count=len(merged),
+                checked_quarter=self._latest_quarter(symbol)
+                if section in STATEMENT_TYPES
+                else None,
             )
-            total_income_statement = sum(
-                len(reports) for reports in self._income_statement_cache.values()
+            self._models.put((section, symbol), merged, size=payload_bytes)
+            self._persist_reports(section, symbol, added_records)
+
+    # Entry metadata methods
+    def _get_symbol_metadata(self, symbol: str) -> dict[str, CacheEntryMetadata]:
+        """Return the metadata of all data types of a symbol, loading it once."""
+        self._sync_with_backend()
+        symbol_metadata = self._models.get(("metadata", symbol), _MISSING)
+        if symbol_metadata is _MISSING:
+            raw = self.backend.get("metadata", symbol) or {}
+            symbol_metadata = {
+                data_type: CacheEntryMetadata(**entry)
+                for data_type, entry in raw.items()
+            }
+            self._models.put(
+                ("metadata", symbol), symbol_metadata, size=_payload_size(raw)
             )
-            total_symbol_searches = len(self._symbol_search_cache)
-            total_exchange_rate = len(self._exchange_rate_cache)
+        return symbol_metadata
 
-            print(f"Loaded cache from {self.cache_file_path}:")
-            print(f"  - {total_symbols} symbols")
-            print(f"  - {total_overview} overview records")
-            print(f"  - {total_balance_sheet} balance sheet reports")
-            print(f"  - {total_cash_flow} cash flow reports")
-            print(f"  - {total_income_statement} income statement reports")
-            print(f"  - {total_symbol_searches} cached stock symbols for search")
-            print(f"  - {total_exchange_rate} exchange rate records")
+    def _record_metadata(
+        self,
+        data_type: str,
+        symbol: str,
+        source: str,
+        payload_bytes: int,
+        report_count: int,
+        fetched_at: str | None = None,
+        checked_quarter: str | None = None,
+    ):
+        """Store fetch time, source and size of a cached entry."""
+        # Several data types of a symbol are written from different threads
+        with self._lock:
+            symbol_metadata = self._get_symbol_metadata(symbol)
+            symbol_metadata[data_type] = CacheEntryMetadata(
+                data_type=data_type,
+                symbol=symbol,
+                fetched_at=fetched_at or datetime.now().isoformat(),
+                source=source,
+                payload_bytes=payload_bytes,
+                report_count=report_count,
+                checked_quarter=checked_quarter,
+            )
+            record = {key: entry.model_dump() for key, entry in symbol_metadata.items()}
+            self._models.put(
+                ("metadata", symbol), symbol_metadata, size=_payload_size(record)
+            )
+            self._persist_entry("metadata", symbol, record)
 
-            if "last_updated" in cache_data:
-                print(f"  - Last updated: {cache_data['last_updated']}")
+    def get_entry_metadata(
+        self, data_type: str, symbol: str
+    ) -> CacheEntryMetadata | None:
+        """Get fetch time, source, payload size and report count of a cached entry."""
+        return self._get_symbol_metadata(symbol).get(data_type)
 
-        except Exception as e:
-            print(f"Warning: Failed to load cache from {self.cache_file_path}: {e}")
-            print("Starting with empty cache.")
+    def _latest_quarter(self, symbol: str) -> str | None:
+        overview = self.get_overview(symbol)
+        return overview.latest_quarter if overview else None
 
-    def _merge_financial_reports(
+    def _redate(
         self,
-        existing: list[BalanceSheetReport | CashFlowReport | IncomeStatementReport]
-        | None,
-        new_data: list[BalanceSheetReport | CashFlowReport | IncomeStatementReport],
-    ) -> list[BalanceSheetReport | CashFlowReport | IncomeStatementReport]:
-        """Merge existing and new financial report data, avoiding duplicates based on fiscal_date_ending."""
-        if not existing:
-            return new_data
-
-        # Create a set of existing fiscal dates for O(1) lookup
-        existing_dates = {report.fiscal_date_ending for report in existing}
+        data_type: str,
+        symbol: str,
+        fetched_at: str | None,
+        checked_quarter: str | None = None,
+    ):
+        metadata = self.get_entry_metadata(data_type, symbol)
+        if metadata is None:
+            return
+        self._record_metadata(
+            data_type,
+            symbol,
+            source=metadata.source,
+            payload_bytes=metadata.payload_bytes,
+            report_count=metadata.report_count,
+            fetched_at=fetched_at,
+            checked_quarter=checked_quarter or metadata.checked_quarter,
+        )
 
-        # Only add reports that don't exist yet
-        merged = existing.copy()
-        merged.extend(
-            [
-                report
-                for report in new_data
-                if report.fiscal_date_ending not in existing_dates
-            ]
+    def mark_revalidated(self, data_type: str, symbol: str):
+        """Restart the TTL of an entry confirmed to be current without fetching it again."""
+        self._redate(
+            data_type,
+            symbol,
+            fetched_at=None,
+            checked_quarter=self._latest_quarter(symbol)
+            if data_type in STATEMENT_TYPES
+            else None,
         )
-        return merged
 
-    def _merge_calculated_metrics(
-        self,
-        existing: list[CalculatedMetrics] | None,
-        new_data: list[CalculatedMetrics],
-    ) -> list[CalculatedMetrics]:
-        """Merge existing and new calculated metrics data, avoiding duplicates based on fiscal_date_ending."""
-        if not existing:
-            return new_data
-
-        # Create a set of existing fiscal dates for O(1) lookup
-        existing_dates = {metric.fiscal_date_ending for metric in existing}
-
-        # Only add metrics that don't exist yet
-        merged = existing.copy()
-        merged.extend(
-            [
-                metric
-                for metric in new_data
-                if metric.fiscal_date_ending not in existing_dates
-            ]
+    def set_fetched_at(self, data_type: str, symbol: str, fetched_at: str):
+        """Date an entry back to when its data was fetched, e.g. when restored from an archive."""
+        self._redate(data_type, symbol, fetched_at)
+
+    def is_stale(self, data_type: str, symbol: str) -> bool:
+        """Check whether a cached entry outlived its TTL or misses a newer quarter."""
+        metadata = self.get_entry_metadata(data_type, symbol)
+        if data_type not in SECTION_MODELS:
+            return self.policy.is_stale(metadata)
+
+        return self.policy.is_stale(
+            metadata,
+            latest_quarter=self._latest_quarter(symbol),
+            reports=self._get_models(data_type, symbol)
+            if data_type != "overview"
+            else None,
+            quarterly_dates=[
+                record.get("fiscalDateEnding")
+                for record in self._get_quarterly_payload(symbol).get(data_type, [])
+            ],
         )
-        return merged
 
     # Overview/MetaData methods
     def get_overview(self, symbol: str) -> StockMetaData | None:
         """Get cached overview data if available."""
-        return self._overview_cache.get(symbol)
+        return self._get_models("overview", symbol)
+
+    def set_overview(self, symbol: str, data: StockMetaData, source: str = "API"):
+        """Cache overview data and persist it."""
+        record = data.model_dump()
+        payload_bytes = _payload_size(record)
+        self._record_metadata(
+            "overview",
+            symbol,
+            source=source,
+            payload_bytes=payload_bytes,
+            report_count=1,
+        )
+        self._models.put(("overview", symbol), data, size=payload_bytes)
+        self._persist_entry("overview", symbol, record)
+
+    # Statement methods
+    def _get_quarterly_payload(self, symbol: str) -> dict[str, list[dict]]:
+        """Return the raw quarterly reports of a symbol per statement, loading them once."""
+        self._sync_with_backend()
+        entry = self._models.get(("quarterly_payload", symbol), _MISSING)
+        if entry is _MISSING:
+            entry = self.backend.get("quarterly_payload", symbol) or {}
+            self._models.put(
+                ("quarterly_payload", symbol), entry, size=_payload_size(entry)
+            )
+        return entry
+
+    def set_quarterly_payload(self, section: str, symbol: str, records: list[dict]):
+        """
+        Keep the raw quarterly reports of a statement response. They replace the
+        previous ones and are only validated into models once a selection asks for them.
+        """
+        # The three statements of a symbol are stored from different threads
+        with self._lock:
+            entry = {**self._get_quarterly_payload(symbol), section: records}
+            self._models.put(
+                ("quarterly_payload", symbol), entry, size=_payload_size(entry)
+            )
+            parsed = self._models.get(("quarterly_reports", symbol))
+            if parsed:
+                parsed.pop(section, None)
+            self._persist_entry("quarterly_payload", symbol, entry)
+
+    def _get_quarters(
+        self, section: str, symbol: str, periods: PeriodSelection
+    ) -> list[FinancialReport] | None:
+        """
+        Return the selected quarterly reports kept raw for a statement, parsing
+        those not requested before. None if the statement has no raw quarters.
+        """
+        # Parsed quarters are kept in step with set_quarterly_payload on other threads
+        with self._lock:
+            records = self._get_quarterly_payload(symbol).get(section)
+            if records is None:
+                return None
+
+            by_date = {record.get("fiscalDateEnding"): record for record in records}
+            dates = periods.quarter_dates(date for date in by_date if date)
+            parsed_reports = self._models.get(("quarterly_reports", symbol), _MISSING)
+            if parsed_reports is _MISSING:
+                parsed_reports = {}
+            parsed = parsed_reports.setdefault(section, {})
+
+            missing = [date for date in dates if date not in parsed]
+            if missing:
+                model = SECTION_MODELS[section]
+                try:
+                    for date in missing:
+                        parsed[date] = model(**by_date[date], quarter_report=True)
+                except Exception as e:
+                    print(
+                        f"Warning: Failed to load quarterly {section.replace('_', ' ')} data for {symbol}: {e}"
+                    )
+                    return None
+                self._models.put(
+                    ("quarterly_reports", symbol),
+                    parsed_reports,
+                    size=sum(
+                        _payload_size(
+                            [by_date[date] for date in reports if date in by_date]
+                        )
+                        for reports in parsed_reports.values()
+                    ),
+                )
+
+            return [parsed[date] for date in dates]
+
+    def get_statement(
+        self, section: str, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> list[FinancialReport] | None:
+        """
+        Get the cached reports of a statement for the selected periods: annual
+        reports first, then quarters newest first. None if nothing is cached.
+        """
+        reports = self._get_models(section, symbol)
+        quarters = self._get_quarters(section, symbol, periods)
+        if reports is None and quarters is None:
+            return None
 
-    def set_overview(self, symbol: str, data: StockMetaData):
-        """Cache overview data and save to file."""
-        self._overview_cache[symbol] = data
-        self._save_to_file()
+        if quarters is None:
+            return reports if periods == ALL_PERIODS else periods.apply(reports)
+        selected = periods.apply(reports or [])
+        # Quarters kept raw come from the latest response and supersede parsed ones
+        return [report for report in selected if report.annual_report] + sorted(
+            quarters, key=lambda report: report.fiscal_date_ending, reverse=True
+        )
+
+    def get_latest_fiscal_date(self, section: str, symbol: str) -> str | None:
+        """Most recent fiscal date of a cached statement, raw quarters included."""
+        dates = [
+            report.fiscal_date_ending
+            for report in self._get_models(section, symbol) or []
+        ] + [
+            record.get("fiscalDateEnding")
+            for record in self._get_quarterly_payload(symbol).get(section, [])
+        ]
+        return max((date for date in dates if date), default=None)
 
     # Balance Sheet methods
-    def get_balance_sheet(self, symbol: str) -> list[BalanceSheetReport] | None:
-        """Get cached balance sheet data if available."""
-        return self._balance_sheet_cache.get(symbol)
-
-    def set_balance_sheet(self, symbol: str, data: list[BalanceSheetReport]):
-        """Append new balance sheet data to cache and save to file."""
-        self._balance_sheet_cache[symbol] = self._merge_financial_reports(
-            self._balance_sheet_cache.get(symbol), data
-        )
-        self._save_to_file()
+    def get_balance_sheet(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> list[BalanceSheetReport] | None:
+        """Get cached balance sheet data of the selected periods if available."""
+        return self.get_statement("balance_sheet", symbol, periods)
+
+    def set_balance_sheet(
+        self,
+        symbol: str,
+        data: list[BalanceSheetReport],
+        source: str = "API",
+        replace: bool = False,
+    ):
+        """
+        Append new balance sheet data to cache and persist it. With replace, reports
+        of already cached periods are overwritten as well.
+        """
+        self._append_reports("balance_sheet", symbol, data, source, replace=replace)
 
     # Cash Flow methods
-    def get_cash_flow(self, symbol: str) -> list[CashFlowReport] | None:
-        """Get cached cash flow data if available."""
-        return self._cash_flow_cache.get(symbol)
-
-    def set_cash_flow(self, symbol: str, data: list[CashFlowReport]):
-        """Append new cash flow data to cache and save to file."""
-        self._cash_flow_cache[symbol] = self._merge_financial_reports(
-            self._cash_flow_cache.get(symbol), data
-        )
-        self._save_to_file()
+    def get_cash_flow(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> list[CashFlowReport] | None:
+        """Get cached cash flow data of the selected periods if available."""
+        return self.get_statement("cash_flow", symbol, periods)
+
+    def set_cash_flow(
+        self,
+        symbol: str,
+        data: list[CashFlowReport],
+        source: str = "API",
+        replace: bool = False,
+    ):
+        """
+        Append new cash flow data to cache and persist it. With replace, reports
+        of already cached periods are overwritten as well.
+        """
+        self._append_reports("cash_flow", symbol, data, source, replace=replace)
 
     # Income Statement methods
-    def get_income_statement(self, symbol: str) -> list[IncomeStatementReport] | None:
-        """Get cached income statement data if available."""
-        return self._income_statement_cache.get(symbol)
-
-    def set_income_statement(self, symbol: str, data: list[IncomeStatementReport]):
-        """Append new income statement data to cache and save to file."""
-        self._income_statement_cache[symbol] = self._merge_financial_reports(
-            self._income_statement_cache.get(symbol), data
-        )
-        self._save_to_file()
+    def get_income_statement(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> list[IncomeStatementReport] | None:
+        """Get cached income statement data of the selected periods if available."""
+        return self.get_statement("income_statement", symbol, periods)
+
+    def set_income_statement(
+        self,
+        symbol: str,
+        data: list[IncomeStatementReport],
+        source: str = "API",
+        replace: bool = False,
+    ):
+        """
+        Append new income statement data to cache and persist it. With replace, reports
+        of already cached periods are overwritten as well.
+        """
+        self._append_reports("income_statement", symbol, data, source, replace=replace)
 
     # Calculated Metrics methods
     def get_calculated_metrics(self, symbol: str) -> list[CalculatedMetrics] | None:
         """Get cached calculated metrics if available."""
-        return self._calculated_metrics_cache.get(symbol)
+        return self._get_models("calculated_metrics", symbol)
 
-    def set_calculated_metrics(self, symbol: str, data: list[CalculatedMetrics]):
-        """Append new calculated metrics to cache and save to file."""
-        self._calculated_metrics_cache[symbol] = self._merge_calculated_metrics(
-            self._calculated_metrics_cache.get(symbol), data
-        )
-        self._save_to_file()
+    def set_calculated_metrics(
+        self, symbol: str, data: list[CalculatedMetrics], source: str = "API"
+    ):
+        """Store calculated metrics, replacing those of already cached periods."""
+        self._append_reports("calculated_metrics", symbol, data, source, replace=True)
 
     # Exchange Rate methods
     def get_exchange_rate(self, symbol: str) -> float | None:
         """Get cached exchange rate if available."""
-        return self._exchange_rate_cache.get(symbol)
-
-    def set_exchange_rate(self, symbol: str, exchange_rate: float):
-        """Cache exchange rate and save to file."""
+        self._sync_with_backend()
+        if symbol not in self._exchange_rate_cache:
+            exchange_rate = self.backend.get("exchange_rate", symbol)
+            if exchange_rate is None:
+                return None
+            self._exchange_rate_cache[symbol] = exchange_rate
+        return self._exchange_rate_cache[symbol]
+
+    def set_exchange_rate(self, symbol: str, exchange_rate: float, source: str = "API"):
+        """Cache exchange rate and persist it."""
         self._exchange_rate_cache[symbol] = exchange_rate
-        self._save_to_file()
+        self._record_metadata(
+            "exchange_rate",
+            symbol,
+            source=source,
+            payload_bytes=_payload_size(exchange_rate),
+            report_count=1,
+        )
+        self._persist_entry("exchange_rate", symbol, exchange_rate)
+
+    # FX History methods
+    def get_fx_history(self, currency: str) -> dict[str, float] | None:
+        """Get cached month end rates (date -> rate to USD) of a currency if available."""
+        self._sync_with_backend()
+        if currency not in self._fx_history_cache:
+            history = self.backend.get("fx_history", currency)
+            if history is None:
+                return None
+            self._fx_history_cache[currency] = history
+        return self._fx_history_cache[currency]
+
+    def set_fx_history(
+        self, currency: str, history: dict[str, float], source: str = "API"
+    ):
+        """Cache the rate history of a currency, merged with cached dates, and persist it."""
+        merged = {**(self.get_fx_history(currency) or {}), **history}
+        self._fx_history_cache[currency] = merged
+        self._record_metadata(
+            "fx_history",
+            currency,
+            source=source,
+            payload_bytes=_payload_size(merged),
+            report_count=len(merged),
+        )
+        self._persist_entry("fx_history", currency, merged)
 
     # Symbol Search methods
-    def search_symbols(self, query: str) -> list[dict] | None:
+    def search_symbols(self, query: str, limit: int | None = None) -> list[dict] | None:
         """
         Search for symbols in cache that match the query by symbol or company name.
+        Results are ranked exact symbol > symbol prefix > name tokens > fuzzy name match.
         Returns matching results or None if no matches found.
         """
-        if not self._symbol_search_cache:
+        symbol_search_cache = self._get_symbol_search_cache()
+        if not symbol_search_cache:
             return None
 
-        query_lower = query.lower().strip()
-        matches = []
-
-        for symbol, stock_data in self._symbol_search_cache.items():
-            # Check if query matches symbol (case-insensitive)
-            if query_lower == symbol.lower():
-                matches.append(stock_data)
-                continue
-
-            # Check if query matches company name (case-insensitive, partial match)
-            company_name = stock_data.get("2. name", "").lower()
-            if company_name and (
-                query_lower in company_name or company_name in query_lower
-            ):
-                matches.append(stock_data)
-                continue
-
-            # Check if query is a partial match of symbol
-            if query_lower in symbol.lower():
-                matches.append(stock_data)
-
+        matches = [
+            symbol_search_cache[symbol]
+            for symbol in self._symbol_index.search(query, limit)
+        ]
         return matches if matches else None
 
     def add_symbol_results(self, results: list[dict]):
@@ -368,93 +762,165 @@ class PersistentCache:
         Add symbol search results to cache, storing each result by its symbol.
         Merges with existing data to avoid duplicates.
         """
+        symbol_search_cache = self._get_symbol_search_cache()
         for result in results:
             symbol = result.get("1. symbol")
             if symbol:
                 # Store the complete result keyed by symbol
-                self._symbol_search_cache[symbol] = result
+                symbol_search_cache[symbol] = result
+                self._symbol_index.add(symbol, result.get("2. name", ""))
+                self._persist_entry("symbol_search", symbol, result)
+
+    def bulk_add_symbol_results(
+        self, results: list[dict], replace_existing: bool = True
+    ) -> int:
+        """
+        Add many symbol search results at once and persist them in a single backend
+        batch, bypassing write-behind so large imports don't trigger repeated flushes.
+        Without replace_existing, symbols already cached are left as they are.
+        Returns the number of results stored.
+        """
+        symbol_search_cache = self._get_symbol_search_cache()
+        entries = {}
+        for result in results:
+            symbol = result.get("1. symbol")
+            if symbol and (replace_existing or symbol not in symbol_search_cache):
+                symbol_search_cache[symbol] = result
+                self._symbol_index.add(symbol, result.get("2. name", ""))
+                entries[symbol] = result
+
+        with self._lock:
+            # Buffered results for the same symbols would overwrite the import later
+            for symbol in entries:
+                self._pending_entries.pop(("symbol_search", symbol), None)
+            with self.backend.batch():
+                for symbol, result in entries.items():
+                    self.backend.upsert_entry("symbol_search", symbol, result)
+        return len(entries)
+
+    # Symbol query methods
+    def get_query_results(self, query: str) -> list[dict] | None:
+        """
+        Get the complete result list of an earlier search for the same normalized
+        query, or None if the query is unknown or its results expired.
+        """
+        key = normalize_query(query)
+        if not key:
+            return None
+
+        self._sync_with_backend()
+        entry = self._symbol_query_cache.get(key)
+        if entry is None:
+            entry = self.backend.get("symbol_query", key)
+            if not entry:
+                return None
+            self._symbol_query_cache[key] = entry
+
+        try:
+            metadata = CacheEntryMetadata(**entry["metadata"])
+        except Exception as e:
+            print(f"Warning: Failed to load symbol query '{key}': {e}")
+            return None
+        if self.policy.is_expired(metadata):
+            return None
+        return entry["results"]
+
+    def set_query_results(self, query: str, results: list[dict], source: str = "API"):
+        """Cache the result list of a search query under its normalized form."""
+        key = normalize_query(query)
+        if not key:
+            return
 
-        self._save_to_file()
+        metadata = CacheEntryMetadata(
+            data_type="symbol_query",
+            symbol=key,
+            fetched_at=datetime.now().isoformat(),
+            source=source,
+            payload_bytes=_payload_size(results),
+            report_count=len(results),
+        )
+        entry = {"metadata": metadata.model_dump(), "results": results}
+        self._symbol_query_cache[key] = entry
+        self._persist_entry("symbol_query", key, entry)
 
     # Utility methods
     def has_cached_data(self, symbol: str, data_type: str) -> bool:
         """Check if specific data type is cached for a symbol."""
-        cache_map = {
-            "overview": self._overview_cache,
-            "balance_sheet": self._balance_sheet_cache,
-            "cash_flow": self._cash_flow_cache,
-            "income_statement": self._income_statement_cache,
-            "calculated_metrics": self._calculated_metrics_cache,
-        }
-
-        cache = cache_map.get(data_type)
-        if cache is None:
+        if data_type not in SECTION_MODELS:
             return False
 
-        return symbol in cache and cache[symbol] is not None
+        return self._get_models(data_type, symbol) is not None
 
     def clear_cache(self, symbol: str | None = None):
-        """Clear cache for a specific symbol or all symbols and save to file."""
+        """Clear cache for a specific symbol or all symbols and persist the change."""
         if symbol:
             # Clear specific symbol
-            self._overview_cache.pop(symbol, None)
-            self._balance_sheet_cache.pop(symbol, None)
-            self._cash_flow_cache.pop(symbol, None)
-            self._income_statement_cache.pop(symbol, None)
-            self._calculated_metrics_cache.pop(symbol, None)
+            self._models.remove_where(lambda key: key[1] == symbol)
         else:
             # Clear all caches
-            self._overview_cache.clear()
-            self._balance_sheet_cache.clear()
-            self._cash_flow_cache.clear()
-            self._income_statement_cache.clear()
-            self._calculated_metrics_cache.clear()
+            self._models.clear()
+            self._exchange_rate_cache.clear()
+            self._fx_history_cache.clear()
             self._symbol_search_cache.clear()
+            self._symbol_index.clear()
+            self._symbol_search_loaded = True
+            self._symbol_query_cache.clear()
 
-        self._save_to_file()
+        self._discard_pending(symbol)
+        self.backend.delete(symbol)
 
     def get_cached_symbols(self) -> list[str]:
         """Get list of all cached symbols."""
         all_symbols = set()
-        all_symbols.update(self._overview_cache.keys())
-        all_symbols.update(self._balance_sheet_cache.keys())
-        all_symbols.update(self._cash_flow_cache.keys())
-        all_symbols.update(self._income_statement_cache.keys())
-        all_symbols.update(self._calculated_metrics_cache.keys())
+        for section in SECTION_MODELS:
+            all_symbols.update(self.backend.keys(section))
+        with self._lock:
+            pending_keys = list(self._pending_entries) + list(self._pending_reports)
+        all_symbols.update(
+            symbol for section, symbol in pending_keys if section in SECTION_MODELS
+        )
         return sorted(list(all_symbols))
 
     def get_cache_info(self) -> dict[str, Any]:
         """Get information about the current cache state."""
+        self.flush()
+        storage_info = self.backend.describe()
+        symbol_search_cache = self._get_symbol_search_cache()
         return {
-            "cache_file": str(self.cache_file_path),
-            "file_exists": self.cache_file_path.exists(),
+            "backend": storage_info["backend"],
+            "cache_file": storage_info["cache_file"],
+            "file_exists": storage_info["file_exists"],
             "total_symbols": len(self.get_cached_symbols()),
             "data_counts": {
-                "overview": len(self._overview_cache),
-                "balance_sheet_reports": sum(
-                    len(reports) for reports in self._balance_sheet_cache.values()
-                ),
-                "cash_flow_reports": sum(
-                    len(reports) for reports in self._cash_flow_cache.values()
-                ),
-                "income_statement_reports": sum(
-                    len(reports) for reports in self._income_statement_cache.values()
-                ),
-                "calculated_metrics": sum(
-                    len(metrics) for metrics in self._calculated_metrics_cache.values()
-                ),
-                "symbol_search_symbols": len(self._symbol_search_cache),
+                "overview": self.backend.count("overview"),
+                "balance_sheet_reports": self.backend.count("balance_sheet"),
+                "cash_flow_reports": self.backend.count("cash_flow"),
+                "income_statement_reports": self.backend.count("income_statement"),
+                "calculated_metrics": self.backend.count("calculated_metrics"),
+                "symbol_search_symbols": len(symbol_search_cache),
+                "symbol_queries": self.backend.count("symbol_query"),
+                "fx_histories": self.backend.count("fx_history"),
+                "quarterly_payloads": self.backend.count("quarterly_payload"),
             },
             "symbol_search_cache": {
                 symbol: stock_data.get("2. name", "Unknown")
-                for symbol, stock_data in self._symbol_search_cache.items()
+                for symbol, stock_data in symbol_search_cache.items()
             },
-            "file_size_bytes": self.cache_file_path.stat().st_size
-            if self.cache_file_path.exists()
-            else 0,
+            "file_size_bytes": storage_info["file_size_bytes"],
+            "memory": self.memory_stats(),
         }
 
 
+def _report_key(report: FinancialReport | CalculatedMetrics) -> tuple[str, bool]:
+    """Period of a cached report, see storage.report_key."""
+    return report.fiscal_date_ending, bool(getattr(report, "quarter_report", False))
+
+
+def _payload_size(records: Any) -> int:
+    """Size in bytes of records serialized as JSON."""
+    return len(json.dumps(records, ensure_ascii=False).encode("utf-8"))
+
+
 _cache = PersistentCache()
 
 
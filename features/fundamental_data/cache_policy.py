@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from typing import Iterable
+from config.env import (
+    CACHE_TTL_OVERVIEW_HOURS,
+    CACHE_TTL_EXCHANGE_RATE_HOURS,
+    CACHE_TTL_FX_HISTORY_DAYS,
+    CACHE_TTL_STATEMENTS_DAYS,
+    CACHE_TTL_SYMBOL_QUERY_HOURS,
+    CACHE_STALE_WHILE_REVALIDATE,
+)
+from .model import CacheEntryMetadata, FinancialReport
+
+STATEMENT_TYPES = ("balance_sheet", "cash_flow", "income_statement")
+
+DEFAULT_TTLS: dict[str, timedelta | None] = {
+    # Market capitalization and spot FX rates move daily
+    "overview": timedelta(hours=CACHE_TTL_OVERVIEW_HOURS),
+    "exchange_rate": timedelta(hours=CACHE_TTL_EXCHANGE_RATE_HOURS),
+    # Monthly FX closes; only the running month changes
+    "fx_history": timedelta(days=CACHE_TTL_FX_HISTORY_DAYS),
+    # Annual statements only change once a year; new quarters are detected
+    # through the overview's LatestQuarter instead
+    "balance_sheet": timedelta(days=CACHE_TTL_STATEMENTS_DAYS),
+    "cash_flow": timedelta(days=CACHE_TTL_STATEMENTS_DAYS),
+    "income_statement": timedelta(days=CACHE_TTL_STATEMENTS_DAYS),
+    # Result lists of SYMBOL_SEARCH queries; listings rarely change
+    "symbol_query": timedelta(hours=CACHE_TTL_SYMBOL_QUERY_HOURS),
+    # Derived from statements, never fetched
+    "calculated_metrics": None,
+}
+
+
+class CachePolicy:
+    """Decides when cached entries are stale, per data type."""
+
+    def __init__(
+        self,
+        ttls: dict[str, timedelta | None] | None = None,
+        stale_while_revalidate: bool = CACHE_STALE_WHILE_REVALIDATE,
+    ):
+        """
+        Args:
+            ttls: Time to live per data type, None disables expiry for a type
+            stale_while_revalidate: Serve stale entries immediately and refresh
+                them in the background instead of blocking on the API
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.stale_while_revalidate = stale_while_revalidate
+
+    def is_expired(
+        self, metadata: CacheEntryMetadata | None, now: datetime | None = None
+    ) -> bool:
+        """Check whether an entry outlived the TTL of its data type."""
+        if metadata is None:
+            # Entries cached before metadata existed have an unknown age
+            return True
+
+        ttl = self.ttls.get(metadata.data_type)
+        if ttl is None:
+            return False
+
+        now = now or datetime.now()
+        return now - datetime.fromisoformat(metadata.fetched_at) > ttl
+
+    def has_newer_quarter(
+        self,
+        latest_quarter: str | None,
+        reports: list[FinancialReport] | None,
+        quarterly_dates: Iterable[str] = (),
+    ) -> bool:
+        """
+        Check whether the overview announces a quarter missing from the cached
+        reports or from the fiscal dates of quarterly reports kept raw.
+        """
+        if not latest_quarter:
+            return False
+
+        quarterly_dates = [
+            report.fiscal_date_ending
+            for report in reports or []
+            if report.quarter_report
+        ] + [date for date in quarterly_dates if date]
+        if not quarterly_dates:
+            return False
+
+        return latest_quarter > max(quarterly_dates)
+
+    def is_checked(
+        self, metadata: CacheEntryMetadata | None, latest_quarter: str | None
+    ) -> bool:
+        """
+        Check whether a statement was already fetched against this LatestQuarter.
+        The API may announce a quarter before the statement endpoints publish it,
+        so such entries stay fresh until LatestQuarter changes or their TTL expires.
+        """
+        return (
+            metadata is not None
+            and latest_quarter is not None
+            and metadata.checked_quarter == latest_quarter
+        )
+
+    def is_stale(
+        self,
+        metadata: CacheEntryMetadata | None,
+        latest_quarter: str | None = None,
+        reports: list[FinancialReport] | None = None,
+        now: datetime | None = None,
+        quarterly_dates: Iterable[str] = (),
+    ) -> bool:
+        """Check whether an entry should be refreshed."""
+        if self.is_expired(metadata, now):
+            return True
+
+        if metadata.data_type in STATEMENT_TYPES:
+            if self.is_checked(metadata, latest_quarter):
+                return False
+            return self.has_newer_quarter(latest_quarter, reports, quarterly_dates)
+
+        return False
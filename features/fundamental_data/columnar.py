@@ -0,0 +1,343 @@
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any
+
+# File layout:
+#   preamble (magic, format version, header length)
+#   header JSON: byte order, string table, column schema per section,
+#                (offset, rows) of every symbol block, span of the documents block,
+#                sequence of the last journal record folded into the snapshot
+#   symbol blocks, 8-byte aligned, one column after the other:
+#     float column:  validity bitmap (bit set = value present) + float64 per row
+#     string column: uint32 string table id per row
+#     bool column:   uint8 per row
+#   documents block: compact JSON of the non-columnar sections
+# Raw quarterly API reports get a section per statement, see raw_quarters_section
+MAGIC = b"AVCS"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<4sII")
+ALIGNMENT = 8
+
+FLOAT, STRING, BOOL = "f", "s", "b"
+NULL_STRING = 0xFFFFFFFF
+NULL_BOOL = 0xFF
+
+
+# Raw API records hold every value as a string: numbers are stored in float
+# columns and "None" as null, and both are turned back into strings when read
+RAW_NULL = "None"
+
+
+def raw_quarters_section(statement: str) -> str:
+    """Snapshot section holding the raw quarterly reports of a statement."""
+    return f"raw_quarters_{statement}"
+
+
+def _encode_raw_value(value: Any) -> Any:
+    if value == RAW_NULL:
+        return None
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return value
+        return number if math.isfinite(number) else value
+    return value
+
+
+def encode_raw_record(record: dict) -> dict:
+    """Type the string values of a raw API record for columnar storage."""
+    return {name: _encode_raw_value(value) for name, value in record.items()}
+
+
+def decode_raw_record(record: dict) -> dict:
+    """Turn a decoded row back into a raw API record of strings, nulls left out."""
+    return {
+        name: (
+            (str(int(value)) if value.is_integer() else repr(value))
+            if isinstance(value, float)
+            else value
+        )
+        for name, value in record.items()
+        if value is not None
+    }
+
+
+def _padding(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def _column_kind(value: Any) -> str:
+    if isinstance(value, bool):
+        return BOOL
+    if isinstance(value, (int, float)):
+        return FLOAT
+    if isinstance(value, str):
+        return STRING
+    raise ValueError(f"Value {value!r} cannot be stored in a columnar snapshot")
+
+
+def _column_size(kind: str, rows: int) -> int:
+    if kind == FLOAT:
+        bitmap_size = (rows + 7) // 8
+        return bitmap_size + _padding(bitmap_size) + 8 * rows
+    item_size = 4 if kind == STRING else 1
+    return item_size * rows + _padding(item_size * rows)
+
+
+def block_size(schema: list[tuple[str, str]], rows: int) -> int:
+    """Size in bytes of a symbol block with the given schema and row count."""
+    return sum(_column_size(kind, rows) for _, kind in schema)
+
+
+def extend_schema(
+    schema: list[tuple[str, str]], records: list[dict]
+) -> list[tuple[str, str]]:
+    """Append columns of fields not in the schema yet, keeping existing column order."""
+    kinds = dict(schema)
+    extended = list(schema)
+    for record in records:
+        for name, value in record.items():
+            if value is None:
+                continue
+            kind = _column_kind(value)
+            if name not in kinds:
+                kinds[name] = kind
+                extended.append((name, kind))
+            elif kinds[name] != kind:
+                raise ValueError(
+                    f"Field '{name}' mixes {kinds[name]} and {kind} values"
+                )
+    # Fields that were only ever null are stored as float columns
+    for record in records:
+        for name in record:
+            if name not in kinds:
+                kinds[name] = FLOAT
+                extended.append((name, FLOAT))
+    return extended
+
+
+class StringTable:
+    """Append-only table of strings referenced by id from string columns."""
+
+    def __init__(self, strings: list[str] | None = None):
+        self.strings = list(strings or [])
+        self._ids = {string: index for index, string in enumerate(self.strings)}
+
+    def id(self, string: str) -> int:
+        if string not in self._ids:
+            self._ids[string] = len(self.strings)
+            self.strings.append(string)
+        return self._ids[string]
+
+
+def encode_block(
+    records: list[dict], schema: list[tuple[str, str]], strings: StringTable
+) -> bytes:
+    """Encode the reports of one symbol column by column."""
+    rows = len(records)
+    block = bytearray()
+    for name, kind in schema:
+        values = [record.get(name) for record in records]
+        if kind == FLOAT:
+            validity = bytearray((rows + 7) // 8)
+            column = array("d", bytes(8 * rows))
+            for row, value in enumerate(values):
+                if value is not None:
+                    validity[row >> 3] |= 1 << (row & 7)
+                    column[row] = value
+            block += validity + bytes(_padding(len(validity)))
+            block += column.tobytes()
+        elif kind == STRING:
+            column = array(
+                "I", (NULL_STRING if v is None else strings.id(v) for v in values)
+            )
+            data = column.tobytes()
+            block += data + bytes(_padding(len(data)))
+        else:
+            data = bytes(NULL_BOOL if v is None else int(v) for v in values)
+            block += data + bytes(_padding(len(data)))
+    return bytes(block)
+
+
+class ColumnarSnapshot:
+    """Read-only, memory-mapped snapshot that decodes symbol blocks on demand."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._buffer = memoryview(self._mmap)
+
+        try:
+            magic, version, header_length = _PREAMBLE.unpack_from(self._buffer)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(
+                    f"{self.path} is not a version {FORMAT_VERSION} snapshot"
+                )
+            header_end = _PREAMBLE.size + header_length
+            header = json.loads(bytes(self._buffer[_PREAMBLE.size : header_end]))
+        except Exception:
+            self.close()
+            raise
+
+        self._data_start = header_end + _padding(header_end)
+        self._swap = header["byteorder"] != sys.byteorder
+        self.strings: list[str] = header["strings"]
+        self.schemas: dict[str, list[tuple[str, str]]] = {
+            section: [tuple(column) for column in schema]
+            for section, schema in header["schemas"].items()
+        }
+        self.blocks: dict[str, dict[str, list[int]]] = header["blocks"]
+        self._documents_span: list[int] = header["documents"]
+        self.last_updated: str | None = header.get("last_updated")
+        self.journal_sequence: int = header.get("journal_sequence", 0)
+
+    def symbols(self, section: str) -> list[str]:
+        return list(self.blocks.get(section, {}))
+
+    def rows(self, section: str, symbol: str) -> int:
+        return self.blocks[section][symbol][1]
+
+    def has(self, section: str, symbol: str) -> bool:
+        return symbol in self.blocks.get(section, {})
+
+    def read_block(self, section: str, symbol: str) -> list[dict] | None:
+        """Decode the reports of a symbol into raw records."""
+        if not self.has(section, symbol):
+            return None
+
+        offset, rows = self.blocks[section][symbol]
+        position = self._data_start + offset
+        records: list[dict] = [{} for _ in range(rows)]
+        for name, kind in self.schemas[section]:
+            size = _column_size(kind, rows)
+            if kind == FLOAT:
+                bitmap_size = (rows + 7) // 8
+                validity = bytes(self._buffer[position : position + bitmap_size])
+                values_start = position + bitmap_size + _padding(bitmap_size)
+                values = self._column(values_start, "d", rows)
+                for row, value in enumerate(values):
+                    present = validity[row >> 3] & (1 << (row & 7))
+                    records[row][name] = value if present else None
+            elif kind == STRING:
+                for row, string_id in enumerate(self._column(position, "I", rows)):
+                    records[row][name] = (
+                        None if string_id == NULL_STRING else self.strings[string_id]
+                    )
+            else:
+                for row, value in enumerate(self._buffer[position : position + rows]):
+                    records[row][name] = None if value == NULL_BOOL else bool(value)
+            position += size
+        return records
+
+    def _column(self, start: int, typecode: str, rows: int) -> list:
+        """Read a typed column straight from the mapped file."""
+        item_size = array(typecode).itemsize
+        with self._buffer[start : start + item_size * rows] as raw:
+            if self._swap:
+                column = array(typecode, raw.tobytes())
+                column.byteswap()
+                return column.tolist()
+            with raw.cast(typecode) as column:
+                return column.tolist()
+
+    def raw_block(self, section: str, symbol: str) -> bytes:
+        """Return the encoded bytes of a symbol block, for copying into a new snapshot."""
+        offset, rows = self.blocks[section][symbol]
+        start = self._data_start + offset
+        return bytes(
+            self._buffer[start : start + block_size(self.schemas[section], rows)]
+        )
+
+    def read_documents(self) -> dict[str, Any]:
+        offset, length = self._documents_span
+        start = self._data_start + offset
+        if not length:
+            return {}
+        return json.loads(bytes(self._buffer[start : start + length]))
+
+    def close(self):
+        self._buffer.release()
+        self._mmap.close()
+        self._file.close()
+
+
+def write_snapshot(
+    path: str | Path,
+    sections: dict[str, dict[str, list[dict] | None]],
+    documents: dict[str, Any],
+    previous: ColumnarSnapshot | None = None,
+    last_updated: str | None = None,
+    journal_sequence: int = 0,
+):
+    """
+    Write a snapshot atomically. Section entries set to None are copied from the
+    previous snapshot without decoding when their section schema is unchanged.
+    """
+    path = Path(path)
+    same_byteorder = previous is not None and not previous._swap
+    strings = StringTable(previous.strings if same_byteorder else None)
+    schemas: dict[str, list[tuple[str, str]]] = {}
+    data = bytearray()
+    blocks: dict[str, dict[str, list[int]]] = {}
+
+    for section, symbols in sections.items():
+        previous_schema = previous.schemas.get(section, []) if previous else []
+        schema = list(previous_schema)
+        for records in symbols.values():
+            if records is not None:
+                schema = extend_schema(schema, records)
+        schemas[section] = schema
+        copy_raw = same_byteorder and schema == previous_schema
+
+        blocks[section] = {}
+        for symbol, records in symbols.items():
+            if records is None:
+                if copy_raw:
+                    blocks[section][symbol] = [
+                        len(data),
+                        previous.rows(section, symbol),
+                    ]
+                    data += previous.raw_block(section, symbol)
+                    continue
+                records = previous.read_block(section, symbol)
+            blocks[section][symbol] = [len(data), len(records)]
+            data += encode_block(records, schema, strings)
+
+    documents_data = json.dumps(
+        documents, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    header = json.dumps(
+        {
+            "byteorder": sys.byteorder,
+            "strings": strings.strings,
+            "schemas": schemas,
+            "blocks": blocks,
+            "documents": [len(data), len(documents_data)],
+            "last_updated": last_updated,
+            "journal_sequence": journal_sequence,
+        },
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    header_end = _PREAMBLE.size + len(header)
+    temp_file = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temp_file, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(bytes(_padding(header_end)))
+        f.write(data)
+        f.write(documents_data)
+    temp_file.replace(path)
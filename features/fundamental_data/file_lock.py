@@ -0,0 +1,67 @@
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are coordinated
+    fcntl = None
+
+SHARED = "shared"
+EXCLUSIVE = "exclusive"
+
+
+def _flock(file, mode: str | None):
+    if fcntl is None:
+        return
+    if mode is None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        fcntl.flock(file.fileno(), fcntl.LOCK_SH if mode == SHARED else fcntl.LOCK_EX)
+
+
+class FileLock:
+    """
+    Advisory lock on a sidecar file with shared readers and exclusive writers
+    across processes. Reentrant within a process; an exclusive section nested in
+    a shared one upgrades the lock for its duration.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._file = None
+        self._mode: str | None = None
+
+    @contextmanager
+    def shared(self):
+        with self._locked(SHARED):
+            yield
+
+    @contextmanager
+    def exclusive(self):
+        with self._locked(EXCLUSIVE):
+            yield
+
+    @contextmanager
+    def _locked(self, mode: str):
+        with self._thread_lock:
+            previous = self._mode
+            if previous is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a+b")
+            if previous is None or (mode == EXCLUSIVE and previous == SHARED):
+                _flock(self._file, mode)
+                self._mode = mode
+
+            try:
+                yield
+            finally:
+                if previous is None:
+                    _flock(self._file, None)
+                    self._file.close()
+                    self._file = None
+                    self._mode = None
+                elif previous != self._mode:
+                    _flock(self._file, previous)
+                    self._mode = previous
@@ -0,0 +1,63 @@
+from bisect import bisect_left
+from datetime import date
+
+USD = "USD"
+
+FX_MONTHLY_SERIES = "Time Series FX (Monthly)"
+
+
+def parse_fx_monthly(data: dict) -> dict[str, float]:
+    """Map the month end dates of an FX_MONTHLY response to their closing rate."""
+    series = data.get(FX_MONTHLY_SERIES) or {}
+    return {day: float(values["4. close"]) for day, values in series.items()}
+
+
+def _ordinal(day: str) -> int:
+    return date.fromisoformat(day[:10]).toordinal()
+
+
+class FxRates:
+    """
+    Dated exchange rates of currencies to USD, looked up by the nearest date.
+    Rates between two other currencies are triangulated through USD, so one
+    history per currency covers every pair.
+    """
+
+    def __init__(self, histories: dict[str, dict[str, float]] | None = None):
+        self._days: dict[str, list[int]] = {}
+        self._rates: dict[str, list[float]] = {}
+        for currency, history in (histories or {}).items():
+            self.add(currency, history)
+
+    def __contains__(self, currency: str) -> bool:
+        return currency == USD or currency in self._days
+
+    def add(self, currency: str, history: dict[str, float]):
+        """Set the rate history (date -> units of USD per unit) of a currency."""
+        days = sorted(history)
+        self._days[currency] = [_ordinal(day) for day in days]
+        self._rates[currency] = [history[day] for day in days]
+
+    def to_usd(self, currency: str, day: str) -> float | None:
+        """Rate to USD of a currency on the date closest to the given one."""
+        if currency == USD:
+            return 1.0
+        days = self._days.get(currency)
+        if not days:
+            return None
+
+        target = _ordinal(day)
+        index = bisect_left(days, target)
+        nearest = min(
+            (i for i in (index - 1, index) if 0 <= i < len(days)),
+            key=lambda i: abs(days[i] - target),
+        )
+        return self._rates[currency][nearest]
+
+    def rate(self, from_currency: str, to_currency: str, day: str) -> float | None:
+        """Rate between two currencies on a date, triangulated through USD."""
+        from_usd = self.to_usd(from_currency, day)
+        to_usd = self.to_usd(to_currency, day)
+        if from_usd is None or not to_usd:
+            return None
+        return from_usd / to_usd
@@ -0,0 +1,243 @@
+import random
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.env import (
+    ALPHAVANTAGE_API_KEY,
+    ALPHAVANTAGE_BACKOFF_SECONDS,
+    ALPHAVANTAGE_CONNECT_TIMEOUT_SECONDS,
+    ALPHAVANTAGE_MAX_RETRIES,
+    ALPHAVANTAGE_POOL_SIZE,
+    ALPHAVANTAGE_READ_TIMEOUT_SECONDS,
+    ALPHAVANTAGE_THROTTLE_COOLDOWN_SECONDS,
+)
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .response_archive import ResponseArchive, get_response_archive
+
+BASE_URL = "https://www.alphavantage.co/query"
+
+# Server errors worth another attempt; client errors are returned right away
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+# Upper bound of a single backoff sleep
+MAX_BACKOFF_SECONDS = 30.0
+
+# Payload keys Alpha Vantage answers with, with HTTP 200, instead of data
+THROTTLE_KEYS = ("Note", "Information")
+ERROR_KEY = "Error Message"
+
+# Base of the backoff after a rate limit payload; the per-minute quota needs
+# far longer than a transient server error to recover
+THROTTLE_BACKOFF_SECONDS = 15.0
+MAX_THROTTLE_BACKOFF_SECONDS = 60.0
+
+
+class AlphaVantageError(Exception):
+    """Error payload returned by the API instead of data."""
+
+
+class ThrottledError(AlphaVantageError):
+    """Rate limit payload; the same request may succeed later."""
+
+
+def check_payload(data: dict):
+    """Raise if a response body is a throttle or error message rather than data."""
+    if not isinstance(data, dict):
+        return
+    for key in THROTTLE_KEYS:
+        if key in data:
+            raise ThrottledError(data[key])
+    if ERROR_KEY in data:
+        raise AlphaVantageError(data[ERROR_KEY])
+
+
+def _full_jitter(attempt: int, base: float, maximum: float) -> float:
+    """A random delay up to the exponential backoff of the attempt."""
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
+
+
+class AlphaVantageClient:
+    """
+    Shared HTTP session for the Alpha Vantage API with keep-alive connection
+    pooling, timeouts and bounded retries with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = ALPHAVANTAGE_API_KEY,
+        connect_timeout: float = ALPHAVANTAGE_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = ALPHAVANTAGE_READ_TIMEOUT_SECONDS,
+        max_retries: int = ALPHAVANTAGE_MAX_RETRIES,
+        backoff_seconds: float = ALPHAVANTAGE_BACKOFF_SECONDS,
+        pool_size: int = ALPHAVANTAGE_POOL_SIZE,
+        rate_limiter: RateLimiter | None = None,
+        throttle_cooldown: float = ALPHAVANTAGE_THROTTLE_COOLDOWN_SECONDS,
+        archive: ResponseArchive | None = None,
+    ):
+        """
+        Args:
+            api_key: Alpha Vantage API key added to every request
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for the server between bytes of the response
+            max_retries: Additional attempts after a connection error or 5xx response
+            backoff_seconds: Base of the exponential backoff between attempts
+            pool_size: Maximum number of kept-alive connections
+            rate_limiter: Quota every attempt waits for, None sends right away
+            throttle_cooldown: Seconds a request that stayed throttled after all
+                retries fails right away instead of calling the API again
+            archive: Store of the raw data responses, None keeps none
+        """
+        self.api_key = api_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.rate_limiter = rate_limiter
+        self.throttle_cooldown = throttle_cooldown
+        self.archive = archive
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.total_latency_seconds = 0.0
+        self.last_latency_seconds: float | None = None
+        self.throttled = 0
+        # Negative cache: request URL -> time until which it is not sent again
+        self._throttled_until: dict[str, float] = {}
+
+    def url(self, function: str, **params: str) -> str:
+        """Build the query URL of an API function."""
+        query = urlencode({"function": function, **params, "apikey": self.api_key})
+        return f"{BASE_URL}?{query}"
+
+    def get(self, function: str, **params: str) -> requests.Response:
+        """
+        Call an API function. Connection errors and 5xx responses are retried;
+        the last response is returned, or the last connection error raised,
+        once the retries are used up.
+        """
+        url = self.url(function, **params)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(time.perf_counter() - start, failed=True)
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                self._record(time.perf_counter() - start)
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    return response
+
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            time.sleep(_full_jitter(attempt, self.backoff_seconds, MAX_BACKOFF_SECONDS))
+
+    def get_json(self, function: str, **params: str) -> dict:
+        """
+        Call an API function and return its JSON body. Rate limit payloads are
+        retried with a longer backoff; a request still throttled afterwards is
+        not sent again during the cooldown. Raises AlphaVantageError for error
+        payloads and ThrottledError when the rate limit persists.
+        """
+        url = self.url(function, **params)
+        with self._lock:
+            throttled_until = self._throttled_until.get(url, 0.0)
+        if time.time() < throttled_until:
+            raise ThrottledError(
+                f"{function} was rate limited, retrying in "
+                f"{throttled_until - time.time():.0f}s"
+            )
+
+        attempt = 0
+        while True:
+            response = self.get(function, **params)
+            response.raise_for_status()
+            data = response.json()
+            try:
+                check_payload(data)
+            except ThrottledError:
+                with self._lock:
+                    self.throttled += 1
+                if attempt >= self.max_retries:
+                    with self._lock:
+                        self._throttled_until[url] = (
+                            time.time() + self.throttle_cooldown
+                        )
+                    raise
+            else:
+                with self._lock:
+                    self._throttled_until.pop(url, None)
+                self._archive(function, params, data)
+                return data
+
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            time.sleep(
+                _full_jitter(
+                    attempt, THROTTLE_BACKOFF_SECONDS, MAX_THROTTLE_BACKOFF_SECONDS
+                )
+            )
+
+    def _archive(self, function: str, params: dict[str, str], data: dict):
+        """Keep a data response in the archive; archive failures never fail the request."""
+        if self.archive is None:
+            return
+        try:
+            self.archive.store(function, params, data)
+        except OSError as e:
+            print(f"Warning: Failed to archive {function} response: {e}")
+
+    def _record(self, latency: float, failed: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.failures += failed
+            self.total_latency_seconds += latency
+            self.last_latency_seconds = latency
+
+    def stats(self) -> dict[str, float | int | None]:
+        """Return request counters and latencies of all attempts."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "failures": self.failures,
+                "throttled": self.throttled,
+                "last_latency_seconds": self.last_latency_seconds,
+                "average_latency_seconds": (
+                    self.total_latency_seconds / self.requests
+                    if self.requests
+                    else None
+                ),
+            }
+
+    def close(self):
+        self.session.close()
+
+
+_client = AlphaVantageClient(
+    rate_limiter=get_rate_limiter(), archive=get_response_archive()
+)
+
+
+def get_http_client() -> AlphaVantageClient:
+    """Get the shared Alpha Vantage HTTP client."""
+    return _client
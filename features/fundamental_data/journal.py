@@ -0,0 +1,80 @@
+import json
+import os
+from pathlib import Path
+
+
+class Journal:
+    """
+    Append-only JSON Lines log of cache mutations. Every record carries a sequence
+    number so records already folded into a snapshot are skipped on replay.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        # End of the last complete record read or written
+        self._offset = 0
+        self.records = 0
+
+    def signature(self) -> tuple[int, int, int] | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def rewind(self):
+        """Read the journal from the start on the next read_new()."""
+        self._offset = 0
+        self.records = 0
+
+    def read_new(self) -> list[dict]:
+        """Return the records appended since the last read, up to the first incomplete one."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            self.rewind()
+            return []
+        if size < self._offset:
+            # Truncated by a compaction
+            self.rewind()
+
+        records = []
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("missing line end")
+                    record = json.loads(line)
+                except ValueError:
+                    # An append interrupted by a crash; the next append overwrites it
+                    print(f"Warning: Ignoring incomplete record in {self.path}")
+                    break
+                records.append(record)
+                self._offset += len(line)
+                self.records += 1
+        return records
+
+    def append(self, records: list[dict]):
+        """Durably append records, dropping an incomplete record left by a crash."""
+        data = b"".join(
+            json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode(
+                "utf-8"
+            )
+            + b"\n"
+            for record in records
+        )
+        with open(self.path, "ab") as f:
+            if os.path.getsize(self.path) > self._offset:
+                f.truncate(self._offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._offset += len(data)
+        self.records += len(records)
+
+    def truncate(self):
+        """Drop all records once they are part of a snapshot."""
+        with open(self.path, "wb"):
+            pass
+        self.rewind()
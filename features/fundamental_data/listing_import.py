@@ -0,0 +1,70 @@
+import argparse
+import csv
+from pathlib import Path
+from typing import Iterable
+from .cache import PersistentCache, get_cache
+
+
+def parse_listing_status(
+    lines: Iterable[str], include_delisted: bool = False
+) -> list[dict]:
+    """
+    Convert LISTING_STATUS CSV rows (symbol,name,exchange,assetType,ipoDate,
+    delistingDate,status) into SYMBOL_SEARCH style results. Fields the listing
+    does not provide (region, market hours, timezone, currency) are left empty.
+    """
+    results = []
+    for row in csv.DictReader(lines):
+        symbol = (row.get("symbol") or "").strip()
+        if not symbol:
+            continue
+        if not include_delisted and (row.get("status") or "Active") != "Active":
+            continue
+
+        results.append(
+            {
+                "1. symbol": symbol,
+                "2. name": (row.get("name") or "").strip(),
+                "3. type": (row.get("assetType") or "").strip(),
+                "4. region": "",
+                "5. marketOpen": "",
+                "6. marketClose": "",
+                "7. timezone": "",
+                "8. currency": "",
+                "9. matchScore": "",
+            }
+        )
+    return results
+
+
+def import_listing_status(
+    csv_path: str | Path,
+    cache: PersistentCache | None = None,
+    include_delisted: bool = False,
+) -> int:
+    """
+    Load a local LISTING_STATUS CSV into the symbol search cache and index in one
+    bulk write. Symbols already cached from SYMBOL_SEARCH keep their complete
+    results. Returns the number of imported listings.
+    """
+    cache = cache or get_cache()
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        results = parse_listing_status(f, include_delisted)
+
+    imported = cache.bulk_add_symbol_results(results, replace_existing=False)
+    print(f"Imported {imported} listings from {csv_path}")
+    return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Import an Alpha Vantage LISTING_STATUS CSV into the symbol search cache"
+    )
+    parser.add_argument("csv_path", help="Path to the listing status CSV file")
+    parser.add_argument(
+        "--include-delisted",
+        action="store_true",
+        help="Also import delisted symbols",
+    )
+    args = parser.parse_args()
+    import_listing_status(args.csv_path, include_delisted=args.include_delisted)
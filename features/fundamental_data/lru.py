@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+
+class LRUCache:
+    """Memory-bounded least-recently-used map with hit, miss and eviction counters."""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        on_evict: Callable[[Hashable, Any], None] | None = None,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries kept, None for no limit
+            max_bytes: Maximum total size of the entries kept, None for no limit
+            on_evict: Called with (key, value) after an entry was evicted
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value of a key and mark it as most recently used."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any, size: int = 0):
+        """Insert or replace a value, evicting least recently used entries if over budget."""
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            evicted = self._evict_over_budget(keep=key)
+
+        self._notify(evicted)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key without counting it as an eviction."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value, size = self._entries.pop(key)
+            self._total_bytes -= size
+            return value
+
+    def remove_where(self, predicate: Callable[[Hashable], bool]):
+        """Remove all keys matching a predicate without counting evictions."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._total_bytes -= self._entries.pop(key)[1]
+
+    def keys(self) -> list[Hashable]:
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict[str, int | None]:
+        """Return counters and current usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _evict_over_budget(self, keep: Hashable) -> list[tuple[Hashable, Any]]:
+        """Drop least recently used entries until the budget fits. Lock must be held."""
+        evicted = []
+        while self._entries and self._over_budget():
+            key = next(iter(self._entries))
+            if key == keep:
+                # A single entry larger than the budget is kept until the next put
+                break
+            value, size = self._entries.pop(key)
+            self._total_bytes -= size
+            self.evictions += 1
+            evicted.append((key, value))
+        return evicted
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._total_bytes > self.max_bytes
+
+    def _notify(self, evicted: Iterable[tuple[Hashable, Any]]):
+        """Call the eviction callback outside the lock."""
+        if self.on_evict is None:
+            return
+        for key, value in evicted:
+            self.on_evict(key, value)
@@ -0,0 +1,108 @@
+from features.fundamental_data.model import (
+    BalanceSheetReport,
+    CalculatedMetrics,
+    CashFlowReport,
+    IncomeStatementReport,
+    StockMetaData,
+)
+
+
+def _ratio(numerator: float | None, denominator: float | None) -> float | None:
+    """Divide, or None when a value is missing or the denominator is zero."""
+    if numerator is None or not denominator:
+        return None
+    return numerator / denominator
+
+
+def _period(fiscal_date_ending: str, annual: bool) -> tuple[int, int | None]:
+    """Fiscal year and, for quarterly reports, the calendar quarter of the period end."""
+    year, month = int(fiscal_date_ending[:4]), int(fiscal_date_ending[5:7])
+    return year, None if annual else (month - 1) // 3 + 1
+
+
+def calculate_metrics(
+    overview: StockMetaData | None,
+    income_statement: list[IncomeStatementReport],
+    balance_sheet: list[BalanceSheetReport],
+    cash_flow: list[CashFlowReport],
+) -> list[CalculatedMetrics]:
+    """
+    Calculate ratios for every fiscal period covered by all three statements.
+
+    Metrics are keyed by fiscal date, so a quarter ending on the fiscal year end
+    is represented by the annual report. Market based ratios (P/E, FCF yield,
+    EBITDA multiple) use the current market capitalization and are therefore only
+    calculated for the latest annual period.
+    """
+    balance_by_period = {
+        (report.fiscal_date_ending, report.annual_report): report
+        for report in balance_sheet
+    }
+    cash_flow_by_period = {
+        (report.fiscal_date_ending, report.annual_report): report
+        for report in cash_flow
+    }
+    annual_dates = {
+        report.fiscal_date_ending for report in income_statement if report.annual_report
+    }
+    latest_annual = max(annual_dates, default=None)
+    market_cap = overview.market_capitalization if overview else None
+
+    metrics = []
+    for income in income_statement:
+        period = (income.fiscal_date_ending, income.annual_report)
+        balance = balance_by_period.get(period)
+        cashflow = cash_flow_by_period.get(period)
+        if balance is None or cashflow is None:
+            continue
+        if not income.annual_report and income.fiscal_date_ending in annual_dates:
+            continue
+
+        year, quarter = _period(income.fiscal_date_ending, income.annual_report)
+        free_cash_flow = (
+            cashflow.operating_cashflow - abs(cashflow.capital_expenditures)
+            if cashflow.operating_cashflow is not None
+            and cashflow.capital_expenditures is not None
+            else None
+        )
+        quick_assets = (
+            balance.total_current_assets - (balance.inventory or 0)
+            if balance.total_current_assets is not None
+            else None
+        )
+
+        metric = CalculatedMetrics(
+            fiscal_date_ending=income.fiscal_date_ending,
+            quarter=quarter,
+            year=year,
+            roe=_ratio(income.net_income, balance.total_shareholder_equity),
+            roa=_ratio(income.net_income, balance.total_assets),
+            debt_to_equity=_ratio(
+                balance.short_long_term_debt_total, balance.total_shareholder_equity
+            ),
+            current_ratio=_ratio(
+                balance.total_current_assets, balance.total_current_liabilities
+            ),
+            quick_ratio=_ratio(quick_assets, balance.total_current_liabilities),
+            interest_coverage=_ratio(
+                income.ebit if income.ebit is not None else income.operating_income,
+                income.interest_expense,
+            ),
+            gross_margin=_ratio(income.gross_profit, income.total_revenue),
+            operating_margin=_ratio(income.operating_income, income.total_revenue),
+            net_margin=_ratio(income.net_income, income.total_revenue),
+        )
+
+        if income.fiscal_date_ending == latest_annual and market_cap:
+            metric.pe_ratio = _ratio(market_cap, income.net_income)
+            metric.fcf_yield = _ratio(free_cash_flow, market_cap)
+            if balance.short_long_term_debt_total is not None:
+                enterprise_value = (
+                    market_cap
+                    + balance.short_long_term_debt_total
+                    - (balance.cash_and_cash_equivalents_at_carrying_value or 0)
+                )
+                metric.ebitda_multiple = _ratio(enterprise_value, income.ebitda)
+
+        metrics.append(metric)
+    return metrics
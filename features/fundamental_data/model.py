@@ -405,6 +405,46 @@ class CalculatedMetrics(BaseModel):
         return parse_float_or_none(v)
 
 
+class CacheEntryMetadata(BaseModel):
+    """Bookkeeping for a cached (data_type, symbol) entry."""
+
+    data_type: str
+    symbol: str
+    fetched_at: str
+    source: str = "API"
+    payload_bytes: int = 0
+    report_count: int = 0
+    # Overview's LatestQuarter when a statement was last fetched or revalidated
+    checked_quarter: str | None = None
+
+
+class ArchivedResponse(BaseModel):
+    """Index entry of a raw API response kept in the response archive."""
+
+    function: str
+    symbol: str
+    params: dict[str, str] = Field(default_factory=dict)
+    fetched_at: str
+    digest: str
+    size_bytes: int = 0
+
+
+class RefreshPlan(BaseModel):
+    """Statements of a symbol to re-fetch, decided by the overview's LatestQuarter."""
+
+    symbol: str
+    latest_quarter: str | None = None
+    # Statement data type -> most recent cached fiscal date, None if not cached
+    cached_periods: dict[str, str | None] = Field(default_factory=dict)
+    overview_fetched: bool = False
+    statements_to_fetch: list[str] = Field(default_factory=list)
+
+    @property
+    def api_calls(self) -> int:
+        """Number of API requests the refresh costs."""
+        return int(self.overview_fetched) + len(self.statements_to_fetch)
+
+
 class StockIncomeStatement(BaseModel):
     model_config = ConfigDict(
         alias_generator=to_camel,
@@ -0,0 +1,62 @@
+from typing import Iterable, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+from .model import FinancialReport
+
+R = TypeVar("R", bound=FinancialReport)
+
+
+class PeriodSelection(BaseModel):
+    """Reports of a statement that are parsed and returned: annual, quarterly or both."""
+
+    model_config = ConfigDict(frozen=True)
+
+    annual: bool = True
+    # Number of most recent quarterly reports, None for all of them
+    quarters: int | None = None
+
+    @classmethod
+    def annual_only(cls) -> "PeriodSelection":
+        return cls(quarters=0)
+
+    @classmethod
+    def last_quarters(cls, count: int, annual: bool = True) -> "PeriodSelection":
+        return cls(annual=annual, quarters=count)
+
+    @classmethod
+    def everything(cls) -> "PeriodSelection":
+        return cls()
+
+    @property
+    def includes_quarters(self) -> bool:
+        return self.quarters != 0
+
+    def quarter_dates(self, dates: Iterable[str]) -> set[str]:
+        """The fiscal dates of the selected quarters among the available ones."""
+        if not self.includes_quarters:
+            return set()
+        newest_first = sorted(set(dates), reverse=True)
+        return set(
+            newest_first if self.quarters is None else newest_first[: self.quarters]
+        )
+
+    def apply(self, reports: list[R]) -> list[R]:
+        """Keep the selected reports: annual ones first, then quarters newest first."""
+        annual = (
+            [report for report in reports if report.annual_report]
+            if self.annual
+            else []
+        )
+        quarterly = [report for report in reports if report.quarter_report]
+        dates = self.quarter_dates(report.fiscal_date_ending for report in quarterly)
+        selected_quarters = sorted(
+            (report for report in quarterly if report.fiscal_date_ending in dates),
+            key=lambda report: report.fiscal_date_ending,
+            reverse=True,
+        )
+        return annual + selected_quarters
+
+
+ALL_PERIODS = PeriodSelection.everything()
+ANNUAL_ONLY = PeriodSelection.annual_only()
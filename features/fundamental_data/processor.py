@@ -1,3 +1,4 @@
+from features.fundamental_data.fx_rates import USD, FxRates
 from features.fundamental_data.model import FundamentalData, ProcessedFundamentalData
 
 
@@ -112,6 +113,57 @@ def get_fundamental_data_time_series(
     return time_series
 
 
+# Amounts converted to USD; ratios and share counts are currency independent
+MONETARY_FIELDS = (
+    "revenue",
+    "net_income",
+    "gross_profit",
+    "operating_income",
+    "research_and_development",
+    "ebitda",
+    "shareholders_equity",
+    "total_debt",
+    "cash_and_equivalents",
+    "goodwill_and_intangible_assets",
+    "operating_cashflow",
+    "capital_expenditures",
+    "free_cash_flow",
+)
+
+
+def convert_time_series_to_usd(
+    fundamental_data_time_series: list[ProcessedFundamentalData],
+    fx_rates: FxRates,
+    fallback_rates: dict[str, float] | None = None,
+) -> list[ProcessedFundamentalData]:
+    """
+    Convert every period to USD at the rate closest to its fiscal date end.
+    Periods of currencies without history use the fallback (spot) rate.
+    """
+    fallback_rates = fallback_rates or {}
+    for period_data in fundamental_data_time_series:
+        currency = period_data.reported_currency
+        if currency == USD:
+            continue
+
+        exchange_rate = fx_rates.to_usd(currency, period_data.fiscal_date_ending)
+        if exchange_rate is None:
+            exchange_rate = fallback_rates.get(currency)
+        if exchange_rate is None:
+            print(
+                f"Warning: No exchange rate for {currency} on "
+                f"{period_data.fiscal_date_ending}, keeping reported values"
+            )
+            continue
+
+        for field in MONETARY_FIELDS:
+            value = getattr(period_data, field)
+            if value is not None:
+                setattr(period_data, field, value * exchange_rate)
+        period_data.reported_currency = USD
+    return fundamental_data_time_series
+
+
 def process_fundamental_data_to_usd(
     exchange_rate: float,
     fundamental_data_time_series: list[ProcessedFundamentalData],
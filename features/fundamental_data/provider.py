@@ -0,0 +1,495 @@
+import csv
+import json
+import mmap
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from config.env import FUNDAMENTAL_DATA_PROVIDER, LOCAL_DATA_PATH
+from . import alphavantage_adapter
+from .alphavantage_adapter import TICKER_DATA_TYPES, AlphaVantageAPI, DataResult
+from .columnar import ColumnarSnapshot, decode_raw_record, raw_quarters_section
+from .fx_rates import USD, FxRates, parse_fx_monthly
+from .listing_import import parse_listing_status
+from .metrics import calculate_metrics
+from .model import (
+    BalanceSheetReport,
+    CashFlowReport,
+    FinancialReport,
+    FundamentalData,
+    IncomeStatementReport,
+    StockMetaData,
+)
+from .periods import ALL_PERIODS, PeriodSelection
+from .symbol_index import SymbolIndex
+
+STATEMENT_MODELS: dict[str, type[FinancialReport]] = {
+    "balance_sheet": BalanceSheetReport,
+    "income_statement": IncomeStatementReport,
+    "cash_flow": CashFlowReport,
+}
+
+# Statement file formats of the local provider, in order of preference
+STATEMENT_SUFFIXES = (".json", ".jsonl", ".csv")
+
+# Period flags of a stored report, replaced by the ones the reader derives
+_PERIOD_FIELDS = (
+    "period",
+    "annual_report",
+    "quarter_report",
+    "annualReport",
+    "quarterReport",
+)
+
+
+class FundamentalDataProvider(ABC):
+    """Source of the overview, statements and FX rates the analysis runs on."""
+
+    name: str
+
+    @abstractmethod
+    def get_ticker_symbol(self, stock_name: str) -> DataResult:
+        """Search for ticker symbols, as SYMBOL_SEARCH style results."""
+
+    @abstractmethod
+    def get_ticker_overview(self, symbol: str) -> DataResult:
+        """Get the StockMetaData of a symbol."""
+
+    @abstractmethod
+    def get_balance_sheet(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        """Get the balance sheet reports of the selected periods."""
+
+    @abstractmethod
+    def get_income_statement(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        """Get the income statement reports of the selected periods."""
+
+    @abstractmethod
+    def get_cash_flow(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        """Get the cash flow reports of the selected periods."""
+
+    @abstractmethod
+    def get_stock_quote(self, symbol: str) -> dict:
+        """Get the latest GLOBAL_QUOTE style quote of a symbol, empty if unknown."""
+
+    @abstractmethod
+    def get_currency_ratio(self, currency: str) -> float | None:
+        """Get the current rate of a currency to USD."""
+
+    @abstractmethod
+    def get_fx_rates(self, currencies: set[str]) -> FxRates:
+        """Get dated rates to USD for the currencies."""
+
+    def get_ticker_data(
+        self,
+        symbol: str,
+        on_result: Callable[[str, DataResult], None] | None = None,
+        periods: PeriodSelection = ALL_PERIODS,
+    ) -> dict[str, DataResult]:
+        """Get the overview and the three statements of a symbol, keyed by data type."""
+        getters = {
+            "overview": self.get_ticker_overview,
+            "balance_sheet": lambda s: self.get_balance_sheet(s, periods),
+            "income_statement": lambda s: self.get_income_statement(s, periods),
+            "cash_flow": lambda s: self.get_cash_flow(s, periods),
+        }
+        results = {}
+        for data_type in TICKER_DATA_TYPES:
+            results[data_type] = getters[data_type](symbol)
+            if on_result:
+                on_result(data_type, results[data_type])
+        return results
+
+    def get_comprehensive_data(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> FundamentalData:
+        """Get the overview and statements of a symbol with their calculated metrics."""
+        results = self.get_ticker_data(symbol, periods=periods)
+        statements = {
+            data_type: results[data_type].data or [] for data_type in STATEMENT_MODELS
+        }
+        calculated_metrics = (
+            calculate_metrics(
+                results["overview"].data,
+                statements["income_statement"],
+                statements["balance_sheet"],
+                statements["cash_flow"],
+            )
+            if all(statements.values())
+            else None
+        )
+        return FundamentalData(
+            symbol=symbol,
+            overview=results["overview"].data,
+            calculated_metrics=calculated_metrics,
+            last_updated=datetime.now().isoformat(),
+            **statements,
+        )
+
+
+class AlphaVantageProvider(FundamentalDataProvider):
+    """Live Alpha Vantage API behind the persistent cache."""
+
+    name = "Alpha Vantage API"
+
+    def get_ticker_symbol(self, stock_name: str) -> DataResult:
+        return AlphaVantageAPI.get_ticker_symbol(stock_name)
+
+    def get_ticker_overview(self, symbol: str) -> DataResult:
+        return AlphaVantageAPI.get_ticker_overview(symbol)
+
+    def get_balance_sheet(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        return AlphaVantageAPI.get_balance_sheet(symbol, periods)
+
+    def get_income_statement(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        return AlphaVantageAPI.get_income_statement(symbol, periods)
+
+    def get_cash_flow(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        return AlphaVantageAPI.get_cash_flow(symbol, periods)
+
+    def get_stock_quote(self, symbol: str) -> dict:
+        return alphavantage_adapter.http_client.get_json("GLOBAL_QUOTE", symbol=symbol)
+
+    def get_currency_ratio(self, currency: str) -> float | None:
+        return AlphaVantageAPI.get_currency_ratio(currency)
+
+    def get_fx_rates(self, currencies: set[str]) -> FxRates:
+        return AlphaVantageAPI.get_fx_rates(currencies)
+
+    def get_ticker_data(
+        self,
+        symbol: str,
+        on_result: Callable[[str, DataResult], None] | None = None,
+        periods: PeriodSelection = ALL_PERIODS,
+    ) -> dict[str, DataResult]:
+        # Concurrent requests, see AlphaVantageAPI.get_ticker_data
+        return AlphaVantageAPI.get_ticker_data(symbol, on_result, periods)
+
+    def get_comprehensive_data(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> FundamentalData:
+        # Metrics are kept in the cache along with the statements
+        return AlphaVantageAPI.get_comprehensive_data(symbol, periods)
+
+
+@contextmanager
+def _mapped_lines(path: Path) -> Iterator[Iterator[bytes]]:
+    """Iterate over the lines of a file through a read-only memory map."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield iter(())
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield iter(mapped.readline, b"")
+
+
+def _fiscal_date(record: dict) -> str:
+    return record.get("fiscalDateEnding") or record.get("fiscal_date_ending") or ""
+
+
+def _is_quarterly(record: dict) -> bool:
+    """Period of a stored report, from a period column or the report flags."""
+    period = record.get("period")
+    if period:
+        return str(period).lower().startswith("q")
+    flag = record.get("quarter_report", record.get("quarterReport"))
+    return flag.lower() == "true" if isinstance(flag, str) else bool(flag)
+
+
+def _build_reports(
+    annual: list[dict],
+    quarterly: list[dict],
+    model: type[FinancialReport],
+    periods: PeriodSelection,
+) -> list[FinancialReport]:
+    """Validate only the reports of the selected periods, quarters newest first."""
+
+    def build(record: dict, quarter: bool) -> FinancialReport:
+        fields = {k: v for k, v in record.items() if k not in _PERIOD_FIELDS}
+        return model(**fields, annual_report=not quarter, quarter_report=quarter)
+
+    reports = [build(record, False) for record in annual] if periods.annual else []
+    by_date = {_fiscal_date(record): record for record in quarterly}
+    dates = periods.quarter_dates(date for date in by_date if date)
+    return reports + [
+        build(by_date[date], True) for date in sorted(dates, reverse=True)
+    ]
+
+
+class _DirectoryReader:
+    """
+    Files below a root directory:
+        <SYMBOL>/overview.json          OVERVIEW response
+        <SYMBOL>/<statement>.json       statement response (annualReports/quarterlyReports)
+        <SYMBOL>/<statement>.jsonl      one report per line
+        <SYMBOL>/<statement>.csv        one report per row
+        <SYMBOL>/quote.json             GLOBAL_QUOTE response
+        fx/<CURRENCY>.json              FX_MONTHLY response
+        listing_status.csv              LISTING_STATUS listing for symbol search
+    JSON Lines and CSV reports carry a "period" field ("annual" or "quarterly")
+    or the annual_report/quarter_report flags.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _document(self, path: Path) -> dict | None:
+        try:
+            return json.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def symbols(self) -> list[str]:
+        return sorted(
+            path.name
+            for path in self.root.iterdir()
+            if path.is_dir() and path.name != "fx"
+        )
+
+    def overview(self, symbol: str) -> dict | None:
+        return self._document(self.root / symbol / "overview.json")
+
+    def quote(self, symbol: str) -> dict | None:
+        return self._document(self.root / symbol / "quote.json")
+
+    def fx_history(self, currency: str) -> dict[str, float] | None:
+        data = self._document(self.root / "fx" / f"{currency}.json")
+        return parse_fx_monthly(data) if data else None
+
+    def statement(
+        self, section: str, symbol: str
+    ) -> tuple[list[dict], list[dict]] | None:
+        """Raw annual and quarterly reports of a statement."""
+        for suffix in STATEMENT_SUFFIXES:
+            path = self.root / symbol / f"{section}{suffix}"
+            if not path.exists():
+                continue
+            if suffix == ".json":
+                data = self._document(path)
+                return data.get("annualReports", []), data.get("quarterlyReports", [])
+
+            with _mapped_lines(path) as lines:
+                if suffix == ".jsonl":
+                    records = [json.loads(line) for line in lines if line.strip()]
+                else:
+                    records = list(
+                        csv.DictReader(line.decode("utf-8") for line in lines)
+                    )
+            return (
+                [record for record in records if not _is_quarterly(record)],
+                [record for record in records if _is_quarterly(record)],
+            )
+        return None
+
+    def listings(self) -> list[dict]:
+        path = self.root / "listing_status.csv"
+        if path.exists():
+            with _mapped_lines(path) as lines:
+                return parse_listing_status(line.decode("utf-8") for line in lines)
+        return [
+            {
+                "1. symbol": symbol,
+                "2. name": (self.overview(symbol) or {}).get("Name", ""),
+            }
+            for symbol in self.symbols()
+        ]
+
+
+class _SnapshotReader:
+    """
+    A columnar cache snapshot (.avcs), e.g. a compacted copy of the cache. Its
+    statement blocks are decoded straight from the memory-mapped file.
+    """
+
+    def __init__(self, path: Path):
+        self.snapshot = ColumnarSnapshot(path)
+        self.documents = self.snapshot.read_documents()
+
+    def _entry(self, section: str, key: str) -> Any:
+        return (self.documents.get(section) or {}).get(key)
+
+    def symbols(self) -> list[str]:
+        return sorted(
+            set(self.documents.get("overview") or {}).union(
+                *(self.snapshot.symbols(section) for section in STATEMENT_MODELS)
+            )
+        )
+
+    def overview(self, symbol: str) -> dict | None:
+        return self._entry("overview", symbol)
+
+    def quote(self, symbol: str) -> dict | None:
+        return None
+
+    def fx_history(self, currency: str) -> dict[str, float] | None:
+        return self._entry("fx_history", currency)
+
+    def statement(
+        self, section: str, symbol: str
+    ) -> tuple[list[dict], list[dict]] | None:
+        records = self.snapshot.read_block(section, symbol)
+        raw_quarters = self.snapshot.read_block(raw_quarters_section(section), symbol)
+        if raw_quarters is not None:
+            raw_quarters = [decode_raw_record(record) for record in raw_quarters]
+        else:
+            raw_quarters = (self._entry("quarterly_payload", symbol) or {}).get(section)
+        if records is None and raw_quarters is None:
+            return None
+        records = records or []
+        if raw_quarters is None:
+            raw_quarters = [record for record in records if _is_quarterly(record)]
+        return [record for record in records if not _is_quarterly(record)], raw_quarters
+
+    def listings(self) -> list[dict]:
+        listings = list((self.documents.get("symbol_search") or {}).values())
+        return listings or [
+            {
+                "1. symbol": symbol,
+                "2. name": (self.overview(symbol) or {}).get("name", ""),
+            }
+            for symbol in self.symbols()
+        ]
+
+
+class LocalFileProvider(FundamentalDataProvider):
+    """
+    Fundamental data read from disk without any API call, for backtests and
+    bulk research runs. The path is either a directory of per-symbol files or a
+    columnar snapshot file (.avcs). Only the reports of the selected periods are
+    validated into models.
+    """
+
+    name = "local files"
+
+    def __init__(self, path: str | Path = LOCAL_DATA_PATH):
+        self.path = Path(path)
+        self._reader: _DirectoryReader | _SnapshotReader | None = None
+        self._symbol_index: SymbolIndex | None = None
+        self._listings: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def reader(self) -> _DirectoryReader | _SnapshotReader:
+        """The reader of the data files, opened on first use."""
+        with self._lock:
+            if self._reader is None:
+                self._reader = (
+                    _SnapshotReader(self.path)
+                    if self.path.is_file()
+                    else _DirectoryReader(self.path)
+                )
+            return self._reader
+
+    def _result(self, data) -> DataResult:
+        return DataResult(data, from_cache=False, source="local")
+
+    def symbols(self) -> list[str]:
+        """All symbols with data on disk."""
+        return self.reader.symbols()
+
+    def get_ticker_symbol(self, stock_name: str) -> DataResult:
+        reader = self.reader
+        with self._lock:
+            if self._symbol_index is None:
+                self._symbol_index = SymbolIndex()
+                for listing in reader.listings():
+                    symbol = listing.get("1. symbol")
+                    if symbol:
+                        self._listings[symbol] = listing
+                        self._symbol_index.add(symbol, listing.get("2. name", ""))
+            matches = self._symbol_index.search(stock_name)
+        return self._result([self._listings[symbol] for symbol in matches])
+
+    def get_ticker_overview(self, symbol: str) -> DataResult:
+        try:
+            record = self.reader.overview(symbol)
+            return self._result(StockMetaData(**record) if record else None)
+        except Exception as e:
+            print(f"Error reading overview for {symbol}: {e}")
+            return self._result(None)
+
+    def _get_statement(
+        self, section: str, symbol: str, periods: PeriodSelection
+    ) -> DataResult:
+        try:
+            statement = self.reader.statement(section, symbol)
+            if statement is None:
+                return self._result([])
+            annual, quarterly = statement
+            return self._result(
+                _build_reports(annual, quarterly, STATEMENT_MODELS[section], periods)
+            )
+        except Exception as e:
+            print(f"Error reading {section.replace('_', ' ')} for {symbol}: {e}")
+            return self._result([])
+
+    def get_balance_sheet(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        return self._get_statement("balance_sheet", symbol, periods)
+
+    def get_income_statement(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        return self._get_statement("income_statement", symbol, periods)
+
+    def get_cash_flow(
+        self, symbol: str, periods: PeriodSelection = ALL_PERIODS
+    ) -> DataResult:
+        return self._get_statement("cash_flow", symbol, periods)
+
+    def get_stock_quote(self, symbol: str) -> dict:
+        return self.reader.quote(symbol) or {}
+
+    def get_currency_ratio(self, currency: str) -> float | None:
+        """The most recent rate of the currency's FX history."""
+        if currency == USD:
+            return 1.0
+        history = self.reader.fx_history(currency)
+        return history[max(history)] if history else None
+
+    def get_fx_rates(self, currencies: set[str]) -> FxRates:
+        fx_rates = FxRates()
+        for currency in sorted(currencies - {USD}):
+            history = self.reader.fx_history(currency)
+            if history:
+                fx_rates.add(currency, history)
+        return fx_rates
+
+
+PROVIDERS: dict[str, Callable[[], FundamentalDataProvider]] = {
+    "alphavantage": AlphaVantageProvider,
+    "local": LocalFileProvider,
+}
+
+
+def create_provider(name: str) -> FundamentalDataProvider:
+    """Create a data provider by name."""
+    if name not in PROVIDERS:
+        raise ValueError(
+            f"Unknown data provider '{name}'. Choose one of: {', '.join(PROVIDERS)}"
+        )
+    return PROVIDERS[name]()
+
+
+_provider = create_provider(FUNDAMENTAL_DATA_PROVIDER)
+
+
+def get_provider() -> FundamentalDataProvider:
+    """Get the configured fundamental data provider."""
+    return _provider
@@ -0,0 +1,210 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from config.env import (
+    ALPHAVANTAGE_QUOTA_TIMEZONE,
+    ALPHAVANTAGE_RATE_LIMIT_STATE_FILE,
+    ALPHAVANTAGE_REQUESTS_PER_DAY,
+    ALPHAVANTAGE_REQUESTS_PER_MINUTE,
+)
+from .file_lock import FileLock
+
+MINUTE = 60.0
+
+
+class SlidingWindow:
+    """
+    Log of the send times of the last `capacity` requests, allowing at most
+    `capacity` requests in any `period` seconds.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.sent: list[float] = []
+
+    def next_slot(self, at: float) -> float:
+        """Earliest time from `at` on that a request may be sent."""
+        if len(self.sent) < self.capacity:
+            return at
+        return max(at, self.sent[-self.capacity] + self.period)
+
+    def reserve(self, at: float):
+        """Record a request sent at `at`."""
+        bisect.insort(self.sent, at)
+        # Older requests no longer limit any slot
+        del self.sent[: -self.capacity]
+
+    def to_dict(self) -> dict:
+        return {"sent": self.sent}
+
+    def load(self, state: dict):
+        self.sent = sorted(state["sent"])[-self.capacity :]
+
+
+class DailyQuota:
+    """
+    Fixed window counting the requests of a calendar day in the provider's
+    time zone, reset at its midnight.
+    """
+
+    def __init__(self, capacity: int, timezone: str = ALPHAVANTAGE_QUOTA_TIMEZONE):
+        self.capacity = capacity
+        self.timezone = ZoneInfo(timezone)
+        self.day: date | None = None
+        self.count = 0
+
+    def _day_of(self, at: float) -> date:
+        return datetime.fromtimestamp(at, self.timezone).date()
+
+    def _start_of(self, day: date) -> float:
+        return datetime.combine(
+            day, datetime.min.time(), tzinfo=self.timezone
+        ).timestamp()
+
+    def next_slot(self, at: float) -> float:
+        """Earliest time from `at` on that a request may be sent."""
+        day = self._day_of(at)
+        if self.day is not None and self.day > day:
+            # Requests are already reserved in a later day
+            return self.next_slot(self._start_of(self.day))
+        if self.day == day and self.count >= self.capacity:
+            return self._start_of(day + timedelta(days=1))
+        return at
+
+    def reserve(self, at: float):
+        """Count a request sent at `at`."""
+        day = self._day_of(at)
+        if self.day != day:
+            self.day, self.count = day, 0
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        return {"day": self.day.isoformat() if self.day else None, "count": self.count}
+
+    def load(self, state: dict):
+        self.day = date.fromisoformat(state["day"]) if state["day"] else None
+        self.count = state["count"]
+
+
+class RateLimiter:
+    """
+    Per-minute sliding window and per-day quota shared by all threads of a
+    process. With a state file the limits are persisted, so restarts keep the
+    daily count, and shared between processes under a file lock.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = ALPHAVANTAGE_REQUESTS_PER_MINUTE,
+        requests_per_day: int = ALPHAVANTAGE_REQUESTS_PER_DAY,
+        state_file: str | Path | None = ALPHAVANTAGE_RATE_LIMIT_STATE_FILE,
+    ):
+        """
+        Args:
+            requests_per_minute: Requests allowed per minute, 0 disables the limit
+            requests_per_day: Requests allowed per day, 0 disables the limit
+            state_file: JSON file persisting the limits, None keeps them in memory
+        """
+        self.limits: dict[str, SlidingWindow | DailyQuota] = {}
+        if requests_per_minute:
+            self.limits["minute"] = SlidingWindow(requests_per_minute, MINUTE)
+        if requests_per_day:
+            self.limits["day"] = DailyQuota(requests_per_day)
+
+        self.state_file = Path(state_file) if state_file else None
+        self._file_lock = (
+            FileLock(self.state_file.with_suffix(".lock")) if self.state_file else None
+        )
+        self._lock = threading.Lock()
+        self.total_wait_seconds = 0.0
+
+    def _next_slot(self, now: float) -> float:
+        """Earliest time all limits allow the next request."""
+        slot = now
+        while True:
+            next_slot = max(
+                (limit.next_slot(slot) for limit in self.limits.values()),
+                default=slot,
+            )
+            if next_slot == slot:
+                return slot
+            slot = next_slot
+
+    def expected_wait(self) -> float:
+        """Seconds the next request would have to wait."""
+        with self._shared_state(write=False):
+            now = time.time()
+            return self._next_slot(now) - now
+
+    def acquire(self) -> float:
+        """
+        Wait until a request may be sent and return the seconds waited. Slots
+        are reserved ahead of time, which queues callers in arrival order.
+        """
+        with self._shared_state(write=True):
+            now = time.time()
+            slot = self._next_slot(now)
+            for limit in self.limits.values():
+                limit.reserve(slot)
+            wait = slot - now
+
+        if wait > 0:
+            print(f"Alpha Vantage rate limit reached, waiting {wait:.1f}s")
+            time.sleep(wait)
+            with self._lock:
+                self.total_wait_seconds += wait
+        return wait
+
+    @contextmanager
+    def _shared_state(self, write: bool):
+        """Hold the process lock and, with a state file, load and save the limits."""
+        with self._lock:
+            if self._file_lock is None:
+                yield
+                return
+
+            with self._file_lock.exclusive() if write else self._file_lock.shared():
+                self._load()
+                yield
+                if write:
+                    self._save()
+
+    def _load(self):
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Warning: Failed to read rate limit state {self.state_file}: {e}")
+            return
+        for name, limit in self.limits.items():
+            try:
+                limit.load(state[name])
+            except (KeyError, TypeError, ValueError):
+                # Not persisted yet or written in an older format
+                pass
+
+    def _save(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+        temp_file.write_text(
+            json.dumps({name: limit.to_dict() for name, limit in self.limits.items()}),
+            encoding="utf-8",
+        )
+        temp_file.replace(self.state_file)
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide Alpha Vantage rate limiter."""
+    return _rate_limiter
@@ -0,0 +1,121 @@
+from typing import Callable, Iterable
+
+from . import alphavantage_adapter
+from .alphavantage_adapter import AlphaVantageAPI, ThrottledResult
+from .cache_policy import STATEMENT_TYPES
+from .model import RefreshPlan, StockMetaData
+
+# Symbols refreshed between two cache flushes of a universe refresh
+DEFAULT_BATCH_SIZE = 50
+
+
+def plan_refresh(
+    symbol: str, overview: StockMetaData | None, overview_fetched: bool = False
+) -> RefreshPlan:
+    """
+    Decide which statements of a symbol to re-fetch: those not cached and those
+    whose latest cached fiscal date is older than the overview's LatestQuarter,
+    unless they were already fetched against that LatestQuarter. Otherwise,
+    statements are only re-fetched once their TTL expired.
+    """
+    cache = alphavantage_adapter.cache
+    latest_quarter = overview.latest_quarter if overview else None
+    cached_periods = {
+        data_type: cache.get_latest_fiscal_date(data_type, symbol)
+        for data_type in STATEMENT_TYPES
+    }
+
+    def needs_fetch(data_type: str, cached_period: str | None) -> bool:
+        if cached_period is None:
+            return True
+        metadata = cache.get_entry_metadata(data_type, symbol)
+        if latest_quarter and latest_quarter > cached_period:
+            return not cache.policy.is_checked(
+                metadata, latest_quarter
+            ) or cache.policy.is_expired(metadata)
+        return not latest_quarter and cache.policy.is_expired(metadata)
+
+    statements_to_fetch = [
+        data_type
+        for data_type, cached_period in cached_periods.items()
+        if needs_fetch(data_type, cached_period)
+    ]
+    return RefreshPlan(
+        symbol=symbol,
+        latest_quarter=latest_quarter,
+        cached_periods=cached_periods,
+        overview_fetched=overview_fetched,
+        statements_to_fetch=statements_to_fetch,
+    )
+
+
+def refresh_ticker(symbol: str) -> RefreshPlan:
+    """
+    Refresh a symbol for the cost of its overview plus the statements that have a
+    new period. The overview is only fetched when the cached one is stale, and
+    statements covering the LatestQuarter have their TTL restarted. Returns the
+    executed plan.
+    """
+    cache = alphavantage_adapter.cache
+    overview = cache.get_overview(symbol)
+    overview_fetched = overview is None or cache.is_stale("overview", symbol)
+    if overview_fetched:
+        result = AlphaVantageAPI.fetch_ticker_data(symbol, ["overview"])["overview"]
+        if isinstance(result, ThrottledResult):
+            # The statements would be throttled as well
+            print(f"Skipping refresh of {symbol}: {result.message}")
+            return RefreshPlan(symbol=symbol, overview_fetched=True)
+        overview = result.data or overview
+
+    plan = plan_refresh(symbol, overview, overview_fetched)
+
+    # Statements only count as confirmed current when LatestQuarter is known and
+    # covered; otherwise their TTL keeps running so they expire as usual
+    if plan.latest_quarter:
+        for data_type, cached_period in plan.cached_periods.items():
+            if (
+                data_type not in plan.statements_to_fetch
+                and cached_period
+                and cached_period >= plan.latest_quarter
+            ):
+                cache.mark_revalidated(data_type, symbol)
+
+    AlphaVantageAPI.fetch_ticker_data(symbol, plan.statements_to_fetch)
+    return plan
+
+
+def refresh_universe(
+    symbols: Iterable[str],
+    on_plan: Callable[[RefreshPlan], None] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[RefreshPlan]:
+    """
+    Refresh every symbol with refresh_ticker, flushing buffered cache writes once
+    per batch of symbols. Returns the executed plans.
+
+    Args:
+        symbols: Ticker symbols to refresh
+        on_plan: Called with the plan of each symbol once it is refreshed
+        batch_size: Symbols refreshed between two cache flushes
+    """
+    cache = alphavantage_adapter.cache
+    plans = []
+    # The cache keeps its write mode, so writes of other callers are not held
+    # back for the hours a refresh at the API quota takes
+    for symbol in symbols:
+        try:
+            plan = refresh_ticker(symbol)
+        except Exception as e:
+            print(f"Error refreshing {symbol}: {e}")
+            continue
+
+        plans.append(plan)
+        if on_plan:
+            on_plan(plan)
+        if len(plans) % batch_size == 0:
+            cache.flush()
+    cache.flush()
+
+    api_calls = sum(plan.api_calls for plan in plans)
+    print(f"Refreshed {len(plans)} symbols with {api_calls} API calls")
+    return plans
@@ -0,0 +1,128 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from config.env import ALPHAVANTAGE_ARCHIVE_DIR
+from .file_lock import FileLock
+from .model import ArchivedResponse
+
+# Request parameters naming the subject of a response, in order of preference
+SUBJECT_PARAMS = ("symbol", "from_symbol", "from_currency", "keywords")
+
+
+def _subject(params: dict[str, str]) -> str:
+    for name in SUBJECT_PARAMS:
+        if params.get(name):
+            return params[name]
+    return ""
+
+
+class ResponseArchive:
+    """
+    Gzip compressed, content-addressed store of raw API responses. Each body is
+    written once under the SHA-256 of its canonical JSON; a JSON Lines index
+    records which endpoint, symbol and fetch time it was returned for.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.index_path = self.root / "index.jsonl"
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(self.root / "index.lock")
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest[2:]}.json.gz"
+
+    def store(
+        self,
+        function: str,
+        params: dict[str, str],
+        data: dict,
+        fetched_at: str | None = None,
+    ) -> ArchivedResponse:
+        """Archive a response body; identical bodies share one compressed object."""
+        body = json.dumps(
+            data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        entry = ArchivedResponse(
+            function=function,
+            symbol=_subject(params),
+            params=params,
+            fetched_at=fetched_at or datetime.now().isoformat(),
+            digest=digest,
+            size_bytes=len(body),
+        )
+
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_bytes(gzip.compress(body))
+            temp_path.replace(path)
+
+        line = entry.model_dump_json().encode("utf-8") + b"\n"
+        with self._lock, self._file_lock.exclusive():
+            with open(self.index_path, "ab") as f:
+                f.write(line)
+        return entry
+
+    def load(self, digest: str) -> dict:
+        """Read an archived response body."""
+        return json.loads(gzip.decompress(self._object_path(digest).read_bytes()))
+
+    def entries(
+        self, function: str | None = None, symbol: str | None = None
+    ) -> list[ArchivedResponse]:
+        """Index entries in fetch order, optionally of one endpoint and symbol."""
+        try:
+            with self._lock, self._file_lock.shared():
+                lines = self.index_path.read_bytes().splitlines(keepends=True)
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for line in lines:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("missing line end")
+                entry = ArchivedResponse.model_validate_json(line)
+            except ValueError:
+                # An append interrupted by a crash
+                print(f"Warning: Ignoring incomplete record in {self.index_path}")
+                continue
+            if (function is None or entry.function == function) and (
+                symbol is None or entry.symbol == symbol
+            ):
+                entries.append(entry)
+        return sorted(entries, key=lambda entry: entry.fetched_at)
+
+    def latest(self) -> list[ArchivedResponse]:
+        """The most recent entry of every distinct request."""
+        latest = {}
+        for entry in self.entries():
+            latest[(entry.function, tuple(sorted(entry.params.items())))] = entry
+        return list(latest.values())
+
+    def stats(self) -> dict[str, int]:
+        """Number of indexed responses, distinct bodies and their compressed size."""
+        objects = list((self.root / "objects").glob("*/*.json.gz"))
+        return {
+            "responses": len(self.entries()),
+            "objects": len(objects),
+            "compressed_bytes": sum(path.stat().st_size for path in objects),
+        }
+
+
+_archive = (
+    ResponseArchive(ALPHAVANTAGE_ARCHIVE_DIR) if ALPHAVANTAGE_ARCHIVE_DIR else None
+)
+
+
+def get_response_archive() -> ResponseArchive | None:
+    """Get the shared response archive, None when archiving is disabled."""
+    return _archive
@@ -0,0 +1,868 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from config.env import CACHE_JOURNAL_COMPACT_RECORDS
+from .columnar import (
+    ColumnarSnapshot,
+    decode_raw_record,
+    encode_raw_record,
+    extend_schema,
+    raw_quarters_section,
+    write_snapshot,
+)
+from .file_lock import FileLock
+from .journal import Journal
+
+# Sections holding lists of reports keyed by fiscal_date_ending and period type
+REPORT_SECTIONS = (
+    "balance_sheet",
+    "cash_flow",
+    "income_statement",
+    "calculated_metrics",
+)
+
+
+def report_key(report: dict) -> tuple[str, bool]:
+    """
+    Identity of a stored report. The annual report and the Q4 report share the
+    fiscal year end, so the period type is part of the key.
+    """
+    return report["fiscal_date_ending"], bool(report.get("quarter_report"))
+
+
+def _newest_first(reports) -> list[dict]:
+    """Sort reports newest period first, the annual report before its Q4 quarter."""
+    return sorted(
+        reports,
+        key=lambda report: (report["fiscal_date_ending"], not report_key(report)[1]),
+        reverse=True,
+    )
+
+
+# Sections holding a single value per key; metadata maps symbol -> data_type -> entry,
+# symbol_query maps a normalized search query -> its result list,
+# fx_history maps currency -> month end date -> rate to USD and
+# quarterly_payload maps symbol -> statement -> raw quarterly reports of the API
+ENTRY_SECTIONS = (
+    "overview",
+    "symbol_search",
+    "symbol_query",
+    "exchange_rate",
+    "fx_history",
+    "quarterly_payload",
+    "metadata",
+)
+
+SECTIONS = ENTRY_SECTIONS[:1] + REPORT_SECTIONS + ENTRY_SECTIONS[1:]
+
+# Sections removed together when a symbol is cleared
+SYMBOL_SECTIONS = (
+    ("overview",)
+    + REPORT_SECTIONS
+    + (
+        "quarterly_payload",
+        "metadata",
+    )
+)
+
+# Statement sections stored column by column by the columnar backend
+COLUMNAR_SECTIONS = ("balance_sheet", "cash_flow", "income_statement")
+# Sections the columnar backend reads from its snapshot on access; the raw
+# quarterly reports are stored column by column, in a section per statement
+SNAPSHOT_SECTIONS = COLUMNAR_SECTIONS + ("quarterly_payload",)
+
+# Columns of the SQLite report tables
+REPORT_COLUMNS = (
+    "symbol TEXT NOT NULL, fiscal_date_ending TEXT NOT NULL, "
+    "quarter_report INTEGER NOT NULL DEFAULT 0, "
+    "payload TEXT NOT NULL, updated_at TEXT NOT NULL, "
+    "PRIMARY KEY (symbol, fiscal_date_ending, quarter_report)"
+)
+
+# How long SQLite waits for another process holding the write lock
+SQLITE_BUSY_TIMEOUT_SECONDS = 30
+
+# Sections only removed when the whole cache is cleared
+SEARCH_SECTIONS = ("symbol_search", "symbol_query")
+
+
+class CacheBackend(ABC):
+    """Storage engine behind PersistentCache. Works on raw JSON-serializable records."""
+
+    # Whether all records stay in memory, out of reach of the memory budget
+    holds_records_in_memory = False
+
+    @abstractmethod
+    def load_section(self, section: str) -> dict[str, Any]:
+        """Return all raw records of a section keyed by symbol (or currency)."""
+
+    @abstractmethod
+    def get(self, section: str, key: str) -> Any | None:
+        """Return the raw record(s) of a single key, or None if not stored."""
+
+    @abstractmethod
+    def keys(self, section: str) -> list[str]:
+        """Return the keys stored in a section."""
+
+    @abstractmethod
+    def count(self, section: str) -> int:
+        """Return the number of records (reports for report sections) in a section."""
+
+    @abstractmethod
+    def upsert_entry(self, section: str, key: str, value: Any):
+        """Insert or replace a single entry of an entry section."""
+
+    @abstractmethod
+    def upsert_reports(self, section: str, symbol: str, reports: list[dict]):
+        """Insert or replace reports of a symbol, keyed by fiscal_date_ending and period type."""
+
+    @abstractmethod
+    def delete(self, symbol: str | None = None):
+        """Delete all data of a symbol, or everything if no symbol is given."""
+
+    @abstractmethod
+    def describe(self) -> dict[str, Any]:
+        """Return storage location and size information."""
+
+    @contextmanager
+    def batch(self):
+        """Group several writes so they are persisted together."""
+        yield
+
+    def generation(self) -> int:
+        """Counter that changes when another process modified the stored data."""
+        return 0
+
+    def compact(self):
+        """Fold incremental changes into the main storage file."""
+
+    def close(self):
+        """Release resources held by the backend."""
+
+
+class JsonFileBackend(CacheBackend):
+    """
+    JSON snapshot plus an append-only journal with one record per change. The
+    journal is replayed on load and folded into a new snapshot once it grows past
+    compact_after_records. Writers hold an exclusive file lock and apply their
+    changes on top of what other processes wrote; readers re-read on change.
+    All records are held in memory, so the memory budget of PersistentCache
+    only bounds the models parsed from them.
+    """
+
+    holds_records_in_memory = True
+
+    def __init__(
+        self,
+        cache_file_path: str | Path,
+        compact_after_records: int = CACHE_JOURNAL_COMPACT_RECORDS,
+    ):
+        self.cache_file_path = Path(cache_file_path)
+        self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file_lock = FileLock(
+            self.cache_file_path.with_name(self.cache_file_path.name + ".lock")
+        )
+        self._journal = Journal(
+            self.cache_file_path.with_name(self.cache_file_path.name + ".journal")
+        )
+        self.compact_after_records = compact_after_records
+        self._data: dict[str, dict[str, Any]] = {section: {} for section in SECTIONS}
+        self.last_updated: str | None = None
+        # Held by batches and readers, so no thread reads while another one applies
+        # changes; lock order is self._lock before the file lock
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._pending_records: list[dict] = []
+        # Sequence number of the last change in memory and in the snapshot
+        self._sequence = 0
+        self._snapshot_sequence = 0
+        self._loaded = False
+        self._signature: tuple | None = None
+        self._generation = 0
+
+    def _file_signature(self) -> tuple[int, int, int] | None:
+        """Identify the snapshot version; every write replaces the file with a new one."""
+        try:
+            stat = self.cache_file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _ensure_loaded(self):
+        """Read snapshot and journal on first access and again after another process wrote."""
+        if self._batch_depth:
+            # Only the thread running the batch gets here, and it holds the
+            # exclusive lock, so nobody else can change the files
+            return
+        if self._loaded and self._current_signature() == self._signature:
+            return
+
+        with self._file_lock.shared():
+            if self._loaded:
+                self._generation += 1
+            if not self._loaded or self._file_signature() != self._signature[0]:
+                self._loaded = True
+                self._reset_data()
+                self._read_file()
+                self._sequence = self._snapshot_sequence
+                self._journal.rewind()
+            self._replay_journal()
+            self._signature = self._current_signature()
+
+    def _current_signature(self) -> tuple:
+        return self._file_signature(), self._journal.signature()
+
+    def _replay_journal(self):
+        """Apply journal records newer than the in-memory state."""
+        for record in self._journal.read_new():
+            if record["seq"] > self._sequence:
+                self._apply(record)
+                self._sequence = record["seq"]
+
+    def _reset_data(self):
+        """Forget all records before the snapshot is read again."""
+        self._data = {section: {} for section in SECTIONS}
+        self._snapshot_sequence = 0
+
+    def generation(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return self._generation
+
+    def _read_file(self):
+        """Read the JSON snapshot into memory as raw records."""
+        if not self.cache_file_path.exists():
+            print(
+                f"Cache file {self.cache_file_path} doesn't exist. Starting with empty cache."
+            )
+            return
+
+        try:
+            with open(self.cache_file_path, "r", encoding="utf-8") as f:
+                cache_data = json.load(f)
+        except Exception as e:
+            print(f"Warning: Failed to load cache from {self.cache_file_path}: {e}")
+            print("Starting with empty cache.")
+            return
+
+        # Validate cache file structure
+        if not isinstance(cache_data, dict) or "version" not in cache_data:
+            print("Warning: Invalid cache file format. Starting with empty cache.")
+            return
+
+        for section in SECTIONS:
+            if isinstance(cache_data.get(section), dict):
+                self._data[section] = cache_data[section]
+        self.last_updated = cache_data.get("last_updated")
+        self._snapshot_sequence = cache_data.get("journal_sequence", 0)
+        print(f"Loaded cache from {self.cache_file_path}")
+
+    @contextmanager
+    def batch(self):
+        with self._lock, self._file_lock.exclusive():
+            # Apply the changes on top of what other processes wrote before
+            self._ensure_loaded()
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._append_pending()
+                    if self._journal.records >= self.compact_after_records:
+                        self._compact()
+
+    def _record(self, record: dict):
+        """Apply a change in memory and journal it when the outermost batch ends."""
+        with self.batch():
+            self._sequence += 1
+            record["seq"] = self._sequence
+            self._apply(record)
+            self._pending_records.append(record)
+
+    def _append_pending(self):
+        if not self._pending_records:
+            return
+        records, self._pending_records = self._pending_records, []
+        try:
+            self._journal.append(records)
+        except Exception as e:
+            print(f"Warning: Failed to save cache to {self._journal.path}: {e}")
+            # The changes only exist in memory; read the files again on next
+            # access and let the caller keep the changes queued
+            self._loaded = False
+            raise
+        self._signature = self._current_signature()
+
+    def compact(self):
+        """Fold the journal into a new snapshot."""
+        with self._lock, self._file_lock.exclusive():
+            self._ensure_loaded()
+            self._compact()
+
+    def _compact(self):
+        try:
+            self._write_file()
+        except Exception as e:
+            print(f"Warning: Failed to save cache to {self.cache_file_path}: {e}")
+            return
+        # Only drop records the snapshot now contains
+        self._journal.truncate()
+        self._snapshot_sequence = self._sequence
+        self._signature = self._current_signature()
+
+    def _write_file(self):
+        """Write the whole in-memory state as a new snapshot."""
+        cache_data = {
+            **self._data,
+            "last_updated": datetime.now().isoformat(),
+            "journal_sequence": self._sequence,
+            "version": "1.0",
+        }
+
+        # Write to temporary file first, then rename for atomic operation
+        temp_file = self.cache_file_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(cache_data, f, indent=2, ensure_ascii=False)
+
+        # Atomic rename
+        temp_file.replace(self.cache_file_path)
+        self.last_updated = cache_data["last_updated"]
+
+    def _apply(self, record: dict):
+        """Apply a journal record to the in-memory state."""
+        if record["op"] == "entry":
+            self._apply_entry(record["section"], record["key"], record["value"])
+        elif record["op"] == "reports":
+            self._apply_reports(record["section"], record["symbol"], record["reports"])
+        elif record["op"] == "delete":
+            self._apply_delete(record["symbol"])
+
+    def _apply_entry(self, section: str, key: str, value: Any):
+        self._data[section][key] = value
+
+    def _apply_reports(self, section: str, symbol: str, reports: list[dict]):
+        merged = {
+            report_key(report): report
+            for report in (self._data[section].get(symbol) or []) + reports
+        }
+        self._data[section][symbol] = _newest_first(merged.values())
+
+    def _apply_delete(self, symbol: str | None):
+        if symbol:
+            for section in SYMBOL_SECTIONS:
+                self._data[section].pop(symbol, None)
+        else:
+            for section in SYMBOL_SECTIONS + SEARCH_SECTIONS:
+                self._data[section].clear()
+
+    def load_section(self, section: str) -> dict[str, Any]:
+        with self._lock:
+            self._ensure_loaded()
+            return dict(self._data[section])
+
+    def get(self, section: str, key: str) -> Any | None:
+        with self._lock:
+            self._ensure_loaded()
+            return self._data[section].get(key)
+
+    def keys(self, section: str) -> list[str]:
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._data[section])
+
+    def count(self, section: str) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            if section in REPORT_SECTIONS:
+                return sum(
+                    len(reports or []) for reports in self._data[section].values()
+                )
+            return len(self._data[section])
+
+    def upsert_entry(self, section: str, key: str, value: Any):
+        self._record({"op": "entry", "section": section, "key": key, "value": value})
+
+    def upsert_reports(self, section: str, symbol: str, reports: list[dict]):
+        self._record(
+            {"op": "reports", "section": section, "symbol": symbol, "reports": reports}
+        )
+
+    def delete(self, symbol: str | None = None):
+        self._record({"op": "delete", "symbol": symbol})
+
+    def describe(self) -> dict[str, Any]:
+        with self._lock:
+            self._ensure_loaded()
+        exists = self.cache_file_path.exists()
+        journal_exists = self._journal.path.exists()
+        return {
+            "backend": "json",
+            "cache_file": str(self.cache_file_path),
+            "file_exists": exists,
+            "file_size_bytes": (
+                (self.cache_file_path.stat().st_size if exists else 0)
+                + (self._journal.path.stat().st_size if journal_exists else 0)
+            ),
+            "last_updated": self.last_updated,
+            "journal_records": self._journal.records,
+        }
+
+
+class SqliteBackend(CacheBackend):
+    """SQLite storage with one table per data type and per-row upserts."""
+
+    def __init__(self, cache_file_path: str | Path):
+        self.cache_file_path = Path(cache_file_path)
+        self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self._connection = sqlite3.connect(
+            self.cache_file_path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=SQLITE_BUSY_TIMEOUT_SECONDS,
+        )
+        # WAL lets readers of other processes continue while one process writes
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one transaction; nested calls join the outer one."""
+        with self._lock:
+            if self._transaction_depth == 0:
+                # Take the write lock up front instead of upgrading a read lock later
+                self._connection.execute("BEGIN IMMEDIATE")
+            self._transaction_depth += 1
+            try:
+                yield self._connection
+            except Exception:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self._connection.execute("ROLLBACK")
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._connection.execute("COMMIT")
+
+    def batch(self):
+        return self._transaction()
+
+    def generation(self) -> int:
+        # data_version changes when other connections commit, not for our own writes
+        with self._lock:
+            return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def _create_tables(self):
+        """Create data type tables if they do not exist yet."""
+        statements = [
+            f"CREATE TABLE IF NOT EXISTS {section} "
+            "(symbol TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            for section in ENTRY_SECTIONS
+        ]
+        # The (symbol, fiscal_date_ending, quarter_report) primary key also indexes
+        # lookups by symbol
+        statements.extend(
+            f"CREATE TABLE IF NOT EXISTS {section} ({REPORT_COLUMNS})"
+            for section in REPORT_SECTIONS
+        )
+        with self._transaction() as connection:
+            for statement in statements:
+                connection.execute(statement)
+            for section in REPORT_SECTIONS:
+                self._migrate_report_key(connection, section)
+
+    def _migrate_report_key(self, connection: sqlite3.Connection, section: str):
+        """Rebuild a report table created before the period type was part of the key."""
+        columns = [
+            row[1] for row in connection.execute(f"PRAGMA table_info({section})")
+        ]
+        if "quarter_report" in columns:
+            return
+
+        rows = connection.execute(
+            f"SELECT symbol, fiscal_date_ending, payload, updated_at FROM {section}"
+        ).fetchall()
+        connection.execute(f"DROP TABLE {section}")
+        connection.execute(f"CREATE TABLE {section} ({REPORT_COLUMNS})")
+        connection.executemany(
+            f"INSERT INTO {section} "
+            "(symbol, fiscal_date_ending, quarter_report, payload, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    symbol,
+                    date,
+                    int(bool(json.loads(payload).get("quarter_report"))),
+                    payload,
+                    updated_at,
+                )
+                for symbol, date, payload, updated_at in rows
+            ],
+        )
+
+    def load_section(self, section: str) -> dict[str, Any]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT symbol, payload FROM {section} "
+                "ORDER BY symbol, fiscal_date_ending DESC, quarter_report"
+                if section in REPORT_SECTIONS
+                else f"SELECT symbol, payload FROM {section} ORDER BY rowid"
+            ).fetchall()
+
+        if section not in REPORT_SECTIONS:
+            return {symbol: json.loads(payload) for symbol, payload in rows}
+
+        records: dict[str, list[dict]] = {}
+        for symbol, payload in rows:
+            records.setdefault(symbol, []).append(json.loads(payload))
+        return records
+
+    def get(self, section: str, key: str) -> Any | None:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT payload FROM {section} WHERE symbol = ? "
+                "ORDER BY fiscal_date_ending DESC, quarter_report"
+                if section in REPORT_SECTIONS
+                else f"SELECT payload FROM {section} WHERE symbol = ?",
+                (key,),
+            ).fetchall()
+
+        if not rows:
+            return None
+        if section not in REPORT_SECTIONS:
+            return json.loads(rows[0][0])
+        return [json.loads(payload) for (payload,) in rows]
+
+    def keys(self, section: str) -> list[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT DISTINCT symbol FROM {section}"
+            ).fetchall()
+        return [symbol for (symbol,) in rows]
+
+    def count(self, section: str) -> int:
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM {section}"
+            ).fetchone()[0]
+
+    def upsert_entry(self, section: str, key: str, value: Any):
+        with self._transaction() as connection:
+            connection.execute(
+                f"INSERT INTO {section} (symbol, payload, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(symbol) DO UPDATE SET "
+                "payload = excluded.payload, updated_at = excluded.updated_at",
+                (
+                    key,
+                    json.dumps(value, ensure_ascii=False),
+                    datetime.now().isoformat(),
+                ),
+            )
+
+    def upsert_reports(self, section: str, symbol: str, reports: list[dict]):
+        if not reports:
+            return
+        updated_at = datetime.now().isoformat()
+        rows = [
+            (
+                symbol,
+                *report_key(report),
+                json.dumps(report, ensure_ascii=False),
+                updated_at,
+            )
+            for report in reports
+        ]
+        with self._transaction() as connection:
+            connection.executemany(
+                f"INSERT INTO {section} "
+                "(symbol, fiscal_date_ending, quarter_report, payload, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(symbol, fiscal_date_ending, quarter_report) DO UPDATE SET "
+                "payload = excluded.payload, updated_at = excluded.updated_at",
+                rows,
+            )
+
+    def delete(self, symbol: str | None = None):
+        with self._transaction() as connection:
+            for section in SYMBOL_SECTIONS:
+                if symbol:
+                    connection.execute(
+                        f"DELETE FROM {section} WHERE symbol = ?", (symbol,)
+                    )
+                else:
+                    connection.execute(f"DELETE FROM {section}")
+            if not symbol:
+                for section in SEARCH_SECTIONS:
+                    connection.execute(f"DELETE FROM {section}")
+
+    def describe(self) -> dict[str, Any]:
+        exists = self.cache_file_path.exists()
+        return {
+            "backend": "sqlite",
+            "cache_file": str(self.cache_file_path),
+            "file_exists": exists,
+            "file_size_bytes": self.cache_file_path.stat().st_size if exists else 0,
+            "last_updated": None,
+        }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class ColumnarBackend(JsonFileBackend):
+    """
+    Statements and their raw quarterly reports in a memory-mapped columnar
+    snapshot, decoded per symbol on access. The other sections are kept as a
+    compact JSON block inside the same file.
+    """
+
+    holds_records_in_memory = False
+
+    def __init__(
+        self,
+        cache_file_path: str | Path,
+        compact_after_records: int = CACHE_JOURNAL_COMPACT_RECORDS,
+    ):
+        super().__init__(cache_file_path, compact_after_records)
+        self._snapshot: ColumnarSnapshot | None = None
+        # Symbols changed or deleted since the snapshot was written; changed
+        # records live in self._data until the next compaction
+        self._changed: dict[str, set[str]] = {
+            section: set() for section in SNAPSHOT_SECTIONS
+        }
+
+    def _read_file(self):
+        """Map the snapshot and load its JSON documents block."""
+        if not self.cache_file_path.exists():
+            print(
+                f"Cache file {self.cache_file_path} doesn't exist. Starting with empty cache."
+            )
+            return
+
+        try:
+            self._snapshot = ColumnarSnapshot(self.cache_file_path)
+            documents = self._snapshot.read_documents()
+        except Exception as e:
+            print(f"Warning: Failed to load cache from {self.cache_file_path}: {e}")
+            print("Starting with empty cache.")
+            self._close_snapshot()
+            return
+
+        for section in SECTIONS:
+            if section not in COLUMNAR_SECTIONS and isinstance(
+                documents.get(section), dict
+            ):
+                self._data[section] = documents[section]
+        self.last_updated = self._snapshot.last_updated
+        self._snapshot_sequence = self._snapshot.journal_sequence
+        print(f"Loaded cache from {self.cache_file_path}")
+
+    def _write_file(self):
+        """Write a new snapshot, copying unchanged statement blocks as raw bytes."""
+        sections = {}
+        for section in COLUMNAR_SECTIONS:
+            sections[section] = {
+                symbol: None for symbol in self._snapshot_keys(section)
+            }
+            sections[section].update(self._data[section])
+        raw_quarters, quarterly_documents = self._raw_quarter_sections()
+        sections.update(raw_quarters)
+        documents = {
+            section: self._data[section]
+            for section in SECTIONS
+            if section not in SNAPSHOT_SECTIONS
+        }
+        documents["quarterly_payload"] = quarterly_documents
+        last_updated = datetime.now().isoformat()
+        write_snapshot(
+            self.cache_file_path,
+            sections,
+            documents,
+            self._snapshot,
+            last_updated,
+            self._sequence,
+        )
+        self.last_updated = last_updated
+
+        # Changed reports are now part of the snapshot
+        self._close_snapshot()
+        self._snapshot = ColumnarSnapshot(self.cache_file_path)
+        for section in COLUMNAR_SECTIONS:
+            self._data[section].clear()
+        self._data["quarterly_payload"] = quarterly_documents
+        for changed in self._changed.values():
+            changed.clear()
+
+    def _raw_quarter_sections(
+        self,
+    ) -> tuple[dict[str, dict[str, list[dict] | None]], dict[str, Any]]:
+        """
+        Snapshot sections of the raw quarterly reports per statement, and the
+        entries whose values do not fit their columns, kept as JSON documents.
+        """
+        schemas = {
+            statement: self._snapshot.schemas.get(raw_quarters_section(statement), [])
+            if self._snapshot
+            else []
+            for statement in COLUMNAR_SECTIONS
+        }
+        sections: dict[str, dict[str, list[dict] | None]] = {
+            raw_quarters_section(statement): {} for statement in COLUMNAR_SECTIONS
+        }
+        for symbol in self._snapshot_keys("quarterly_payload"):
+            for statement in COLUMNAR_SECTIONS:
+                if self._snapshot.has(raw_quarters_section(statement), symbol):
+                    sections[raw_quarters_section(statement)][symbol] = None
+
+        documents = {}
+        for symbol, entry in self._data["quarterly_payload"].items():
+            try:
+                encoded = {
+                    statement: [encode_raw_record(record) for record in records]
+                    for statement, records in entry.items()
+                }
+                extended = dict(schemas)
+                for statement, records in encoded.items():
+                    extended[statement] = extend_schema(extended[statement], records)
+            except (KeyError, TypeError, ValueError):
+                documents[symbol] = entry
+                continue
+            schemas = extended
+            for statement, records in encoded.items():
+                sections[raw_quarters_section(statement)][symbol] = records
+        return sections, documents
+
+    def _read_raw_quarters(self, symbol: str) -> dict[str, list[dict]] | None:
+        entry = {
+            statement: [
+                decode_raw_record(record)
+                for record in self._snapshot.read_block(
+                    raw_quarters_section(statement), symbol
+                )
+            ]
+            for statement in COLUMNAR_SECTIONS
+            if self._snapshot.has(raw_quarters_section(statement), symbol)
+        }
+        return entry or None
+
+    def _snapshot_keys(self, section: str) -> list[str]:
+        """Symbols of the snapshot that were not changed or deleted since."""
+        if self._snapshot is None:
+            return []
+        if section == "quarterly_payload":
+            symbols = dict.fromkeys(
+                symbol
+                for statement in COLUMNAR_SECTIONS
+                for symbol in self._snapshot.symbols(raw_quarters_section(statement))
+            )
+        else:
+            symbols = self._snapshot.symbols(section)
+        return [symbol for symbol in symbols if symbol not in self._changed[section]]
+
+    def _reset_data(self):
+        super()._reset_data()
+        self._close_snapshot()
+        for changed in self._changed.values():
+            changed.clear()
+
+    def _close_snapshot(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def load_section(self, section: str) -> dict[str, Any]:
+        if section not in SNAPSHOT_SECTIONS:
+            return super().load_section(section)
+        with self._lock:
+            return {symbol: self.get(section, symbol) for symbol in self.keys(section)}
+
+    def get(self, section: str, key: str) -> Any | None:
+        if section not in SNAPSHOT_SECTIONS:
+            return super().get(section, key)
+
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._data[section]:
+                return self._data[section][key]
+            if key in self._changed[section] or self._snapshot is None:
+                return None
+            # A compaction in another thread would unmap the snapshot
+            if section == "quarterly_payload":
+                return self._read_raw_quarters(key)
+            return self._snapshot.read_block(section, key)
+
+    def keys(self, section: str) -> list[str]:
+        if section not in SNAPSHOT_SECTIONS:
+            return super().keys(section)
+
+        with self._lock:
+            self._ensure_loaded()
+            return self._snapshot_keys(section) + list(self._data[section])
+
+    def count(self, section: str) -> int:
+        if section == "quarterly_payload":
+            return len(self.keys(section))
+        if section not in COLUMNAR_SECTIONS:
+            return super().count(section)
+
+        with self._lock:
+            self._ensure_loaded()
+            return sum(
+                self._snapshot.rows(section, symbol)
+                for symbol in self._snapshot_keys(section)
+            ) + sum(len(reports) for reports in self._data[section].values())
+
+    def _apply_entry(self, section: str, key: str, value: Any):
+        super()._apply_entry(section, key, value)
+        if section == "quarterly_payload":
+            self._changed[section].add(key)
+
+    def _apply_reports(self, section: str, symbol: str, reports: list[dict]):
+        if section not in COLUMNAR_SECTIONS:
+            return super()._apply_reports(section, symbol, reports)
+
+        existing = self._data[section].get(symbol)
+        if existing is None and symbol not in self._changed[section] and self._snapshot:
+            existing = self._snapshot.read_block(section, symbol)
+        merged = {report_key(report): report for report in (existing or []) + reports}
+        self._data[section][symbol] = _newest_first(merged.values())
+        self._changed[section].add(symbol)
+
+    def _apply_delete(self, symbol: str | None):
+        for section in SNAPSHOT_SECTIONS:
+            if symbol:
+                self._changed[section].add(symbol)
+            else:
+                self._changed[section].update(self._snapshot_keys(section))
+        super()._apply_delete(symbol)
+
+    def describe(self) -> dict[str, Any]:
+        return {**super().describe(), "backend": "columnar"}
+
+    def close(self):
+        with self._lock:
+            self._close_snapshot()
+            self._loaded = False
+
+
+def create_backend(backend: str, cache_file_path: str | Path) -> CacheBackend:
+    """Create a storage backend by name ("json", "sqlite" or "columnar")."""
+    backends = {
+        "json": JsonFileBackend,
+        "sqlite": SqliteBackend,
+        "columnar": ColumnarBackend,
+    }
+    if backend not in backends:
+        raise ValueError(
+            f"Unknown cache backend '{backend}'. Choose one of: {', '.join(backends)}"
+        )
+    return backends[backend](cache_file_path)
@@ -0,0 +1,280 @@
+import bisect
+import heapq
+import re
+import threading
+from collections import defaultdict
+from typing import Callable, Iterable
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Share of the query trigrams a name must contain to count as a fuzzy match
+MIN_TRIGRAM_SIMILARITY = 0.7
+# Trigrams in more names than this do not nominate fuzzy match candidates
+MAX_TRIGRAM_POSTINGS = 2000
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a search query and collapse punctuation and whitespace."""
+    return " ".join(_tokens(query))
+
+
+def _trigrams(tokens: list[str]) -> set[str]:
+    """Trigrams of each token, padded so short tokens and word starts count."""
+    trigrams = set()
+    for token in tokens:
+        padded = f" {token} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+class _SortedKeys:
+    """Keys kept sorted for prefix range lookups, re-sorted lazily after changes."""
+
+    def __init__(self):
+        self._keys: set[str] = set()
+        self._sorted: list[str] | None = []
+
+    def add(self, key: str):
+        if key not in self._keys:
+            self._keys.add(key)
+            self._sorted = None
+
+    def discard(self, key: str):
+        if key in self._keys:
+            self._keys.discard(key)
+            self._sorted = None
+
+    def clear(self):
+        self._keys.clear()
+        self._sorted = []
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """Keys starting with prefix, in sorted order."""
+        if self._sorted is None:
+            self._sorted = sorted(self._keys)
+        start = bisect.bisect_left(self._sorted, prefix)
+        end = bisect.bisect_left(self._sorted, prefix + "\uffff", start)
+        return self._sorted[start:end]
+
+
+class SymbolIndex:
+    """
+    Inverted index over company name tokens and trigrams, with sorted symbols and
+    name tokens for prefix lookups.
+    """
+
+    def __init__(self):
+        self._names: dict[str, str] = {}  # symbol -> company name
+        self._exact: dict[str, str] = {}  # lowercase symbol -> symbol
+        self._symbols = _SortedKeys()  # lowercase symbols
+        self._name_tokens: dict[str, set[str]] = defaultdict(set)
+        self._vocabulary = _SortedKeys()  # name tokens
+        self._full_names: dict[tuple[str, ...], set[str]] = defaultdict(set)
+        self._name_trigrams: dict[str, set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._names
+
+    def add(self, symbol: str, name: str = ""):
+        """Index a symbol and its company name, replacing a previous entry."""
+        with self._lock:
+            if symbol in self._names:
+                self.remove(symbol)
+
+            self._names[symbol] = name
+            symbol_lower = symbol.lower()
+            self._exact[symbol_lower] = symbol
+            self._symbols.add(symbol_lower)
+
+            tokens = _tokens(name)
+            if tokens:
+                self._full_names[tuple(tokens)].add(symbol)
+            for token in tokens:
+                self._name_tokens[token].add(symbol)
+                self._vocabulary.add(token)
+            for trigram in _trigrams(tokens):
+                self._name_trigrams[trigram].add(symbol)
+
+    def remove(self, symbol: str):
+        """Drop a symbol from all postings."""
+        with self._lock:
+            name = self._names.pop(symbol, None)
+            if name is None:
+                return
+
+            symbol_lower = symbol.lower()
+            self._exact.pop(symbol_lower, None)
+            self._symbols.discard(symbol_lower)
+
+            tokens = _tokens(name)
+            self._discard(self._full_names, tuple(tokens), symbol)
+            for token in tokens:
+                self._discard(self._name_tokens, token, symbol)
+                if token not in self._name_tokens:
+                    self._vocabulary.discard(token)
+            for trigram in _trigrams(tokens):
+                self._discard(self._name_trigrams, trigram, symbol)
+
+    def clear(self):
+        with self._lock:
+            self._names.clear()
+            self._exact.clear()
+            self._symbols.clear()
+            self._name_tokens.clear()
+            self._vocabulary.clear()
+            self._full_names.clear()
+            self._name_trigrams.clear()
+
+    def search(self, query: str, limit: int | None = None) -> list[str]:
+        """
+        Return symbols matching the query, ranked exact symbol > symbol prefix >
+        name tokens > partly typed name tokens > fuzzy name match. The ranks are
+        evaluated in order and the search stops once the limit is filled.
+        """
+        query_lower = query.lower().strip()
+        if not query_lower:
+            return []
+
+        query_tokens = _tokens(query_lower)
+        tiers: list[Callable[[], Iterable[tuple[str, float]]]] = [
+            lambda: self._exact_matches(query_lower),
+            lambda: self._prefix_matches(query_lower),
+            lambda: self._token_matches(query_tokens),
+            lambda: self._name_prefix_matches(query_tokens),
+            lambda: self._fuzzy_matches(query_tokens),
+        ]
+
+        results: list[str] = []
+        seen: set[str] = set()
+        with self._lock:
+            for matches in tiers:
+                remaining = None if limit is None else limit - len(results)
+                if remaining is not None and remaining <= 0:
+                    break
+                ranked = self._top(self._unseen(matches(), seen), remaining)
+                results.extend(ranked)
+                seen.update(ranked)
+        return results
+
+    @staticmethod
+    def _unseen(
+        matches: Iterable[tuple[str, float]], seen: set[str]
+    ) -> Iterable[tuple[str, float]]:
+        """Matches of symbols not ranked yet, each symbol once."""
+        seen_in_rank = set()
+        for symbol, score in matches:
+            if symbol not in seen and symbol not in seen_in_rank:
+                seen_in_rank.add(symbol)
+                yield symbol, score
+
+    @staticmethod
+    def _top(matches: Iterable[tuple[str, float]], count: int | None) -> list[str]:
+        """Best matches of a rank: highest score, then shortest symbol."""
+
+        def key(match: tuple[str, float]) -> tuple:
+            symbol, score = match
+            return -score, len(symbol), symbol
+
+        if count is None:
+            ranked = sorted(matches, key=key)
+        else:
+            ranked = heapq.nsmallest(count, matches, key=key)
+        return [symbol for symbol, _ in ranked]
+
+    def _exact_matches(self, query_lower: str) -> Iterable[tuple[str, float]]:
+        exact = self._exact.get(query_lower)
+        return [(exact, 0.0)] if exact else []
+
+    def _prefix_matches(self, query_lower: str) -> Iterable[tuple[str, float]]:
+        for symbol_lower in self._symbols.with_prefix(query_lower):
+            yield self._exact[symbol_lower], 0.0
+
+    def _token_matches(self, query_tokens: list[str]) -> Iterable[tuple[str, float]]:
+        """Symbols whose name contains all query tokens, or whose name occurs in the query."""
+        if not query_tokens:
+            return
+
+        postings = sorted(
+            (self._name_tokens.get(token, set()) for token in query_tokens), key=len
+        )
+        for symbol in postings[0]:
+            if all(symbol in posting for posting in postings[1:]):
+                yield symbol, 0.0
+
+        # Queries that contain a full company name, e.g. "apple inc stock"
+        for start in range(len(query_tokens)):
+            for end in range(start + 1, len(query_tokens) + 1):
+                for symbol in self._full_names.get(tuple(query_tokens[start:end]), ()):
+                    yield symbol, 0.0
+
+    def _name_prefix_matches(
+        self, query_tokens: list[str]
+    ) -> Iterable[tuple[str, float]]:
+        """Symbols whose name contains the query, its last token only partly typed."""
+        if not query_tokens:
+            return
+
+        *whole, partial = query_tokens
+        if not whole:
+            for token in self._vocabulary.with_prefix(partial):
+                for symbol in self._name_tokens[token]:
+                    yield symbol, 0.0
+            return
+
+        # The names of the whole tokens' matches are checked for the partial one
+        postings = sorted(
+            (self._name_tokens.get(token, set()) for token in whole), key=len
+        )
+        for symbol in postings[0]:
+            if all(symbol in posting for posting in postings[1:]) and any(
+                token.startswith(partial) for token in _tokens(self._names[symbol])
+            ):
+                yield symbol, 0.0
+
+    def _fuzzy_matches(self, query_tokens: list[str]) -> Iterable[tuple[str, float]]:
+        """
+        Symbols whose name shares enough trigrams with the query. Candidates are
+        taken from the postings of uncommon trigrams only; common ones, e.g. of
+        "inc", are just checked for the candidates found.
+        """
+        query_trigrams = _trigrams(query_tokens)
+        if not query_trigrams:
+            return
+
+        postings = [
+            self._name_trigrams.get(trigram, set()) for trigram in query_trigrams
+        ]
+        uncommon = [
+            posting for posting in postings if len(posting) <= MAX_TRIGRAM_POSTINGS
+        ]
+        common = [
+            posting for posting in postings if len(posting) > MAX_TRIGRAM_POSTINGS
+        ]
+
+        shared: dict[str, int] = defaultdict(int)
+        for posting in uncommon:
+            for symbol in posting:
+                shared[symbol] += 1
+
+        for symbol, count in shared.items():
+            count += sum(symbol in posting for posting in common)
+            similarity = count / len(query_trigrams)
+            if similarity >= MIN_TRIGRAM_SIMILARITY:
+                yield symbol, similarity
+
+    @staticmethod
+    def _discard(postings: dict[str, set[str]], key: str, symbol: str):
+        symbols = postings.get(key)
+        if symbols is None:
+            return
+        symbols.discard(symbol)
+        if not symbols:
+            del postings[key]
@@ -1,9 +1,20 @@
+import threading
+from contextlib import ExitStack
+
 import pytest
 from unittest.mock import patch, MagicMock
-from datetime import datetime
 import requests
 
-from features.fundamental_data.alphavantage_adapter import AlphaVantageAPI, DataResult
+from features.fundamental_data import alphavantage_adapter
+from features.fundamental_data.alphavantage_adapter import (
+    AlphaVantageAPI,
+    DataResult,
+    ThrottledResult,
+    _revalidation_executor,
+)
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.periods import ANNUAL_ONLY, PeriodSelection
+from tests.features.fundamental_data.single_flight_test import wait_for_waiters
 from features.fundamental_data.model import (
     FundamentalData,
     StockMetaData,
@@ -17,11 +28,9 @@ class TestAlphaVantageAPI:
     """Test suite for AlphaVantageAPI class."""
 
     @pytest.fixture
-    def clean_cache(self):
-        """Clear cache before and after each test."""
-        AlphaVantageAPI.clear_cache()
-        yield
-        AlphaVantageAPI.clear_cache()
+    def clean_cache(self, isolated_cache):
+        """Start each test with an empty cache."""
+        return isolated_cache
 
     @pytest.fixture
     def mock_overview_response(self):
@@ -184,7 +193,7 @@ class TestAlphaVantageAPI:
     def test_get_ticker_symbol_success(self, clean_cache, mock_symbol_search_response):
         """Test successful ticker symbol search."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_symbol_search_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -204,7 +213,7 @@ class TestAlphaVantageAPI:
     ):
         """Test that ticker symbol search uses intelligent caching."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_symbol_search_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -229,7 +238,7 @@ class TestAlphaVantageAPI:
     ):
         """Test intelligent matching by company name and symbol."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_symbol_search_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -258,7 +267,7 @@ class TestAlphaVantageAPI:
     def test_get_ticker_overview_success(self, clean_cache, mock_overview_response):
         """Test successful ticker overview retrieval."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_overview_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -270,7 +279,7 @@ class TestAlphaVantageAPI:
             assert isinstance(result.data, StockMetaData)
             assert result.data.symbol == "AAPL"
             assert result.data.name == "Apple Inc"
-            assert result.data.market_capitalization == "3000000000000"
+            assert result.data.market_capitalization == 3000000000000
             assert result.from_cache == False
             mock_get.assert_called_once()
             assert "OVERVIEW" in mock_get.call_args[0][0]
@@ -278,7 +287,7 @@ class TestAlphaVantageAPI:
     def test_get_ticker_overview_uses_cache(self, clean_cache, mock_overview_response):
         """Test that ticker overview uses cache on second call."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_overview_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -300,7 +309,7 @@ class TestAlphaVantageAPI:
     def test_get_ticker_overview_api_error(self, clean_cache):
         """Test ticker overview handles API errors gracefully."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.side_effect = requests.RequestException("API Error")
 
@@ -315,7 +324,7 @@ class TestAlphaVantageAPI:
     def test_get_balance_sheet_success(self, clean_cache, mock_balance_sheet_response):
         """Test successful balance sheet retrieval."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_balance_sheet_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -327,7 +336,7 @@ class TestAlphaVantageAPI:
             assert len(result.data) == 2  # 1 annual + 1 quarterly
             assert all(isinstance(report, BalanceSheetReport) for report in result.data)
             assert result.data[0].fiscal_date_ending == "2023-09-30"
-            assert result.data[0].total_assets == "352755000000"
+            assert result.data[0].total_assets == 352755000000
             assert result.from_cache == False
             mock_get.assert_called_once()
             assert "BALANCE_SHEET" in mock_get.call_args[0][0]
@@ -337,7 +346,7 @@ class TestAlphaVantageAPI:
     ):
         """Test that balance sheet uses cache on second call."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_balance_sheet_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -361,7 +370,7 @@ class TestAlphaVantageAPI:
     def test_get_balance_sheet_api_error(self, clean_cache):
         """Test balance sheet handles API errors gracefully."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.side_effect = requests.RequestException("API Error")
 
@@ -376,7 +385,7 @@ class TestAlphaVantageAPI:
     def test_get_cash_flow_success(self, clean_cache, mock_cash_flow_response):
         """Test successful cash flow retrieval."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_cash_flow_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -388,7 +397,7 @@ class TestAlphaVantageAPI:
             assert len(result.data) == 2  # 1 annual + 1 quarterly
             assert all(isinstance(report, CashFlowReport) for report in result.data)
             assert result.data[0].fiscal_date_ending == "2023-09-30"
-            assert result.data[0].operating_cashflow == "110543000000"
+            assert result.data[0].operating_cashflow == 110543000000
             assert result.from_cache == False
             mock_get.assert_called_once()
             assert "CASH_FLOW" in mock_get.call_args[0][0]
@@ -396,7 +405,7 @@ class TestAlphaVantageAPI:
     def test_get_cash_flow_uses_cache(self, clean_cache, mock_cash_flow_response):
         """Test that cash flow uses cache on second call."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_cash_flow_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -423,7 +432,7 @@ class TestAlphaVantageAPI:
     ):
         """Test successful income statement retrieval."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_income_statement_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -437,7 +446,7 @@ class TestAlphaVantageAPI:
                 isinstance(report, IncomeStatementReport) for report in result.data
             )
             assert result.data[0].fiscal_date_ending == "2023-09-30"
-            assert result.data[0].total_revenue == "383285000000"
+            assert result.data[0].total_revenue == 383285000000
             assert result.from_cache == False
             mock_get.assert_called_once()
             assert "INCOME_STATEMENT" in mock_get.call_args[0][0]
@@ -447,7 +456,7 @@ class TestAlphaVantageAPI:
     ):
         """Test that income statement uses cache on second call."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_income_statement_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -477,10 +486,10 @@ class TestAlphaVantageAPI:
     ):
         """Test successful comprehensive data retrieval."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             # Mock responses for different endpoints
-            def side_effect(url):
+            def side_effect(url, **kwargs):
                 mock_response = MagicMock()
                 mock_response.raise_for_status.return_value = None
 
@@ -515,7 +524,7 @@ class TestAlphaVantageAPI:
     ):
         """Test that comprehensive data uses cache when available."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = mock_overview_response
             mock_get.return_value.raise_for_status.return_value = None
@@ -535,7 +544,7 @@ class TestAlphaVantageAPI:
         """Test clearing all cache."""
         # Add some data to cache first
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = {
                 "Symbol": "AAPL",
@@ -546,18 +555,18 @@ class TestAlphaVantageAPI:
             AlphaVantageAPI.get_ticker_overview("AAPL")
 
             # Verify cache has data
-            assert AlphaVantageAPI.has_cached_data("AAPL", "overview")
+            assert clean_cache.has_cached_data("AAPL", "overview")
 
             # Clear all cache
-            AlphaVantageAPI.clear_cache()
+            clean_cache.clear_cache()
 
             # Verify cache is empty
-            assert not AlphaVantageAPI.has_cached_data("AAPL", "overview")
+            assert not clean_cache.has_cached_data("AAPL", "overview")
 
     def test_clear_cache_specific_symbol(self, clean_cache):
         """Test clearing cache for specific symbol."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = {
                 "Symbol": "AAPL",
@@ -574,20 +583,20 @@ class TestAlphaVantageAPI:
             AlphaVantageAPI.get_ticker_overview("GOOGL")
 
             # Verify both symbols are cached
-            assert AlphaVantageAPI.has_cached_data("AAPL", "overview")
-            assert AlphaVantageAPI.has_cached_data("GOOGL", "overview")
+            assert clean_cache.has_cached_data("AAPL", "overview")
+            assert clean_cache.has_cached_data("GOOGL", "overview")
 
             # Clear cache for AAPL only
-            AlphaVantageAPI.clear_cache("AAPL")
+            clean_cache.clear_cache("AAPL")
 
             # Verify only AAPL is cleared
-            assert not AlphaVantageAPI.has_cached_data("AAPL", "overview")
-            assert AlphaVantageAPI.has_cached_data("GOOGL", "overview")
+            assert not clean_cache.has_cached_data("AAPL", "overview")
+            assert clean_cache.has_cached_data("GOOGL", "overview")
 
     def test_get_cached_symbols(self, clean_cache):
         """Test getting list of cached symbols."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.raise_for_status.return_value = None
 
@@ -604,7 +613,7 @@ class TestAlphaVantageAPI:
             }
             AlphaVantageAPI.get_ticker_overview("GOOGL")
 
-            cached_symbols = AlphaVantageAPI.get_cached_symbols()
+            cached_symbols = clean_cache.get_cached_symbols()
 
             assert "AAPL" in cached_symbols
             assert "GOOGL" in cached_symbols
@@ -613,10 +622,10 @@ class TestAlphaVantageAPI:
     def test_has_cached_data(self, clean_cache):
         """Test checking if data is cached."""
         # Initially no cache
-        assert not AlphaVantageAPI.has_cached_data("AAPL", "overview")
+        assert not clean_cache.has_cached_data("AAPL", "overview")
 
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = {
                 "Symbol": "AAPL",
@@ -627,8 +636,8 @@ class TestAlphaVantageAPI:
             AlphaVantageAPI.get_ticker_overview("AAPL")
 
             # Now should have cache
-            assert AlphaVantageAPI.has_cached_data("AAPL", "overview")
-            assert not AlphaVantageAPI.has_cached_data("AAPL", "balance_sheet")
+            assert clean_cache.has_cached_data("AAPL", "overview")
+            assert not clean_cache.has_cached_data("AAPL", "balance_sheet")
 
     # Parametrized tests
     @pytest.mark.parametrize(
@@ -644,7 +653,7 @@ class TestAlphaVantageAPI:
     ):
         """Test that different symbols are cached separately."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             mock_get.return_value.json.return_value = {
                 "Symbol": symbol,
@@ -675,7 +684,7 @@ class TestAlphaVantageAPI:
     ):
         """Test that caching works for all data types."""
         with patch(
-            "features.fundamental_data.alphavantage_adapter.requests.get"
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
         ) as mock_get:
             # Mock appropriate response based on data type
             if data_type == "overview":
@@ -714,3 +723,339 @@ class TestAlphaVantageAPI:
                 # First call should be from API, second from cache
                 assert result1.from_cache == False
                 assert result2.from_cache == True
+
+
+@pytest.fixture(autouse=True)
+def isolated_http_client():
+    """Send mocked requests without waiting for the API quota or earlier throttling."""
+    client = "features.fundamental_data.alphavantage_adapter.http_client"
+    with patch(f"{client}.rate_limiter", None), patch(f"{client}._throttled_until", {}):
+        yield
+
+
+@pytest.fixture
+def isolated_cache(tmp_path):
+    """Use a fresh, write-through cache instead of the global one."""
+    test_cache = PersistentCache(
+        str(tmp_path / "cache.db"), backend="sqlite", write_mode="immediate"
+    )
+    with patch("features.fundamental_data.alphavantage_adapter.cache", test_cache):
+        yield test_cache
+    test_cache.close()
+
+
+class TestAlphaVantageAPICacheFreshness:
+    """Test suite for TTL handling and stale-while-revalidate in AlphaVantageAPI."""
+
+    def expire(self, test_cache, data_type: str, symbol: str):
+        """Move the fetch time of a cached entry far into the past."""
+        metadata = test_cache.get_entry_metadata(data_type, symbol)
+        metadata.fetched_at = "2000-01-01T00:00:00"
+
+    def test_fresh_entry_is_served_without_refresh(self, isolated_cache):
+        """Test that a fresh cache entry does not touch the API."""
+        isolated_cache.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple"))
+
+        with patch(
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+        ) as mock_get:
+            result = AlphaVantageAPI.get_ticker_overview("AAPL")
+
+        assert result.from_cache
+        assert result.cache_timestamp is not None
+        mock_get.assert_not_called()
+
+    def test_stale_entry_is_served_and_refreshed_in_background(self, isolated_cache):
+        """Test that stale-while-revalidate returns the cached value immediately."""
+        isolated_cache.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple"))
+        self.expire(isolated_cache, "overview", "AAPL")
+        isolated_cache.policy.stale_while_revalidate = True
+
+        with (
+            patch(
+                "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+            ) as mock_get,
+            patch.object(
+                _revalidation_executor, "submit", side_effect=lambda refresh: refresh()
+            ),
+        ):
+            mock_get.return_value.json.return_value = {
+                "Symbol": "AAPL",
+                "Name": "Apple Inc",
+            }
+            result = AlphaVantageAPI.get_ticker_overview("AAPL")
+
+        assert result.from_cache
+        assert result.data.name == "Apple"
+        mock_get.assert_called_once()
+        assert isolated_cache.get_overview("AAPL").name == "Apple Inc"
+        assert not isolated_cache.is_stale("overview", "AAPL")
+
+    def test_stale_entry_is_refetched_without_revalidate(self, isolated_cache):
+        """Test that stale entries are fetched synchronously when revalidation is off."""
+        isolated_cache.set_exchange_rate("EUR", 1.0)
+        self.expire(isolated_cache, "exchange_rate", "EUR")
+        isolated_cache.policy.stale_while_revalidate = False
+
+        with patch(
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+        ) as mock_get:
+            mock_get.return_value.json.return_value = {
+                "Realtime Currency Exchange Rate": {"5. Exchange Rate": "1.08"}
+            }
+            exchange_rate = AlphaVantageAPI.get_currency_ratio("EUR")
+
+        assert exchange_rate == 1.08
+        mock_get.assert_called_once()
+
+
+class TestAlphaVantageAPISymbolSearch:
+    """Test suite for cached symbol searches in AlphaVantageAPI."""
+
+    def test_repeated_query_is_served_complete_from_cache(self, isolated_cache):
+        """Test that a repeated search returns the full earlier result list."""
+        best_matches = [
+            {"1. symbol": "AAPL", "2. name": "Apple Inc"},
+            {"1. symbol": "APC.DEX", "2. name": "Apple Inc"},
+        ]
+        with patch(
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+        ) as mock_get:
+            mock_get.return_value.json.return_value = {"bestMatches": best_matches}
+            first = AlphaVantageAPI.get_ticker_symbol("Apple  computer")
+            second = AlphaVantageAPI.get_ticker_symbol("apple computer")
+
+        mock_get.assert_called_once()
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.data == best_matches
+
+    def test_error_payload_is_not_cached(self, isolated_cache):
+        """Test that responses without bestMatches don't poison the query cache."""
+        with (
+            patch(
+                "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+            ) as mock_get,
+            patch("features.fundamental_data.http_client.time.sleep"),
+        ):
+            mock_get.return_value.json.return_value = {"Note": "rate limit"}
+            result = AlphaVantageAPI.get_ticker_symbol("Tesla")
+
+        assert isinstance(result, ThrottledResult)
+        assert isolated_cache.get_query_results("Tesla") is None
+
+
+class TestAlphaVantageAPIThrottling:
+    """Test suite for rate limit payloads returned by AlphaVantageAPI endpoints."""
+
+    def test_throttled_statement_is_not_cached(self, isolated_cache):
+        """Test that a rate limit payload yields a throttled result and no cache entry."""
+        with (
+            patch(
+                "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+            ) as mock_get,
+            patch("features.fundamental_data.http_client.time.sleep"),
+        ):
+            mock_get.return_value.json.return_value = {
+                "Information": "Our standard API rate limit is 25 requests per day."
+            }
+            result = AlphaVantageAPI.get_balance_sheet("AAPL")
+            calls = mock_get.call_count
+            again = AlphaVantageAPI.get_balance_sheet("AAPL")
+
+        assert isinstance(result, ThrottledResult)
+        assert result.data == []
+        assert "25 requests per day" in result.message
+        assert isolated_cache.get_balance_sheet("AAPL") is None
+        # The negative cache answers the repeated request without calling the API
+        assert isinstance(again, ThrottledResult)
+        assert mock_get.call_count == calls
+
+    def test_throttled_currency_ratio_is_skipped(self, isolated_cache):
+        """Test that a rate limited exchange rate returns None instead of raising."""
+        with (
+            patch(
+                "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+            ) as mock_get,
+            patch("features.fundamental_data.http_client.time.sleep"),
+        ):
+            mock_get.return_value.json.return_value = {
+                "Information": "Our standard API rate limit is 25 requests per day."
+            }
+            rate = AlphaVantageAPI.get_currency_ratio("EUR")
+
+        assert rate is None
+        assert isolated_cache.get_exchange_rate("EUR") is None
+
+    def test_empty_statement_is_not_cached(self, isolated_cache):
+        """Test that a response without reports does not create an empty cache entry."""
+        with patch(
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+        ) as mock_get:
+            mock_get.return_value.json.return_value = {"symbol": "AAPL"}
+            result = AlphaVantageAPI.get_cash_flow("AAPL")
+
+        assert result.data == []
+        assert isolated_cache.get_cash_flow("AAPL") is None
+
+
+class TestAlphaVantageAPIPeriodSelection:
+    """Test suite for returning only the selected periods of a statement."""
+
+    RESPONSE = {
+        "symbol": "AAPL",
+        "annualReports": [
+            {"fiscalDateEnding": "2023-09-30", "reportedCurrency": "USD"},
+        ],
+        "quarterlyReports": [
+            {"fiscalDateEnding": date, "reportedCurrency": "USD"}
+            for date in ("2023-12-31", "2023-09-30", "2023-06-30", "2023-03-31")
+        ],
+    }
+
+    def test_annual_only_leaves_quarters_unparsed(self, isolated_cache):
+        """Test that an annual-only fetch builds no quarterly report models."""
+        with patch(
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+        ) as mock_get:
+            mock_get.return_value.json.return_value = self.RESPONSE
+            result = AlphaVantageAPI.get_income_statement("AAPL", ANNUAL_ONLY)
+
+        assert [r.fiscal_date_ending for r in result.data] == ["2023-09-30"]
+        assert all(r.annual_report for r in result.data)
+        assert ("quarterly_reports", "AAPL") not in isolated_cache._models
+        assert len(isolated_cache.backend.get("income_statement", "AAPL")) == 1
+
+    def test_quarters_are_parsed_when_selected(self, isolated_cache):
+        """Test that later requests parse the requested quarters from the kept payload."""
+        with patch(
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+        ) as mock_get:
+            mock_get.return_value.json.return_value = self.RESPONSE
+            fetched = AlphaVantageAPI.get_income_statement(
+                "AAPL", PeriodSelection.last_quarters(2)
+            )
+            everything = AlphaVantageAPI.get_income_statement("AAPL")
+
+        assert mock_get.call_count == 1
+        assert not fetched.from_cache
+        assert [(r.fiscal_date_ending, r.quarter_report) for r in fetched.data] == [
+            ("2023-09-30", False),
+            ("2023-12-31", True),
+            ("2023-09-30", True),
+        ]
+        assert everything.from_cache
+        assert len(everything.data) == 5
+
+    def test_cached_comprehensive_data_is_read_only(self, isolated_cache):
+        """Test that quarterly ratios are calculated for the response, not stored."""
+        isolated_cache.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple"))
+        for data_type, model in (
+            ("balance_sheet", BalanceSheetReport),
+            ("income_statement", IncomeStatementReport),
+            ("cash_flow", CashFlowReport),
+        ):
+            alphavantage_adapter._cache_statement(
+                data_type, "AAPL", self.RESPONSE, model
+            )
+        stored = isolated_cache.get_calculated_metrics("AAPL")
+
+        with (
+            patch(
+                "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+            ) as mock_get,
+            patch.object(isolated_cache, "set_calculated_metrics") as set_metrics,
+        ):
+            first = AlphaVantageAPI.get_comprehensive_data("AAPL")
+            second = AlphaVantageAPI.get_comprehensive_data("AAPL")
+
+        mock_get.assert_not_called()
+        set_metrics.assert_not_called()
+        assert isolated_cache.get_calculated_metrics("AAPL") == stored
+        assert [m.fiscal_date_ending for m in first.calculated_metrics] == [
+            "2023-12-31",
+            "2023-09-30",
+            "2023-06-30",
+            "2023-03-31",
+        ]
+        assert second.calculated_metrics == first.calculated_metrics
+
+
+class TestAlphaVantageAPITickerData:
+    """Test suite for fetching the data types of a ticker concurrently."""
+
+    def test_data_types_are_fetched_concurrently(self):
+        """Test that all four requests are in flight at the same time."""
+        barrier = threading.Barrier(4, timeout=5)
+
+        def fetch(symbol, periods=None):
+            # Only passes once all four getters run at the same time
+            barrier.wait()
+            return DataResult([symbol], from_cache=False)
+
+        reported = []
+        getters = [
+            "get_ticker_overview",
+            "get_balance_sheet",
+            "get_income_statement",
+            "get_cash_flow",
+        ]
+        with ExitStack() as stack:
+            for getter in getters:
+                stack.enter_context(
+                    patch.object(AlphaVantageAPI, getter, side_effect=fetch)
+                )
+            results = AlphaVantageAPI.get_ticker_data(
+                "AAPL", on_result=lambda data_type, result: reported.append(data_type)
+            )
+
+        assert list(results) == [
+            "overview",
+            "balance_sheet",
+            "income_statement",
+            "cash_flow",
+        ]
+        assert sorted(reported) == sorted(results)
+        assert all(result.data == ["AAPL"] for result in results.values())
+
+    def test_concurrent_fetches_of_a_symbol_share_one_request(self, isolated_cache):
+        """Test that simultaneous cache misses for a symbol spend one API call."""
+        release = threading.Event()
+        single_flight = alphavantage_adapter._single_flight
+        key = ("balance_sheet", "AAPL")
+
+        def slow_get(url, timeout):
+            release.wait(5)
+            response = MagicMock()
+            response.json.return_value = {
+                "symbol": "AAPL",
+                "annualReports": [
+                    {"fiscalDateEnding": "2023-09-30", "reportedCurrency": "USD"}
+                ],
+            }
+            return response
+
+        results = []
+        with patch(
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get",
+            side_effect=slow_get,
+        ) as mock_get:
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(
+                        AlphaVantageAPI.get_balance_sheet("AAPL")
+                    )
+                )
+                for _ in range(2)
+            ]
+            threads[0].start()
+            wait_for_waiters(single_flight, key, 0)
+            threads[1].start()
+            wait_for_waiters(single_flight, key, 1)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        assert mock_get.call_count == 1
+        assert results[0] is results[1]
+        assert len(results[0].data) == 1
@@ -0,0 +1,143 @@
+from unittest.mock import patch
+
+import pytest
+
+from features.fundamental_data.archive_replay import replay_archive
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.model import BalanceSheetReport
+from features.fundamental_data.response_archive import ResponseArchive
+
+
+class TestArchiveReplay:
+    """Test suite for rebuilding the cache from archived responses."""
+
+    @pytest.fixture
+    def isolated_cache(self, tmp_path):
+        """Use a fresh, write-through cache instead of the global one."""
+        test_cache = PersistentCache(
+            str(tmp_path / "cache.db"), backend="sqlite", write_mode="immediate"
+        )
+        with patch("features.fundamental_data.alphavantage_adapter.cache", test_cache):
+            yield test_cache
+        test_cache.close()
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        archive = ResponseArchive(tmp_path / "responses")
+        archive.store(
+            "OVERVIEW",
+            {"symbol": "AAPL"},
+            {"Symbol": "AAPL", "Name": "Apple Inc", "LatestQuarter": "2023-12-31"},
+            fetched_at="2024-01-15T10:00:00",
+        )
+        archive.store(
+            "BALANCE_SHEET",
+            {"symbol": "AAPL"},
+            {
+                "symbol": "AAPL",
+                "annualReports": [
+                    {"fiscalDateEnding": "2023-09-30", "reportedCurrency": "USD"}
+                ],
+                "quarterlyReports": [
+                    {"fiscalDateEnding": "2023-12-31", "reportedCurrency": "USD"}
+                ],
+            },
+            fetched_at="2024-01-15T10:00:01",
+        )
+        archive.store(
+            "FX_MONTHLY",
+            {"from_symbol": "EUR", "to_symbol": "USD"},
+            {"Time Series FX (Monthly)": {"2023-12-29": {"4. close": "1.1039"}}},
+        )
+        archive.store("GLOBAL_QUOTE", {"symbol": "AAPL"}, {"Global Quote": {}})
+        return archive
+
+    def test_replay_rebuilds_cache_without_api_calls(self, isolated_cache, archive):
+        """Test that archived responses are parsed into the cache offline."""
+        with patch(
+            "features.fundamental_data.alphavantage_adapter.http_client.session.get"
+        ) as mock_get:
+            summary = replay_archive(archive, max_workers=4)
+
+        mock_get.assert_not_called()
+        assert summary == {"replayed": 3, "failed": 0, "skipped": 1}
+        assert isolated_cache.get_overview("AAPL").name == "Apple Inc"
+        assert [
+            (r.fiscal_date_ending, r.annual_report)
+            for r in isolated_cache.get_balance_sheet("AAPL")
+        ] == [("2023-09-30", True), ("2023-12-31", False)]
+        assert isolated_cache.get_fx_history("EUR") == {"2023-12-29": 1.1039}
+
+        metadata = isolated_cache.get_entry_metadata("overview", "AAPL")
+        assert metadata.source == "archive"
+        assert metadata.fetched_at == "2024-01-15T10:00:00"
+
+    def test_replay_uses_latest_response_and_reports_failures(
+        self, isolated_cache, archive
+    ):
+        """Test that newer responses win and unparsable ones are counted as failed."""
+        archive.store(
+            "OVERVIEW",
+            {"symbol": "AAPL"},
+            {"Symbol": "AAPL", "Name": "Apple"},
+            fetched_at="2024-02-01T00:00:00",
+        )
+        archive.store("CURRENCY_EXCHANGE_RATE", {"from_currency": "EUR"}, {"x": 1})
+
+        summary = replay_archive(archive)
+
+        assert summary["failed"] == 1
+        assert isolated_cache.get_overview("AAPL").name == "Apple"
+        assert isolated_cache.get_exchange_rate("EUR") is None
+
+    def test_replay_replaces_cached_statements(self, isolated_cache, archive):
+        """Test that replay re-parses periods which are already cached."""
+        isolated_cache.set_balance_sheet(
+            "AAPL",
+            [
+                BalanceSheetReport(
+                    fiscal_date_ending="2023-09-30",
+                    reported_currency="USD",
+                    total_assets=None,
+                    annual_report=True,
+                )
+            ],
+        )
+        archive.store(
+            "BALANCE_SHEET",
+            {"symbol": "AAPL"},
+            {
+                "symbol": "AAPL",
+                "annualReports": [
+                    {
+                        "fiscalDateEnding": "2023-09-30",
+                        "reportedCurrency": "USD",
+                        "totalAssets": "123",
+                    }
+                ],
+            },
+            fetched_at="2024-02-01T00:00:00",
+        )
+
+        replay_archive(archive)
+
+        [report] = [
+            r for r in isolated_cache.get_balance_sheet("AAPL") if r.annual_report
+        ]
+        assert report.total_assets == 123
+        assert isolated_cache.backend.get("balance_sheet", "AAPL") is not None
+        assert (
+            isolated_cache.get_entry_metadata("balance_sheet", "AAPL").source
+            == "archive"
+        )
+
+    def test_replay_requires_an_archive(self):
+        """Test that replaying without a configured archive is rejected."""
+        with (
+            patch(
+                "features.fundamental_data.archive_replay.get_response_archive",
+                return_value=None,
+            ),
+            pytest.raises(ValueError),
+        ):
+            replay_archive()
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from features.fundamental_data.alphavantage_adapter import AlphaVantageAPI, DataResult
+from features.fundamental_data.async_adapter import AsyncAlphaVantageAPI
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.model import BalanceSheetReport, StockMetaData
+
+
+class TestAsyncAlphaVantageAPI:
+    """Test suite for bulk refreshes with the asyncio client."""
+
+    @pytest.fixture
+    def isolated_cache(self, request, tmp_path):
+        """Use a fresh cache, write-through unless a test asks otherwise."""
+        options = getattr(request, "param", {"write_mode": "immediate"})
+        test_cache = PersistentCache(
+            str(tmp_path / "cache.db"), backend="sqlite", **options
+        )
+        with patch("features.fundamental_data.alphavantage_adapter.cache", test_cache):
+            yield test_cache
+        test_cache.close()
+
+    @pytest.fixture
+    def api_calls(self, isolated_cache):
+        """Mock the blocking getters and track how many run at the same time."""
+        state = {"active": 0, "max_active": 0}
+        lock = threading.Lock()
+
+        def call(result):
+            def getter(symbol, periods=None):
+                with lock:
+                    state["active"] += 1
+                    state["max_active"] = max(state["max_active"], state["active"])
+                time.sleep(0.01)
+                with lock:
+                    state["active"] -= 1
+                return DataResult(result(symbol), from_cache=False)
+
+            return getter
+
+        def overview(symbol):
+            isolated_cache.set_overview(
+                symbol, StockMetaData(symbol=symbol, name=symbol)
+            )
+            return isolated_cache.get_overview(symbol)
+
+        def balance_sheet(symbol):
+            reports = [
+                BalanceSheetReport(
+                    fiscal_date_ending="2023-12-31",
+                    reported_currency="USD",
+                    annual_report=True,
+                )
+            ]
+            isolated_cache.set_balance_sheet(symbol, reports)
+            return reports
+
+        with (
+            patch.object(
+                AlphaVantageAPI, "get_ticker_overview", side_effect=call(overview)
+            ),
+            patch.object(
+                AlphaVantageAPI, "get_balance_sheet", side_effect=call(balance_sheet)
+            ),
+            patch.object(
+                AlphaVantageAPI, "get_income_statement", side_effect=call(lambda s: [])
+            ),
+            patch.object(
+                AlphaVantageAPI, "get_cash_flow", side_effect=call(lambda s: [])
+            ),
+        ):
+            yield state
+
+    def test_refresh_streams_every_symbol(self, isolated_cache, api_calls):
+        """Test that each symbol of an async iterator is yielded once."""
+
+        async def symbols():
+            for index in range(10):
+                yield f"SYM{index}"
+
+        async def collect():
+            client = AsyncAlphaVantageAPI(max_concurrency=3, batch_size=4)
+            return [data async for data in client.refresh(symbols())]
+
+        results = asyncio.run(collect())
+
+        assert sorted(data.symbol for data in results) == [f"SYM{i}" for i in range(10)]
+        assert all(data.overview.symbol == data.symbol for data in results)
+        assert 1 < api_calls["max_active"] <= 3
+
+    @pytest.mark.parametrize(
+        "isolated_cache", [{"write_mode": "write_behind"}], indirect=True
+    )
+    def test_refresh_writes_in_batches(self, isolated_cache, api_calls):
+        """Test that buffered cache writes are flushed per batch of symbols."""
+        flushes = []
+        original_flush = isolated_cache.flush
+
+        def flush():
+            flushes.append(len(isolated_cache.dirty_sections))
+            original_flush()
+
+        async def collect():
+            client = AsyncAlphaVantageAPI(max_concurrency=2, batch_size=3)
+            return [data async for data in client.refresh(["A", "B", "C", "D"])]
+
+        with patch.object(isolated_cache, "flush", side_effect=flush):
+            asyncio.run(collect())
+
+        # One flush after the first batch of three, one when the refresh ends
+        assert len(flushes) == 2
+        assert flushes[0] > 0
+        assert isolated_cache.dirty_sections == set()
+        assert isolated_cache.backend.get("overview", "D") is not None
+
+    def test_suspended_refresh_does_not_defer_other_writes(
+        self, isolated_cache, api_calls
+    ):
+        """Test that writes of other callers persist while the caller holds a result."""
+
+        async def consume_one():
+            refresh = AsyncAlphaVantageAPI(max_concurrency=1).refresh(["A", "B"])
+            await anext(refresh)
+            isolated_cache.set_overview(
+                "MSFT", StockMetaData(symbol="MSFT", name="Microsoft")
+            )
+            persisted = isolated_cache.backend.get("overview", "MSFT")
+            await refresh.aclose()
+            return persisted
+
+        assert asyncio.run(consume_one()) is not None
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.cache_policy import CachePolicy
+from features.fundamental_data.model import (
+    BalanceSheetReport,
+    CacheEntryMetadata,
+    StockMetaData,
+)
+
+
+class TestCachePolicy:
+    """Test suite for CachePolicy staleness rules."""
+
+    @pytest.fixture
+    def now(self):
+        return datetime(2024, 6, 1, 12, 0)
+
+    def metadata(self, data_type: str, fetched_at: datetime) -> CacheEntryMetadata:
+        return CacheEntryMetadata(
+            data_type=data_type, symbol="AAPL", fetched_at=fetched_at.isoformat()
+        )
+
+    @pytest.mark.parametrize(
+        "data_type,age,expected",
+        [
+            ("overview", timedelta(hours=1), False),
+            ("overview", timedelta(days=2), True),
+            ("exchange_rate", timedelta(days=2), True),
+            ("balance_sheet", timedelta(days=30), False),
+            ("balance_sheet", timedelta(days=400), True),
+            ("calculated_metrics", timedelta(days=4000), False),
+        ],
+    )
+    def test_ttl_per_data_type(self, now, data_type, age, expected):
+        """Test that each data type expires after its own TTL."""
+        policy = CachePolicy()
+
+        assert policy.is_expired(self.metadata(data_type, now - age), now) is expected
+
+    def test_missing_metadata_is_stale(self):
+        """Test that entries without metadata have an unknown age and are stale."""
+        assert CachePolicy().is_stale(None)
+
+    def test_statements_are_stale_when_overview_has_newer_quarter(self, now):
+        """Test that a LatestQuarter newer than the cached quarters makes statements stale."""
+        policy = CachePolicy()
+        reports = [
+            BalanceSheetReport(
+                fiscal_date_ending="2023-12-31",
+                reported_currency="USD",
+                quarter_report=True,
+            ),
+            BalanceSheetReport(
+                fiscal_date_ending="2023-09-30",
+                reported_currency="USD",
+                annual_report=True,
+            ),
+        ]
+        metadata = self.metadata("balance_sheet", now - timedelta(days=1))
+
+        assert not policy.is_stale(metadata, "2023-12-31", reports, now)
+        assert policy.is_stale(metadata, "2024-03-31", reports, now)
+
+    def test_raw_quarters_count_towards_newer_quarter(self, now):
+        """Test that quarters kept unparsed still make statements fresh or stale."""
+        policy = CachePolicy()
+        metadata = self.metadata("balance_sheet", now - timedelta(days=1))
+
+        assert not policy.is_stale(
+            metadata, "2023-12-31", [], now, quarterly_dates=["2023-12-31"]
+        )
+        assert policy.is_stale(
+            metadata, "2024-03-31", None, now, quarterly_dates=["2023-12-31"]
+        )
+
+    def test_cache_is_stale_uses_cached_overview(self, tmp_path):
+        """Test that PersistentCache.is_stale combines metadata and the cached overview."""
+        cache = PersistentCache(
+            str(tmp_path / "cache.db"), backend="sqlite", write_mode="immediate"
+        )
+        cache.set_balance_sheet(
+            "AAPL",
+            [
+                BalanceSheetReport(
+                    fiscal_date_ending="2023-12-31",
+                    reported_currency="USD",
+                    quarter_report=True,
+                )
+            ],
+        )
+        cache.set_overview(
+            "AAPL",
+            StockMetaData(symbol="AAPL", name="Apple Inc", latest_quarter="2023-12-31"),
+        )
+        assert not cache.is_stale("balance_sheet", "AAPL")
+        assert not cache.is_stale("overview", "AAPL")
+
+        cache.set_overview(
+            "AAPL",
+            StockMetaData(symbol="AAPL", name="Apple Inc", latest_quarter="2024-03-31"),
+        )
+        assert cache.is_stale("balance_sheet", "AAPL")
+
+    def test_statement_fetched_against_latest_quarter_stays_fresh(self, tmp_path):
+        """Test that an announced but unpublished quarter is not re-fetched on each read."""
+        cache = PersistentCache(
+            str(tmp_path / "cache.db"), backend="sqlite", write_mode="immediate"
+        )
+        cache.set_overview(
+            "AAPL",
+            StockMetaData(symbol="AAPL", name="Apple Inc", latest_quarter="2024-03-31"),
+        )
+        # The fetch triggered by the new quarter still returns the previous one
+        cache.set_balance_sheet(
+            "AAPL",
+            [
+                BalanceSheetReport(
+                    fiscal_date_ending="2023-12-31",
+                    reported_currency="USD",
+                    quarter_report=True,
+                )
+            ],
+        )
+        assert not cache.is_stale("balance_sheet", "AAPL")
+
+        cache.set_overview(
+            "AAPL",
+            StockMetaData(symbol="AAPL", name="Apple Inc", latest_quarter="2024-06-30"),
+        )
+        assert cache.is_stale("balance_sheet", "AAPL")
@@ -0,0 +1,610 @@
+import json
+from datetime import timedelta
+import sqlite3
+import threading
+import time
+from unittest.mock import call, patch
+
+import pytest
+
+from features.fundamental_data import cache as cache_module
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.model import (
+    BalanceSheetReport,
+    CalculatedMetrics,
+    CashFlowReport,
+    IncomeStatementReport,
+    StockMetaData,
+)
+from features.fundamental_data.periods import ANNUAL_ONLY, PeriodSelection
+from features.fundamental_data.storage import (
+    ColumnarBackend,
+    JsonFileBackend,
+    SqliteBackend,
+)
+
+
+class TestPersistentCache:
+    """Test suite for PersistentCache with the available storage backends."""
+
+    @pytest.fixture(params=["json", "sqlite", "columnar"])
+    def cache_path(self, request, tmp_path):
+        """Cache file path for each backend."""
+        suffix = {"json": "json", "sqlite": "db", "columnar": "avcs"}[request.param]
+        return request.param, str(tmp_path / f"cache.{suffix}")
+
+    @pytest.fixture
+    def balance_sheets(self):
+        """Two annual balance sheet reports."""
+        return [
+            BalanceSheetReport(
+                fiscal_date_ending="2023-09-30",
+                reported_currency="USD",
+                total_assets="352755000000",
+                annual_report=True,
+            ),
+            BalanceSheetReport(
+                fiscal_date_ending="2022-09-30",
+                reported_currency="USD",
+                total_assets="352583000000",
+                annual_report=True,
+            ),
+        ]
+
+    def test_roundtrip_survives_reload(self, cache_path, balance_sheets):
+        """Test that cached data is read back after reopening the cache."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend)
+        cache.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple Inc"))
+        cache.set_balance_sheet("AAPL", balance_sheets)
+        cache.set_exchange_rate("EUR", 1.08)
+        cache.set_fx_history("EUR", {"2023-12-29": 1.10})
+        cache.add_symbol_results([{"1. symbol": "AAPL", "2. name": "Apple Inc"}])
+        cache.close()
+
+        reopened = PersistentCache(path, backend=backend)
+
+        assert reopened.get_overview("AAPL").name == "Apple Inc"
+        assert [r.fiscal_date_ending for r in reopened.get_balance_sheet("AAPL")] == [
+            "2023-09-30",
+            "2022-09-30",
+        ]
+        assert reopened.get_balance_sheet("AAPL")[0].total_assets == 352755000000
+        assert reopened.get_exchange_rate("EUR") == 1.08
+        assert reopened.get_fx_history("EUR") == {"2023-12-29": 1.10}
+        assert reopened.search_symbols("AAPL")[0]["2. name"] == "Apple Inc"
+
+    def test_set_reports_keeps_existing_periods(self, cache_path, balance_sheets):
+        """Test that reports are merged by fiscal_date_ending without duplicates."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend)
+        cache.set_balance_sheet("AAPL", balance_sheets[:1])
+        cache.set_balance_sheet("AAPL", balance_sheets)
+
+        assert len(cache.get_balance_sheet("AAPL")) == 2
+        cache.close()
+        assert (
+            len(PersistentCache(path, backend=backend).get_balance_sheet("AAPL")) == 2
+        )
+
+    def test_annual_and_q4_reports_survive_reload(self, cache_path):
+        """Test that the annual and the Q4 report of a fiscal year end are both kept."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend)
+        cache.set_balance_sheet(
+            "AAPL",
+            [
+                BalanceSheetReport(
+                    fiscal_date_ending="2023-09-30",
+                    reported_currency="USD",
+                    total_assets="352583000000",
+                    annual_report=True,
+                ),
+                BalanceSheetReport(
+                    fiscal_date_ending="2023-09-30",
+                    reported_currency="USD",
+                    total_assets="350000000000",
+                    quarter_report=True,
+                ),
+            ],
+        )
+        cache.close()
+
+        reopened = PersistentCache(path, backend=backend)
+        reports = reopened.get_balance_sheet("AAPL")
+
+        assert [(r.annual_report, r.quarter_report) for r in reports] == [
+            (True, False),
+            (False, True),
+        ]
+        assert reports[0].total_assets == 352583000000
+        assert reopened.get_balance_sheet("AAPL", ANNUAL_ONLY) == reports[:1]
+
+    def test_calculated_metrics_replace_existing_periods(self, cache_path):
+        """Test that recalculated metrics overwrite the stored period."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend)
+        cache.set_calculated_metrics(
+            "AAPL",
+            [
+                CalculatedMetrics(
+                    fiscal_date_ending="2023-09-30", year=2023, pe_ratio=30.0
+                )
+            ],
+        )
+        cache.set_calculated_metrics(
+            "AAPL",
+            [
+                CalculatedMetrics(
+                    fiscal_date_ending="2023-09-30", year=2023, pe_ratio=28.0
+                )
+            ],
+        )
+        cache.close()
+
+        metrics = PersistentCache(path, backend=backend).get_calculated_metrics("AAPL")
+        assert [metric.pe_ratio for metric in metrics] == [28.0]
+
+    def test_clear_cache_for_symbol(self, cache_path):
+        """Test clearing a single symbol keeps the others."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend)
+        cache.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple Inc"))
+        cache.set_overview("MSFT", StockMetaData(symbol="MSFT", name="Microsoft"))
+        cache.clear_cache("AAPL")
+        cache.close()
+
+        reopened = PersistentCache(path, backend=backend)
+        assert not reopened.has_cached_data("AAPL", "overview")
+        assert reopened.has_cached_data("MSFT", "overview")
+
+    def test_sqlite_stores_one_row_per_report(self, tmp_path):
+        """Test that the SQLite backend upserts individual report rows."""
+        path = tmp_path / "cache.db"
+        cache = PersistentCache(str(path), backend="sqlite", write_mode="immediate")
+        cache.set_income_statement(
+            "AAPL",
+            [
+                IncomeStatementReport(
+                    fiscal_date_ending="2023-09-30", reported_currency="USD"
+                ),
+                IncomeStatementReport(
+                    fiscal_date_ending="2024-03-31",
+                    reported_currency="USD",
+                    quarter_report=True,
+                ),
+            ],
+        )
+
+        rows = sqlite3.connect(path).execute(
+            "SELECT symbol, fiscal_date_ending FROM income_statement ORDER BY rowid"
+        )
+        assert rows.fetchall() == [("AAPL", "2023-09-30"), ("AAPL", "2024-03-31")]
+
+    def test_sqlite_migrates_date_keyed_report_tables(self, tmp_path):
+        """Test that report tables keyed by date only get the period type in the key."""
+        path = tmp_path / "cache.db"
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE balance_sheet (symbol TEXT NOT NULL, "
+            "fiscal_date_ending TEXT NOT NULL, payload TEXT NOT NULL, "
+            "updated_at TEXT NOT NULL, PRIMARY KEY (symbol, fiscal_date_ending))"
+        )
+        connection.execute(
+            "INSERT INTO balance_sheet VALUES (?, ?, ?, ?)",
+            (
+                "AAPL",
+                "2023-09-30",
+                json.dumps(
+                    {
+                        "fiscal_date_ending": "2023-09-30",
+                        "reported_currency": "USD",
+                        "annual_report": True,
+                    }
+                ),
+                "2024-01-01T00:00:00",
+            ),
+        )
+        connection.commit()
+        connection.close()
+
+        cache = PersistentCache(str(path), backend="sqlite", write_mode="immediate")
+        cache.set_balance_sheet(
+            "AAPL",
+            [
+                BalanceSheetReport(
+                    fiscal_date_ending="2023-09-30",
+                    reported_currency="USD",
+                    quarter_report=True,
+                )
+            ],
+        )
+        cache.close()
+
+        reports = PersistentCache(str(path), backend="sqlite").get_balance_sheet("AAPL")
+        assert [r.annual_report for r in reports] == [True, False]
+
+    @pytest.mark.parametrize("backend_class", [JsonFileBackend, ColumnarBackend])
+    def test_readers_wait_for_batch_of_other_thread(self, tmp_path, backend_class):
+        """Test that another thread does not read records while a batch applies them."""
+        backend = backend_class(tmp_path / "cache.bin")
+        backend.upsert_entry("overview", "AAPL", {"symbol": "AAPL"})
+        in_batch, release = threading.Event(), threading.Event()
+        keys = []
+
+        def write():
+            with backend.batch():
+                backend.upsert_entry("overview", "MSFT", {"symbol": "MSFT"})
+                in_batch.set()
+                release.wait(5)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        in_batch.wait(5)
+        reader = threading.Thread(target=lambda: keys.extend(backend.keys("overview")))
+        reader.start()
+        reader.join(0.2)
+
+        assert reader.is_alive()
+        release.set()
+        writer.join(5)
+        reader.join(5)
+        assert keys == ["AAPL", "MSFT"]
+        backend.close()
+
+    def test_backend_instance_is_used(self, tmp_path):
+        """Test that a backend instance can be passed directly."""
+        backend = SqliteBackend(tmp_path / "cache.db")
+        cache = PersistentCache(backend=backend)
+
+        assert cache.backend is backend
+        assert cache.get_cache_info()["backend"] == "sqlite"
+
+    def test_json_backend_reads_legacy_file(self, tmp_path):
+        """Test that the JSON backend reads cache files written before backends existed."""
+        path = tmp_path / "cache.json"
+        path.write_text(
+            '{"overview": {"AAPL": {"symbol": "AAPL", "name": "Apple Inc"}},'
+            ' "exchange_rate": {"EUR": 1.1}, "version": "1.0"}'
+        )
+
+        cache = PersistentCache(backend=JsonFileBackend(path))
+
+        assert cache.get_overview("AAPL").symbol == "AAPL"
+        assert cache.get_exchange_rate("EUR") == 1.1
+
+    def test_reports_are_hydrated_on_first_access(self, cache_path, balance_sheets):
+        """Test that opening a cache does not validate reports until they are requested."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend)
+        cache.set_balance_sheet("AAPL", balance_sheets)
+        cache.set_balance_sheet("MSFT", balance_sheets)
+        cache.close()
+
+        reopened = PersistentCache(path, backend=backend)
+        with patch.object(
+            reopened.backend, "get", wraps=reopened.backend.get
+        ) as backend_get:
+            reports = reopened.get_balance_sheet("AAPL")
+            assert reopened.get_balance_sheet("AAPL") is reports
+
+        # Quarterly reports kept raw are looked up once alongside the parsed reports
+        assert backend_get.call_args_list == [
+            call("balance_sheet", "AAPL"),
+            call("quarterly_payload", "AAPL"),
+        ]
+        assert [r.fiscal_date_ending for r in reports] == ["2023-09-30", "2022-09-30"]
+        assert ("balance_sheet", "MSFT") not in reopened._models
+        assert reopened.get_cached_symbols() == ["AAPL", "MSFT"]
+
+    def test_entry_metadata_is_recorded_per_symbol(self, cache_path, balance_sheets):
+        """Test that set_* records fetch time, source, size and report count."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend)
+        cache.set_balance_sheet("AAPL", balance_sheets[:1])
+        first = cache.get_entry_metadata("balance_sheet", "AAPL")
+        cache.set_balance_sheet("AAPL", balance_sheets, source="import")
+        assert cache.get_entry_metadata("overview", "AAPL") is None
+        cache.close()
+
+        metadata = PersistentCache(path, backend=backend).get_entry_metadata(
+            "balance_sheet", "AAPL"
+        )
+
+        assert metadata.report_count == 2
+        assert metadata.source == "import"
+        assert metadata.payload_bytes > first.payload_bytes > 0
+        assert metadata.fetched_at >= first.fetched_at
+
+    def test_write_behind_flushes_once_per_batch(self, tmp_path, balance_sheets):
+        """Test that buffered changes are journaled in a single append."""
+        cache = PersistentCache(
+            str(tmp_path / "cache.json"), backend="json", write_mode="write_behind"
+        )
+        with patch.object(
+            cache.backend._journal, "append", wraps=cache.backend._journal.append
+        ) as append:
+            cache.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple Inc"))
+            cache.set_balance_sheet("AAPL", balance_sheets)
+            cache.set_exchange_rate("EUR", 1.08)
+
+            assert cache.dirty_sections == {
+                "overview",
+                "balance_sheet",
+                "exchange_rate",
+                "metadata",
+            }
+            assert not (tmp_path / "cache.json.journal").exists()
+
+            cache.flush()
+
+        assert cache.dirty_sections == set()
+        append.assert_called_once()
+        assert not (tmp_path / "cache.json").exists()
+        cache.close()
+
+    def test_journal_is_replayed_and_compacted(self, tmp_path, balance_sheets):
+        """Test that journaled changes survive a reload and fold into the snapshot."""
+        path = tmp_path / "cache.json"
+        cache = PersistentCache(str(path), backend="json", write_mode="immediate")
+        cache.set_balance_sheet("AAPL", balance_sheets[:1])
+        cache.set_balance_sheet("AAPL", balance_sheets[1:])
+        cache.close()
+
+        reopened = PersistentCache(str(path), backend="json")
+        assert len(reopened.get_balance_sheet("AAPL")) == 2
+
+        reopened.compact()
+        assert json.loads(path.read_text())["balance_sheet"]["AAPL"]
+        assert (tmp_path / "cache.json.journal").read_text() == ""
+        reopened.close()
+
+        assert (
+            len(PersistentCache(str(path), backend="json").get_balance_sheet("AAPL"))
+            == 2
+        )
+
+    def test_torn_journal_record_is_ignored(self, tmp_path):
+        """Test that a record cut off by a crash is skipped and overwritten."""
+        path = tmp_path / "cache.json"
+        cache = PersistentCache(str(path), backend="json", write_mode="immediate")
+        cache.set_exchange_rate("EUR", 1.08)
+        cache.close()
+        with open(tmp_path / "cache.json.journal", "a") as journal:
+            journal.write('{"op":"entry","section":"exchange_rate","key":"GBP"')
+
+        reopened = PersistentCache(str(path), backend="json", write_mode="immediate")
+        assert reopened.get_exchange_rate("GBP") is None
+        reopened.set_exchange_rate("JPY", 0.0067)
+        reopened.close()
+
+        final = PersistentCache(str(path), backend="json")
+        assert final.get_exchange_rate("EUR") == 1.08
+        assert final.get_exchange_rate("JPY") == 0.0067
+
+    def test_write_behind_flushes_after_operation_count(self, tmp_path):
+        """Test that reaching the operation budget triggers a flush."""
+        cache = PersistentCache(
+            str(tmp_path / "cache.db"),
+            backend="sqlite",
+            write_mode="write_behind",
+            flush_every_operations=2,
+        )
+        cache.set_exchange_rate("EUR", 1.08)
+        assert cache.dirty_sections == {"exchange_rate", "metadata"}
+
+        cache.set_exchange_rate("GBP", 1.27)
+
+        assert cache.dirty_sections == set()
+        assert cache.backend.load_section("exchange_rate") == {"EUR": 1.08, "GBP": 1.27}
+        cache.close()
+
+    def test_clear_cache_discards_pending_changes(self, tmp_path):
+        """Test that buffered changes of a cleared symbol are not written later."""
+        cache = PersistentCache(
+            str(tmp_path / "cache.db"), backend="sqlite", write_mode="write_behind"
+        )
+        cache.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple Inc"))
+        cache.clear_cache("AAPL")
+        cache.close()
+
+        reopened = PersistentCache(str(tmp_path / "cache.db"), backend="sqlite")
+        assert not reopened.has_cached_data("AAPL", "overview")
+
+    def test_failed_flush_keeps_changes_queued(self, tmp_path, balance_sheets):
+        """Test that buffered changes survive a backend error and are written later."""
+        path = str(tmp_path / "cache.db")
+        cache = PersistentCache(path, backend="sqlite", write_mode="write_behind")
+        cache.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple Inc"))
+        cache.set_balance_sheet("AAPL", balance_sheets)
+
+        with patch.object(
+            cache.backend, "upsert_reports", side_effect=sqlite3.OperationalError
+        ):
+            with pytest.raises(sqlite3.OperationalError):
+                cache.flush()
+
+        assert cache.dirty_sections == {"overview", "balance_sheet", "metadata"}
+        cache.close()
+
+        reopened = PersistentCache(path, backend="sqlite")
+        assert reopened.get_overview("AAPL").name == "Apple Inc"
+        assert len(reopened.get_balance_sheet("AAPL")) == 2
+
+    def test_failed_journal_append_keeps_changes_queued(self, tmp_path):
+        """Test that a journal write error reaches flush, which writes the changes later."""
+        path = str(tmp_path / "cache.json")
+        cache = PersistentCache(path, backend="json", write_mode="write_behind")
+        cache.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple Inc"))
+
+        with patch.object(cache.backend._journal, "append", side_effect=OSError):
+            with pytest.raises(OSError):
+                cache.flush()
+
+        assert cache.dirty_sections == {"overview", "metadata"}
+        assert cache.backend.get("overview", "AAPL") is None
+        cache.close()
+
+        reopened = PersistentCache(path, backend="json")
+        assert reopened.get_overview("AAPL").name == "Apple Inc"
+
+    def test_immediate_mode_persists_every_change(self, tmp_path):
+        """Test that immediate mode writes through without buffering."""
+        cache = PersistentCache(
+            str(tmp_path / "cache.db"), backend="sqlite", write_mode="immediate"
+        )
+        cache.set_exchange_rate("EUR", 1.08)
+
+        assert cache.dirty_sections == set()
+        assert cache.backend.load_section("exchange_rate") == {"EUR": 1.08}
+
+    def test_memory_tier_evicts_to_backend(self, cache_path, balance_sheets):
+        """Test that evicted entries are written back and hydrated again on access."""
+        backend, path = cache_path
+        cache = PersistentCache(
+            path, backend=backend, write_mode="write_behind", memory_max_entries=2
+        )
+        cache.set_balance_sheet("AAPL", balance_sheets)
+        cache.set_balance_sheet("MSFT", balance_sheets)
+
+        assert ("balance_sheet", "AAPL") not in cache._models
+        assert len(cache.backend.get("balance_sheet", "AAPL")) == 2
+        assert len(cache.get_balance_sheet("AAPL")) == 2
+
+        stats = cache.get_cache_info()["memory"]
+        assert stats["evictions"] >= 2
+        assert stats["entries"] <= 2
+        cache.close()
+
+    def test_memory_budget_warns_for_in_memory_backend(self, cache_path, capsys):
+        """Test that a budget on a backend holding all records in memory is flagged."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend, memory_max_entries=2)
+
+        warned = "memory budget only bounds parsed models" in capsys.readouterr().out
+        assert warned is (backend == "json")
+        cache.close()
+
+    def test_query_results_survive_reload_until_expired(self, cache_path):
+        """Test that query results are keyed by the normalized query and expire by TTL."""
+        backend, path = cache_path
+        results = [{"1. symbol": "AAPL", "2. name": "Apple Inc"}]
+        cache = PersistentCache(path, backend=backend)
+        cache.set_query_results("Apple, Inc.", results)
+        cache.close()
+
+        reopened = PersistentCache(path, backend=backend)
+        assert reopened.get_query_results("apple inc") == results
+        assert reopened.get_query_results("apple") is None
+
+        reopened.policy.ttls["symbol_query"] = timedelta(0)
+        assert reopened.get_query_results("apple inc") is None
+
+    def test_raw_quarters_are_parsed_on_demand(self, cache_path, balance_sheets):
+        """Test that quarterly reports kept raw are only validated once selected."""
+        backend, path = cache_path
+        quarterly = [
+            {"fiscalDateEnding": date, "reportedCurrency": "USD", "totalAssets": "1"}
+            for date in ("2023-12-31", "2023-06-30", "2024-03-31")
+        ]
+        cache = PersistentCache(path, backend=backend)
+        cache.set_balance_sheet("AAPL", balance_sheets)
+        cache.set_quarterly_payload("balance_sheet", "AAPL", quarterly)
+        cache.close()
+
+        reopened = PersistentCache(path, backend=backend)
+        annual = reopened.get_balance_sheet("AAPL", ANNUAL_ONLY)
+        assert [r.fiscal_date_ending for r in annual] == ["2023-09-30", "2022-09-30"]
+        assert ("quarterly_reports", "AAPL") not in reopened._models
+
+        last_two = reopened.get_balance_sheet("AAPL", PeriodSelection.last_quarters(2))
+        assert [(r.fiscal_date_ending, r.quarter_report) for r in last_two] == [
+            ("2023-09-30", False),
+            ("2022-09-30", False),
+            ("2024-03-31", True),
+            ("2023-12-31", True),
+        ]
+        assert set(
+            reopened._models.get(("quarterly_reports", "AAPL"))["balance_sheet"]
+        ) == {
+            "2024-03-31",
+            "2023-12-31",
+        }
+        assert len(reopened.get_balance_sheet("AAPL")) == 5
+
+    def test_new_quarterly_payload_replaces_parsed_quarters(self, cache_path):
+        """Test that a newer response is parsed again instead of serving old models."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend)
+        record = {"fiscalDateEnding": "2023-12-31", "reportedCurrency": "USD"}
+        cache.set_quarterly_payload(
+            "balance_sheet", "AAPL", [{**record, "totalAssets": "1"}]
+        )
+        assert cache.get_balance_sheet("AAPL")[0].total_assets == 1
+
+        cache.set_quarterly_payload(
+            "balance_sheet", "AAPL", [{**record, "totalAssets": "2"}]
+        )
+        assert cache.get_balance_sheet("AAPL")[0].total_assets == 2
+        assert cache.get_cash_flow("AAPL") is None
+
+        cache.clear_cache("AAPL")
+        assert cache.get_balance_sheet("AAPL") is None
+
+    def test_concurrent_statements_of_a_symbol_are_all_kept(self, cache_path):
+        """Test that statements stored from parallel threads keep every per-symbol entry."""
+        backend, path = cache_path
+        cache = PersistentCache(path, backend=backend, write_mode="immediate")
+        sections = {
+            "balance_sheet": BalanceSheetReport,
+            "income_statement": IncomeStatementReport,
+            "cash_flow": CashFlowReport,
+        }
+        payload_size = cache_module._payload_size
+
+        def slow_payload_size(records):
+            # Widen the window between reading and writing an entry
+            time.sleep(0.002)
+            return payload_size(records)
+
+        def store(symbol: str, section: str):
+            cache.set_quarterly_payload(
+                section,
+                symbol,
+                [{"fiscalDateEnding": "2023-12-31", "reportedCurrency": "USD"}],
+            )
+            getattr(cache, f"set_{section}")(
+                symbol,
+                [
+                    sections[section](
+                        fiscal_date_ending="2023-09-30",
+                        reported_currency="USD",
+                        annual_report=True,
+                    )
+                ],
+            )
+
+        symbols = [f"SYM{index}" for index in range(5)]
+        with patch.object(cache_module, "_payload_size", side_effect=slow_payload_size):
+            threads = [
+                threading.Thread(target=store, args=(symbol, section))
+                for symbol in symbols
+                for section in sections
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        cache.close()
+
+        reopened = PersistentCache(path, backend=backend)
+        quarters_only = PeriodSelection.last_quarters(4, annual=False)
+        for symbol in symbols:
+            for section in sections:
+                assert reopened.get_statement(section, symbol, quarters_only)
+                assert reopened.get_entry_metadata(section, symbol) is not None
+
+    def test_unknown_backend_raises(self, tmp_path):
+        """Test that an unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            PersistentCache(str(tmp_path / "cache.bin"), backend="parquet")
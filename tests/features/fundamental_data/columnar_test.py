@@ -0,0 +1,127 @@
+from unittest.mock import patch
+
+from features.fundamental_data import columnar
+from features.fundamental_data.columnar import ColumnarSnapshot, write_snapshot
+from features.fundamental_data.model import BalanceSheetReport
+from features.fundamental_data.storage import ColumnarBackend, JsonFileBackend
+
+
+def balance_sheets(periods: int) -> list[dict]:
+    """Quarterly raw balance sheet records with every other field missing."""
+    return [
+        BalanceSheetReport(
+            fiscal_date_ending=f"{2000 + period // 4}-{period % 4 * 3 + 3:02d}-30",
+            reported_currency="USD",
+            quarter_report=True,
+            total_assets=1000.0 + period,
+            total_liabilities=None if period % 2 else 500.0,
+        ).model_dump()
+        for period in range(periods)
+    ]
+
+
+class TestColumnarSnapshot:
+    """Test suite for the columnar snapshot format and backend."""
+
+    def test_roundtrip_keeps_nulls_strings_and_flags(self, tmp_path):
+        """Test that decoded records equal the written ones."""
+        path = tmp_path / "cache.avcs"
+        records = balance_sheets(9)
+        write_snapshot(
+            path, {"balance_sheet": {"AAPL": records}}, {"overview": {"AAPL": {}}}
+        )
+
+        snapshot = ColumnarSnapshot(path)
+        try:
+            assert snapshot.read_block("balance_sheet", "AAPL") == records
+            assert snapshot.read_block("balance_sheet", "MSFT") is None
+            assert snapshot.read_documents() == {"overview": {"AAPL": {}}}
+            assert snapshot.strings.count("USD") == 1
+        finally:
+            snapshot.close()
+
+    def test_unchanged_symbols_are_copied_without_encoding(self, tmp_path):
+        """Test that rewriting a snapshot only encodes changed symbols."""
+        backend = ColumnarBackend(tmp_path / "cache.avcs")
+        with backend.batch():
+            backend.upsert_reports("balance_sheet", "AAPL", balance_sheets(4))
+            backend.upsert_reports("balance_sheet", "MSFT", balance_sheets(4))
+        backend.compact()
+
+        with patch.object(
+            columnar, "encode_block", wraps=columnar.encode_block
+        ) as encode_block:
+            backend.upsert_reports("balance_sheet", "AAPL", balance_sheets(6))
+            backend.compact()
+
+        assert encode_block.call_count == 1
+        assert backend.count("balance_sheet") == 10
+        backend.close()
+
+        reopened = ColumnarBackend(tmp_path / "cache.avcs")
+        assert reopened.get("balance_sheet", "MSFT") == balance_sheets(4)[::-1]
+        assert len(reopened.get("balance_sheet", "AAPL")) == 6
+        reopened.close()
+
+    def test_snapshot_is_smaller_than_json(self, tmp_path):
+        """Test that statements take a fraction of the JSON document size."""
+        json_backend = JsonFileBackend(tmp_path / "cache.json")
+        columnar_backend = ColumnarBackend(tmp_path / "cache.avcs")
+        for backend in (json_backend, columnar_backend):
+            with backend.batch():
+                for index in range(20):
+                    backend.upsert_reports(
+                        "balance_sheet", f"S{index}", balance_sheets(40)
+                    )
+            backend.compact()
+
+        json_size = (tmp_path / "cache.json").stat().st_size
+        columnar_size = (tmp_path / "cache.avcs").stat().st_size
+        assert columnar_size * 5 < json_size
+        columnar_backend.close()
+
+    def test_raw_quarters_are_stored_as_columns(self, tmp_path):
+        """Test that raw quarterly reports are symbol blocks, not JSON documents."""
+        quarters = [
+            {
+                "fiscalDateEnding": f"2023-{month:02d}-30",
+                "reportedCurrency": "USD",
+                "totalAssets": str(1000 + month),
+                "goodwill": "None",
+            }
+            for month in (3, 6, 9)
+        ]
+        odd = [{"fiscalDateEnding": "2023-12-31", "totalAssets": {"nested": 1}}]
+        backend = ColumnarBackend(tmp_path / "cache.avcs")
+        with backend.batch():
+            backend.upsert_entry(
+                "quarterly_payload", "AAPL", {"balance_sheet": quarters}
+            )
+            backend.upsert_entry("quarterly_payload", "ODD", {"cash_flow": odd})
+        backend.compact()
+        backend.close()
+
+        snapshot = ColumnarSnapshot(tmp_path / "cache.avcs")
+        try:
+            assert snapshot.has("raw_quarters_balance_sheet", "AAPL")
+            # Values that do not fit a column stay a document
+            assert snapshot.read_documents()["quarterly_payload"] == {
+                "ODD": {"cash_flow": odd}
+            }
+        finally:
+            snapshot.close()
+
+        reopened = ColumnarBackend(tmp_path / "cache.avcs")
+        assert reopened.get("quarterly_payload", "AAPL") == {
+            "balance_sheet": [
+                {key: value for key, value in quarter.items() if value != "None"}
+                for quarter in quarters
+            ]
+        }
+        assert reopened.get("quarterly_payload", "ODD") == {"cash_flow": odd}
+        assert sorted(reopened.keys("quarterly_payload")) == ["AAPL", "ODD"]
+
+        reopened.delete("AAPL")
+        assert reopened.get("quarterly_payload", "AAPL") is None
+        assert reopened.count("quarterly_payload") == 1
+        reopened.close()
@@ -0,0 +1,71 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.file_lock import EXCLUSIVE, SHARED, FileLock
+from features.fundamental_data.model import StockMetaData
+
+BACKEND_SUFFIXES = {"json": "json", "sqlite": "db", "columnar": "avcs"}
+
+
+def write_overviews(backend: str, path: str, worker: int) -> int:
+    """Write overviews from a separate process through its own cache instance."""
+    cache = PersistentCache(path, backend=backend, write_mode="immediate")
+    for index in range(10):
+        symbol = f"W{worker}S{index}"
+        cache.set_overview(symbol, StockMetaData(symbol=symbol, name=symbol))
+    cache.close()
+    return worker
+
+
+class TestMultiProcessCache:
+    """Test suite for sharing one cache file between processes."""
+
+    @pytest.fixture(params=list(BACKEND_SUFFIXES))
+    def cache_path(self, request, tmp_path):
+        suffix = BACKEND_SUFFIXES[request.param]
+        return request.param, str(tmp_path / f"cache.{suffix}")
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="requires the fork start method",
+    )
+    def test_concurrent_writers_lose_no_entries(self, cache_path):
+        """Test that writers in several processes all end up in the file."""
+        backend, path = cache_path
+        with ProcessPoolExecutor(
+            max_workers=4, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            list(executor.map(write_overviews, [backend] * 4, [path] * 4, range(4)))
+
+        cache = PersistentCache(path, backend=backend)
+        assert len(cache.get_cached_symbols()) == 40
+        cache.close()
+
+    def test_reader_sees_changes_of_other_instance(self, cache_path):
+        """Test that hydrated entries are dropped after another writer changed the file."""
+        backend, path = cache_path
+        reader = PersistentCache(path, backend=backend, write_mode="immediate")
+        writer = PersistentCache(path, backend=backend, write_mode="immediate")
+        writer.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple"))
+        assert reader.get_overview("AAPL").name == "Apple"
+
+        writer.set_overview("AAPL", StockMetaData(symbol="AAPL", name="Apple Inc"))
+        writer.set_exchange_rate("EUR", 1.08)
+
+        assert reader.get_overview("AAPL").name == "Apple Inc"
+        assert reader.get_exchange_rate("EUR") == 1.08
+        reader.close()
+        writer.close()
+
+    def test_exclusive_section_upgrades_shared_lock(self, tmp_path):
+        """Test that nested lock sections upgrade and restore the lock mode."""
+        lock = FileLock(tmp_path / "cache.lock")
+        with lock.shared():
+            assert lock._mode == SHARED
+            with lock.exclusive():
+                assert lock._mode == EXCLUSIVE
+            assert lock._mode == SHARED
+        assert lock._mode is None
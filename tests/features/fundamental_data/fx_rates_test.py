@@ -0,0 +1,39 @@
+from features.fundamental_data.fx_rates import FxRates, parse_fx_monthly
+
+
+class TestFxRates:
+    """Test suite for dated FX rate lookups."""
+
+    def test_parse_fx_monthly(self):
+        """Test that month end closes are read from an FX_MONTHLY response."""
+        data = {
+            "Meta Data": {"2. From Symbol": "EUR"},
+            "Time Series FX (Monthly)": {
+                "2023-12-29": {"1. open": "1.1", "4. close": "1.1039"},
+                "2023-11-30": {"1. open": "1.05", "4. close": "1.0886"},
+            },
+        }
+
+        assert parse_fx_monthly(data) == {"2023-12-29": 1.1039, "2023-11-30": 1.0886}
+        assert parse_fx_monthly({"Note": "rate limited"}) == {}
+
+    def test_nearest_date_lookup(self):
+        """Test that the closest month end is used, also outside the history."""
+        fx_rates = FxRates(
+            {"EUR": {"2023-12-29": 1.10, "2023-09-29": 1.06, "2023-06-30": 1.09}}
+        )
+
+        assert fx_rates.to_usd("EUR", "2023-09-30") == 1.06
+        assert fx_rates.to_usd("EUR", "2023-11-30") == 1.10
+        assert fx_rates.to_usd("EUR", "2020-01-31") == 1.09
+        assert fx_rates.to_usd("EUR", "2025-01-31") == 1.10
+        assert fx_rates.to_usd("USD", "2023-09-30") == 1.0
+        assert fx_rates.to_usd("JPY", "2023-09-30") is None
+
+    def test_cross_rates_are_triangulated_through_usd(self):
+        """Test that a pair without its own history is derived from both USD rates."""
+        fx_rates = FxRates({"EUR": {"2023-12-29": 1.10}, "GBP": {"2023-12-29": 1.27}})
+
+        assert fx_rates.rate("EUR", "GBP", "2023-12-31") == 1.10 / 1.27
+        assert fx_rates.rate("USD", "EUR", "2023-12-31") == 1 / 1.10
+        assert fx_rates.rate("EUR", "JPY", "2023-12-31") is None
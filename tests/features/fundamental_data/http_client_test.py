@@ -0,0 +1,144 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from features.fundamental_data import http_client
+from features.fundamental_data.http_client import (
+    AlphaVantageClient,
+    AlphaVantageError,
+    ThrottledError,
+)
+
+
+class TestAlphaVantageClient:
+    """Test suite for the pooled Alpha Vantage HTTP session."""
+
+    @pytest.fixture
+    def client(self):
+        client = AlphaVantageClient(
+            api_key="demo",
+            connect_timeout=2,
+            read_timeout=10,
+            max_retries=2,
+            backoff_seconds=0.5,
+        )
+        yield client
+        client.close()
+
+    @staticmethod
+    def response(status_code: int) -> MagicMock:
+        response = MagicMock()
+        response.status_code = status_code
+        return response
+
+    def test_request_uses_timeouts_and_query(self, client):
+        """Test that the query is encoded and both timeouts are passed."""
+        with patch.object(
+            client.session, "get", return_value=self.response(200)
+        ) as get:
+            client.get("SYMBOL_SEARCH", keywords="Bank of America")
+
+        url = get.call_args[0][0]
+        assert url.startswith(
+            "https://www.alphavantage.co/query?function=SYMBOL_SEARCH"
+        )
+        assert "keywords=Bank+of+America" in url
+        assert url.endswith("apikey=demo")
+        assert get.call_args[1]["timeout"] == (2, 10)
+
+    def test_server_errors_are_retried_with_backoff(self, client):
+        """Test that 5xx responses are retried until a response succeeds."""
+        responses = [self.response(503), self.response(502), self.response(200)]
+        with (
+            patch.object(client.session, "get", side_effect=responses),
+            patch.object(http_client.time, "sleep") as sleep,
+        ):
+            response = client.get("OVERVIEW", symbol="AAPL")
+
+        assert response.status_code == 200
+        assert sleep.call_count == 2
+        assert 0 <= sleep.call_args_list[1][0][0] <= 1.0
+        assert client.stats()["requests"] == 3
+        assert client.stats()["retries"] == 2
+
+    def test_retries_are_bounded(self, client):
+        """Test that the last error is surfaced once the retries are used up."""
+        with (
+            patch.object(
+                client.session, "get", side_effect=requests.ConnectionError("reset")
+            ) as get,
+            patch.object(http_client.time, "sleep"),
+        ):
+            with pytest.raises(requests.ConnectionError):
+                client.get("OVERVIEW", symbol="AAPL")
+
+        assert get.call_count == 3
+        assert client.stats()["failures"] == 3
+
+    def test_client_errors_are_not_retried(self, client):
+        """Test that a 4xx response is returned without another attempt."""
+        with patch.object(
+            client.session, "get", return_value=self.response(404)
+        ) as get:
+            response = client.get("OVERVIEW", symbol="AAPL")
+
+        assert response.status_code == 404
+        assert get.call_count == 1
+        assert client.stats()["last_latency_seconds"] is not None
+
+    def test_throttle_payload_is_retried(self, client):
+        """Test that a rate limit message is retried and the data returned."""
+        throttled, ok = self.response(200), self.response(200)
+        throttled.json.return_value = {"Note": "Thank you for using Alpha Vantage!"}
+        ok.json.return_value = {"Symbol": "AAPL"}
+        with (
+            patch.object(client.session, "get", side_effect=[throttled, ok]),
+            patch.object(http_client.time, "sleep") as sleep,
+        ):
+            data = client.get_json("OVERVIEW", symbol="AAPL")
+
+        assert data == {"Symbol": "AAPL"}
+        assert sleep.call_count == 1
+        assert client.stats()["throttled"] == 1
+
+    def test_persistent_throttle_enters_cooldown(self, client):
+        """Test that a request still throttled after the retries is not sent again."""
+        throttled = self.response(200)
+        throttled.json.return_value = {"Information": "rate limit"}
+        with (
+            patch.object(client.session, "get", return_value=throttled) as get,
+            patch.object(http_client.time, "sleep"),
+        ):
+            with pytest.raises(ThrottledError):
+                client.get_json("OVERVIEW", symbol="AAPL")
+            with pytest.raises(ThrottledError):
+                client.get_json("OVERVIEW", symbol="AAPL")
+
+        assert get.call_count == 3
+
+    def test_error_payload_is_not_retried(self, client):
+        """Test that an error message raises without another attempt."""
+        error = self.response(200)
+        error.json.return_value = {"Error Message": "Invalid API call."}
+        with patch.object(client.session, "get", return_value=error) as get:
+            with pytest.raises(AlphaVantageError, match="Invalid API call"):
+                client.get_json("OVERVIEW", symbol="NOPE")
+
+        assert get.call_count == 1
+
+    def test_data_responses_are_archived(self, client):
+        """Test that only data payloads reach the response archive."""
+        client.archive = MagicMock()
+        throttled, ok = self.response(200), self.response(200)
+        throttled.json.return_value = {"Note": "Thank you for using Alpha Vantage!"}
+        ok.json.return_value = {"Symbol": "AAPL"}
+        with (
+            patch.object(client.session, "get", side_effect=[throttled, ok]),
+            patch.object(http_client.time, "sleep"),
+        ):
+            client.get_json("OVERVIEW", symbol="AAPL")
+
+        client.archive.store.assert_called_once_with(
+            "OVERVIEW", {"symbol": "AAPL"}, {"Symbol": "AAPL"}
+        )
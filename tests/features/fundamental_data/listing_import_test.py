@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.listing_import import (
+    import_listing_status,
+    parse_listing_status,
+)
+
+LISTING_CSV = """symbol,name,exchange,assetType,ipoDate,delistingDate,status
+A,Agilent Technologies Inc,NYSE,Stock,1999-11-18,null,Active
+AAPL,Apple Inc,NASDAQ,Stock,1980-12-12,null,Active
+OLD,Old Company Inc,NYSE,Stock,1990-01-01,2020-01-01,Delisted
+"""
+
+
+class TestListingImport:
+    """Test suite for the LISTING_STATUS importer."""
+
+    def test_parse_maps_to_symbol_search_results(self):
+        """Test that CSV rows become SYMBOL_SEARCH style results of active listings."""
+        results = parse_listing_status(LISTING_CSV.splitlines())
+
+        assert [result["1. symbol"] for result in results] == ["A", "AAPL"]
+        assert results[1]["2. name"] == "Apple Inc"
+        assert results[1]["3. type"] == "Stock"
+        # Not part of the listing
+        assert results[1]["7. timezone"] == ""
+        assert results[1]["8. currency"] == ""
+
+    def test_parse_includes_delisted_on_request(self):
+        """Test that delisted rows are kept when requested."""
+        results = parse_listing_status(LISTING_CSV.splitlines(), include_delisted=True)
+
+        assert len(results) == 3
+
+    def test_import_populates_cache_in_one_batch(self, tmp_path):
+        """Test that the import writes all listings in one batch and makes them searchable."""
+        csv_path = tmp_path / "listing_status.csv"
+        csv_path.write_text(LISTING_CSV)
+        cache_path = str(tmp_path / "cache.db")
+        cache = PersistentCache(cache_path, backend="sqlite")
+
+        with patch.object(cache.backend, "batch", wraps=cache.backend.batch) as batch:
+            assert import_listing_status(csv_path, cache) == 2
+        batch.assert_called_once()
+        cache.close()
+
+        reopened = PersistentCache(cache_path, backend="sqlite")
+        assert reopened.search_symbols("apple")[0]["1. symbol"] == "AAPL"
+        assert reopened.search_symbols("Old Company") is None
+
+    def test_import_keeps_cached_search_results(self, tmp_path):
+        """Test that listings do not overwrite complete SYMBOL_SEARCH results."""
+        csv_path = tmp_path / "listing_status.csv"
+        csv_path.write_text(LISTING_CSV)
+        cache = PersistentCache(str(tmp_path / "cache.db"), backend="sqlite")
+        search_result = {
+            "1. symbol": "AAPL",
+            "2. name": "Apple Inc",
+            "4. region": "United States",
+            "7. timezone": "UTC-04",
+            "8. currency": "USD",
+        }
+        cache.add_symbol_results([search_result])
+
+        assert import_listing_status(csv_path, cache) == 1
+        cache.close()
+
+        reopened = PersistentCache(str(tmp_path / "cache.db"), backend="sqlite")
+        assert reopened.search_symbols("AAPL")[0] == search_result
+        assert reopened.search_symbols("agilent")[0]["8. currency"] == ""
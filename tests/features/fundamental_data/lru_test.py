@@ -0,0 +1,47 @@
+from features.fundamental_data.lru import LRUCache
+
+
+class TestLRUCache:
+    """Test suite for the memory-bounded LRU map."""
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test that reading an entry protects it from the next eviction."""
+        evicted = []
+        lru = LRUCache(max_entries=2, on_evict=lambda key, value: evicted.append(key))
+        lru.put("a", 1)
+        lru.put("b", 2)
+        lru.get("a")
+        lru.put("c", 3)
+
+        assert evicted == ["b"]
+        assert lru.keys() == ["a", "c"]
+
+    def test_byte_budget(self):
+        """Test that entries are evicted until their total size fits the byte budget."""
+        lru = LRUCache(max_bytes=100)
+        lru.put("a", 1, size=60)
+        lru.put("b", 2, size=30)
+        lru.put("c", 3, size=50)
+
+        assert lru.keys() == ["b", "c"]
+        assert lru.stats()["bytes"] == 80
+
+    def test_oversized_entry_is_kept(self):
+        """Test that a single entry larger than the budget is still cached."""
+        lru = LRUCache(max_bytes=10)
+        lru.put("a", 1, size=50)
+
+        assert lru.get("a") == 1
+
+    def test_counters(self):
+        """Test hit, miss and eviction counters."""
+        lru = LRUCache(max_entries=1)
+        lru.put("a", 1)
+        lru.get("a")
+        lru.get("b")
+        lru.put("b", 2)
+        lru.pop("b")
+
+        stats = lru.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+        assert stats["entries"] == 0
@@ -0,0 +1,109 @@
+import pytest
+
+from features.fundamental_data.metrics import calculate_metrics
+from features.fundamental_data.model import (
+    BalanceSheetReport,
+    CashFlowReport,
+    IncomeStatementReport,
+    StockMetaData,
+)
+
+
+class TestCalculateMetrics:
+    """Test suite for the precomputed ratio store."""
+
+    @pytest.fixture
+    def overview(self):
+        return StockMetaData(
+            symbol="AAPL", name="Apple Inc", market_capitalization=6000
+        )
+
+    @pytest.fixture
+    def statements(self):
+        """Annual and quarterly statements, with one quarter ending on the fiscal year end."""
+        income_statement = [
+            IncomeStatementReport(
+                fiscal_date_ending=date,
+                reported_currency="USD",
+                annual_report=annual,
+                total_revenue=1000,
+                gross_profit=400,
+                operating_income=250,
+                net_income=200,
+                ebit=260,
+                ebitda=300,
+                interest_expense=13,
+            )
+            for date, annual in [
+                ("2023-09-30", True),
+                ("2022-09-30", True),
+                ("2023-09-30", False),
+                ("2023-06-30", False),
+            ]
+        ]
+        balance_sheet = [
+            BalanceSheetReport(
+                fiscal_date_ending=report.fiscal_date_ending,
+                reported_currency="USD",
+                annual_report=report.annual_report,
+                total_assets=4000,
+                total_current_assets=1500,
+                inventory=300,
+                total_current_liabilities=1000,
+                total_shareholder_equity=800,
+                short_long_term_debt_total=1200,
+                cash_and_cash_equivalents_at_carrying_value=200,
+            )
+            for report in income_statement
+        ]
+        cash_flow = [
+            CashFlowReport(
+                fiscal_date_ending=report.fiscal_date_ending,
+                reported_currency="USD",
+                annual_report=report.annual_report,
+                operating_cashflow=350,
+                capital_expenditures=50,
+            )
+            for report in income_statement
+        ]
+        return income_statement, balance_sheet, cash_flow
+
+    def test_ratios_per_period(self, overview, statements):
+        """Test that each fiscal date gets one set of ratios, annual first."""
+        metrics = calculate_metrics(overview, *statements)
+
+        assert [(m.fiscal_date_ending, m.quarter) for m in metrics] == [
+            ("2023-09-30", None),
+            ("2022-09-30", None),
+            ("2023-06-30", 2),
+        ]
+        latest = metrics[0]
+        assert latest.year == 2023
+        assert latest.roe == 0.25
+        assert latest.roa == 0.05
+        assert latest.current_ratio == 1.5
+        assert latest.quick_ratio == 1.2
+        assert latest.interest_coverage == 20
+        assert latest.gross_margin == 0.4
+        assert latest.net_margin == 0.2
+
+    def test_market_ratios_only_for_latest_annual_period(self, overview, statements):
+        """Test that the current market capitalization is not applied to older periods."""
+        metrics = calculate_metrics(overview, *statements)
+
+        assert metrics[0].pe_ratio == 30
+        assert metrics[0].fcf_yield == 0.05
+        assert metrics[0].ebitda_multiple == 7000 / 300
+        assert all(m.pe_ratio is None for m in metrics[1:])
+
+    def test_missing_values_and_statements(self, statements):
+        """Test that missing inputs and unmatched periods yield no ratios."""
+        income_statement, balance_sheet, cash_flow = statements
+        balance_sheet[0].total_shareholder_equity = 0
+
+        metrics = calculate_metrics(
+            None, income_statement, balance_sheet, cash_flow[1:]
+        )
+
+        assert "2023-09-30" not in [m.fiscal_date_ending for m in metrics]
+        assert all(m.pe_ratio is None for m in metrics)
@@ -0,0 +1,63 @@
+from features.fundamental_data.model import BalanceSheetReport
+from features.fundamental_data.periods import (
+    ALL_PERIODS,
+    ANNUAL_ONLY,
+    PeriodSelection,
+)
+
+
+def report(date: str, annual: bool) -> BalanceSheetReport:
+    return BalanceSheetReport(
+        fiscal_date_ending=date,
+        reported_currency="USD",
+        annual_report=annual,
+        quarter_report=not annual,
+    )
+
+
+class TestPeriodSelection:
+    """Test suite for selecting the annual and quarterly reports of a statement."""
+
+    REPORTS = [
+        report("2023-06-30", annual=False),
+        report("2023-09-30", annual=True),
+        report("2023-12-31", annual=False),
+        report("2022-09-30", annual=True),
+        report("2023-09-30", annual=False),
+    ]
+
+    def test_annual_only_drops_quarters(self):
+        """Test that annual only keeps the annual reports in their order."""
+        selected = ANNUAL_ONLY.apply(self.REPORTS)
+
+        assert [r.fiscal_date_ending for r in selected] == ["2023-09-30", "2022-09-30"]
+        assert not ANNUAL_ONLY.includes_quarters
+        assert ANNUAL_ONLY.quarter_dates(["2023-12-31"]) == set()
+
+    def test_last_quarters_keeps_the_newest(self):
+        """Test that the last N quarters follow the annual reports, newest first."""
+        selected = PeriodSelection.last_quarters(2).apply(self.REPORTS)
+
+        assert [(r.fiscal_date_ending, r.annual_report) for r in selected] == [
+            ("2023-09-30", True),
+            ("2022-09-30", True),
+            ("2023-12-31", False),
+            ("2023-09-30", False),
+        ]
+
+    def test_quarters_without_annual(self):
+        """Test that annual reports can be left out of a quarterly selection."""
+        selection = PeriodSelection.last_quarters(1, annual=False)
+
+        assert [r.fiscal_date_ending for r in selection.apply(self.REPORTS)] == [
+            "2023-12-31"
+        ]
+
+    def test_everything_keeps_all_reports(self):
+        """Test that the default selection returns every report."""
+        assert len(ALL_PERIODS.apply(self.REPORTS)) == len(self.REPORTS)
+        assert ALL_PERIODS == PeriodSelection()
+        assert ALL_PERIODS.quarter_dates(["2023-06-30", "2023-12-31"]) == {
+            "2023-06-30",
+            "2023-12-31",
+        }
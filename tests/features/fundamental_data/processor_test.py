@@ -0,0 +1,37 @@
+import pytest
+
+from features.fundamental_data.fx_rates import FxRates
+from features.fundamental_data.model import ProcessedFundamentalData
+from features.fundamental_data.processor import convert_time_series_to_usd
+
+
+class TestConvertTimeSeriesToUsd:
+    """Test suite for converting each period at the rate of its own date."""
+
+    def test_periods_use_dated_rates(self):
+        """Test that periods are converted with the rate nearest to their fiscal date."""
+        series = [
+            ProcessedFundamentalData(
+                fiscal_date_ending=day, reported_currency="EUR", revenue=100.0
+            )
+            for day in ("2023-12-31", "2022-12-31")
+        ]
+        fx_rates = FxRates({"EUR": {"2023-12-29": 1.10, "2022-12-30": 1.07}})
+
+        converted = convert_time_series_to_usd(series, fx_rates)
+
+        assert [period.revenue for period in converted] == pytest.approx([110.0, 107.0])
+        assert {period.reported_currency for period in converted} == {"USD"}
+        assert converted[0].net_income is None
+
+    def test_fallback_rate_without_history(self):
+        """Test that the spot rate is used for currencies without history."""
+        series = [
+            ProcessedFundamentalData(
+                fiscal_date_ending="2023-12-31", reported_currency="JPY", revenue=100.0
+            )
+        ]
+
+        converted = convert_time_series_to_usd(series, FxRates(), {"JPY": 0.5})
+
+        assert converted[0].revenue == 50.0
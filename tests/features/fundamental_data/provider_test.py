@@ -0,0 +1,265 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from features.fundamental_data.alphavantage_adapter import AlphaVantageAPI, DataResult
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.model import (
+    BalanceSheetReport,
+    CashFlowReport,
+    IncomeStatementReport,
+    StockMetaData,
+)
+from features.fundamental_data.periods import ANNUAL_ONLY, PeriodSelection
+from features.fundamental_data.provider import (
+    AlphaVantageProvider,
+    LocalFileProvider,
+    create_provider,
+)
+
+OVERVIEW = {
+    "Symbol": "AAPL",
+    "Name": "Apple Inc",
+    "Currency": "USD",
+    "LatestQuarter": "2023-12-31",
+}
+
+
+class TestLocalFileProvider:
+    """Test suite for reading fundamental data from local files."""
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        """A directory with one symbol in every supported statement format."""
+        symbol_dir = tmp_path / "AAPL"
+        symbol_dir.mkdir()
+        (symbol_dir / "overview.json").write_text(json.dumps(OVERVIEW))
+        (symbol_dir / "quote.json").write_text(
+            json.dumps({"Global Quote": {"01. symbol": "AAPL", "05. price": "190.00"}})
+        )
+        (symbol_dir / "balance_sheet.json").write_text(
+            json.dumps(
+                {
+                    "symbol": "AAPL",
+                    "annualReports": [
+                        {
+                            "fiscalDateEnding": "2023-09-30",
+                            "reportedCurrency": "USD",
+                            "totalAssets": "352583000000",
+                        }
+                    ],
+                    "quarterlyReports": [
+                        {
+                            "fiscalDateEnding": date,
+                            "reportedCurrency": "USD",
+                            "totalAssets": "350000000000",
+                        }
+                        for date in ("2023-12-31", "2023-09-30", "2023-06-30")
+                    ],
+                }
+            )
+        )
+        (symbol_dir / "income_statement.jsonl").write_text(
+            "\n".join(
+                json.dumps(record)
+                for record in [
+                    {
+                        "period": "annual",
+                        "fiscalDateEnding": "2023-09-30",
+                        "reportedCurrency": "USD",
+                        "totalRevenue": "383285000000",
+                        "netIncome": "96995000000",
+                    },
+                    {
+                        "period": "quarterly",
+                        "fiscalDateEnding": "2023-12-31",
+                        "reportedCurrency": "USD",
+                        "totalRevenue": "119575000000",
+                    },
+                ]
+            )
+            + "\n"
+        )
+        (symbol_dir / "cash_flow.csv").write_text(
+            "fiscalDateEnding,reportedCurrency,operatingCashflow,annual_report,quarter_report\n"
+            "2023-09-30,USD,110543000000,true,false\n"
+            "2023-12-31,USD,39895000000,false,true\n"
+        )
+        msft_dir = tmp_path / "MSFT"
+        msft_dir.mkdir()
+        (msft_dir / "overview.json").write_text(
+            json.dumps({"Symbol": "MSFT", "Name": "Microsoft Corporation"})
+        )
+        fx_dir = tmp_path / "fx"
+        fx_dir.mkdir()
+        (fx_dir / "EUR.json").write_text(
+            json.dumps(
+                {
+                    "Time Series FX (Monthly)": {
+                        "2023-12-29": {"4. close": "1.1039"},
+                        "2023-11-30": {"4. close": "1.0888"},
+                    }
+                }
+            )
+        )
+        return tmp_path
+
+    def test_reads_every_statement_format(self, data_dir):
+        """Test that JSON, JSON Lines and CSV statements are parsed into reports."""
+        provider = LocalFileProvider(data_dir)
+
+        balance_sheet = provider.get_balance_sheet("AAPL")
+        income_statement = provider.get_income_statement("AAPL")
+        cash_flow = provider.get_cash_flow("AAPL")
+
+        assert balance_sheet.source == "local"
+        assert not balance_sheet.from_cache
+        assert [
+            (r.fiscal_date_ending, r.annual_report) for r in balance_sheet.data
+        ] == [
+            ("2023-09-30", True),
+            ("2023-12-31", False),
+            ("2023-09-30", False),
+            ("2023-06-30", False),
+        ]
+        assert balance_sheet.data[0].total_assets == 352583000000
+        assert [r.quarter_report for r in income_statement.data] == [False, True]
+        assert income_statement.data[0].total_revenue == 383285000000
+        assert isinstance(cash_flow.data[1], CashFlowReport)
+        assert cash_flow.data[1].quarter_report
+        assert cash_flow.data[0].operating_cashflow == 110543000000
+
+    def test_parses_only_selected_periods(self, data_dir):
+        """Test that a period selection limits the reports that are built."""
+        provider = LocalFileProvider(data_dir)
+
+        annual = provider.get_balance_sheet("AAPL", ANNUAL_ONLY)
+        last_quarter = provider.get_balance_sheet(
+            "AAPL", PeriodSelection.last_quarters(1, annual=False)
+        )
+
+        assert [r.fiscal_date_ending for r in annual.data] == ["2023-09-30"]
+        assert [r.fiscal_date_ending for r in last_quarter.data] == ["2023-12-31"]
+
+    def test_missing_symbol_has_no_data(self, data_dir):
+        """Test that unknown symbols return empty results instead of raising."""
+        provider = LocalFileProvider(data_dir)
+
+        assert provider.get_ticker_overview("NVDA").data is None
+        assert provider.get_cash_flow("NVDA").data == []
+        assert provider.get_stock_quote("NVDA") == {}
+
+    def test_search_overview_and_quote(self, data_dir):
+        """Test symbol search over the overview names and the stored quote."""
+        provider = LocalFileProvider(data_dir)
+
+        matches = provider.get_ticker_symbol("microsoft").data
+
+        assert provider.symbols() == ["AAPL", "MSFT"]
+        assert [match["1. symbol"] for match in matches] == ["MSFT"]
+        assert provider.get_ticker_overview("AAPL").data.name == "Apple Inc"
+        assert provider.get_stock_quote("AAPL")["Global Quote"]["05. price"] == "190.00"
+
+    def test_fx_rates_from_monthly_history(self, data_dir):
+        """Test that FX rates come from the stored FX_MONTHLY histories."""
+        provider = LocalFileProvider(data_dir)
+
+        fx_rates = provider.get_fx_rates({"EUR", "USD", "JPY"})
+
+        assert "EUR" in fx_rates
+        assert "JPY" not in fx_rates
+        assert provider.get_currency_ratio("EUR") == 1.1039
+        assert provider.get_currency_ratio("USD") == 1.0
+        assert provider.get_currency_ratio("JPY") is None
+
+    def test_comprehensive_data_calculates_metrics(self, data_dir):
+        """Test that comprehensive data includes metrics once all statements exist."""
+        provider = LocalFileProvider(data_dir)
+        results = []
+
+        data = provider.get_comprehensive_data("AAPL", ANNUAL_ONLY)
+        provider.get_ticker_data(
+            "AAPL", on_result=lambda data_type, _: results.append(data_type)
+        )
+
+        assert data.overview.symbol == "AAPL"
+        assert len(data.balance_sheet) == 1
+        assert data.calculated_metrics
+        assert results == ["overview", "balance_sheet", "income_statement", "cash_flow"]
+
+    def test_reads_columnar_snapshot(self, tmp_path):
+        """Test that a compacted columnar cache snapshot serves as a data source."""
+        snapshot_path = tmp_path / "fundamentals.avcs"
+        test_cache = PersistentCache(
+            str(snapshot_path), backend="columnar", write_mode="immediate"
+        )
+        test_cache.set_overview("AAPL", StockMetaData(**OVERVIEW))
+        test_cache.set_quarterly_payload(
+            "balance_sheet",
+            "AAPL",
+            [{"fiscalDateEnding": "2023-12-31", "reportedCurrency": "USD"}],
+        )
+        test_cache.set_balance_sheet(
+            "AAPL",
+            [
+                BalanceSheetReport(
+                    fiscal_date_ending="2023-09-30",
+                    reported_currency="USD",
+                    total_assets=352583000000,
+                    annual_report=True,
+                )
+            ],
+        )
+        test_cache.set_income_statement(
+            "AAPL",
+            [
+                IncomeStatementReport(
+                    fiscal_date_ending="2023-09-30",
+                    reported_currency="USD",
+                    annual_report=True,
+                )
+            ],
+        )
+        test_cache.compact()
+        test_cache.close()
+
+        provider = LocalFileProvider(snapshot_path)
+        balance_sheet = provider.get_balance_sheet("AAPL").data
+
+        assert provider.symbols() == ["AAPL"]
+        assert provider.get_ticker_overview("AAPL").data.name == "Apple Inc"
+        assert [(r.fiscal_date_ending, r.quarter_report) for r in balance_sheet] == [
+            ("2023-09-30", False),
+            ("2023-12-31", True),
+        ]
+        assert balance_sheet[0].total_assets == 352583000000
+        assert provider.get_cash_flow("AAPL").data == []
+        assert [m["1. symbol"] for m in provider.get_ticker_symbol("apple").data] == [
+            "AAPL"
+        ]
+
+
+class TestCreateProvider:
+    """Test suite for selecting the data provider."""
+
+    def test_alphavantage_delegates_to_api(self):
+        """Test that the Alpha Vantage provider uses the cached API adapter."""
+        result = DataResult([], from_cache=True)
+        with patch.object(
+            AlphaVantageAPI, "get_cash_flow", return_value=result
+        ) as get_cash_flow:
+            provider = create_provider("alphavantage")
+
+            assert isinstance(provider, AlphaVantageProvider)
+            assert provider.get_cash_flow("AAPL", ANNUAL_ONLY) is result
+            get_cash_flow.assert_called_once_with("AAPL", ANNUAL_ONLY)
+
+    def test_local_provider_is_lazy(self, tmp_path):
+        """Test that the local provider can be created before its data exists."""
+        assert isinstance(create_provider("local"), LocalFileProvider)
+
+    def test_unknown_provider_raises(self):
+        """Test that an unknown provider name is rejected."""
+        with pytest.raises(ValueError, match="Unknown data provider"):
+            create_provider("yahoo")
@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from features.fundamental_data import rate_limiter
+from features.fundamental_data.rate_limiter import (
+    DailyQuota,
+    RateLimiter,
+    SlidingWindow,
+)
+
+# 2024-06-01 18:00 UTC, six hours before the daily quota resets
+NOW = datetime(2024, 6, 1, 18, 0, tzinfo=timezone.utc).timestamp()
+
+
+class TestSlidingWindow:
+    """Test suite for the sliding window log."""
+
+    def test_requests_beyond_capacity_wait_for_the_window(self):
+        """Test that no more than `capacity` requests fall into any period."""
+        window = SlidingWindow(capacity=2, period=60)
+        slots = []
+        for _ in range(5):
+            slot = window.next_slot(NOW)
+            window.reserve(slot)
+            slots.append(slot - NOW)
+
+        assert slots == [0, 0, 60, 60, 120]
+
+    def test_idle_time_frees_the_window(self):
+        """Test that requests older than the period no longer limit new ones."""
+        window = SlidingWindow(capacity=5, period=60)
+        for _ in range(5):
+            window.reserve(NOW)
+
+        assert window.next_slot(NOW + 30) == NOW + 60
+        assert window.next_slot(NOW + 61) == NOW + 61
+
+
+class TestDailyQuota:
+    """Test suite for the fixed daily window."""
+
+    def test_quota_resets_at_midnight_only(self):
+        """Test that used up quota is not refilled before the next day."""
+        quota = DailyQuota(capacity=25, timezone="UTC")
+        for _ in range(25):
+            assert quota.next_slot(NOW) == NOW
+            quota.reserve(NOW)
+
+        midnight = datetime(2024, 6, 2, tzinfo=timezone.utc).timestamp()
+        assert quota.next_slot(NOW) == midnight
+        assert quota.next_slot(midnight - 1) == midnight
+        assert quota.next_slot(midnight) == midnight
+
+    def test_no_more_than_capacity_per_day(self):
+        """Test that steady demand over two days never exceeds the daily capacity."""
+        quota = DailyQuota(capacity=25, timezone="UTC")
+        sent = []
+        for minute in range(2 * 24 * 60):
+            at = NOW + minute * 60
+            if quota.next_slot(at) == at:
+                quota.reserve(at)
+                sent.append(at)
+
+        days = [datetime.fromtimestamp(at, timezone.utc).date() for at in sent]
+        assert max(days.count(day) for day in set(days)) == 25
+        assert len(sent) == 3 * 25
+
+
+class TestRateLimiter:
+    """Test suite for the per-minute and per-day quota."""
+
+    @pytest.fixture
+    def sleep(self):
+        with (
+            patch.object(rate_limiter.time, "sleep") as sleep,
+            patch.object(rate_limiter.time, "time", return_value=NOW),
+        ):
+            yield sleep
+
+    def test_acquire_waits_for_the_tightest_limit(self, sleep):
+        """Test that the wait of the slowest limit is applied and reported."""
+        limiter = RateLimiter(
+            requests_per_minute=5, requests_per_day=25, state_file=None
+        )
+        for _ in range(5):
+            assert limiter.acquire() == 0
+
+        assert limiter.expected_wait() == 60
+        assert limiter.acquire() == 60
+        sleep.assert_called_once_with(60)
+        assert limiter.total_wait_seconds == 60
+
+    def test_daily_limit_waits_for_the_next_day(self, sleep):
+        """Test that requests beyond the daily quota are not spread over the day."""
+        limiter = RateLimiter(
+            requests_per_minute=5, requests_per_day=6, state_file=None
+        )
+        waits = [limiter.acquire() for _ in range(8)]
+
+        # The sixth request waits for the minute window, the seventh for midnight;
+        # the eighth is the second of the new day
+        assert waits[:6] == [0, 0, 0, 0, 0, 60]
+        assert waits[6:] == [6 * 60 * 60, 6 * 60 * 60]
+
+    def test_daily_count_survives_restart(self, tmp_path, sleep):
+        """Test that the persisted state keeps the daily quota of a new limiter."""
+        state_file = tmp_path / "rate_limit.json"
+        limiter = RateLimiter(
+            requests_per_minute=0, requests_per_day=2, state_file=state_file
+        )
+        limiter.acquire()
+        limiter.acquire()
+
+        restarted = RateLimiter(
+            requests_per_minute=0, requests_per_day=2, state_file=state_file
+        )
+
+        assert restarted.expected_wait() == 6 * 60 * 60
+        sleep.assert_not_called()
+
+    def test_outdated_state_is_ignored(self, tmp_path, sleep):
+        """Test that a state file in an older format does not break the limiter."""
+        state_file = tmp_path / "rate_limit.json"
+        state_file.write_text('{"day": {"tokens": 0, "updated": 0}}')
+        limiter = RateLimiter(
+            requests_per_minute=0, requests_per_day=2, state_file=state_file
+        )
+
+        assert limiter.acquire() == 0
+
+    def test_disabled_limits_never_wait(self, sleep):
+        """Test that a limiter without limits sends right away."""
+        limiter = RateLimiter(
+            requests_per_minute=0, requests_per_day=0, state_file=None
+        )
+
+        assert [limiter.acquire() for _ in range(10)] == [0] * 10
+        sleep.assert_not_called()
@@ -0,0 +1,225 @@
+from unittest.mock import patch
+
+import pytest
+
+from features.fundamental_data.alphavantage_adapter import (
+    AlphaVantageAPI,
+    DataResult,
+    ThrottledResult,
+)
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.model import (
+    BalanceSheetReport,
+    CashFlowReport,
+    IncomeStatementReport,
+    StockMetaData,
+)
+from features.fundamental_data.refresh_planner import (
+    plan_refresh,
+    refresh_ticker,
+    refresh_universe,
+)
+
+STATEMENT_MODELS = {
+    "balance_sheet": BalanceSheetReport,
+    "income_statement": IncomeStatementReport,
+    "cash_flow": CashFlowReport,
+}
+
+
+class TestRefreshPlanner:
+    """Test suite for refreshing only the statements that have a new period."""
+
+    @pytest.fixture
+    def isolated_cache(self, tmp_path):
+        """Use a fresh, write-through cache instead of the global one."""
+        test_cache = PersistentCache(
+            str(tmp_path / "cache.db"), backend="sqlite", write_mode="immediate"
+        )
+        with patch("features.fundamental_data.alphavantage_adapter.cache", test_cache):
+            yield test_cache
+        test_cache.close()
+
+    @pytest.fixture
+    def fetchers(self):
+        """Mock the API fetchers of the overview and the statements."""
+        with (
+            patch.object(AlphaVantageAPI, "_fetch_ticker_overview") as overview,
+            patch.object(
+                AlphaVantageAPI,
+                "_fetch_balance_sheet",
+                return_value=DataResult([], False),
+            ) as balance_sheet,
+            patch.object(
+                AlphaVantageAPI,
+                "_fetch_income_statement",
+                return_value=DataResult([], False),
+            ) as income_statement,
+            patch.object(
+                AlphaVantageAPI, "_fetch_cash_flow", return_value=DataResult([], False)
+            ) as cash_flow,
+        ):
+            yield {
+                "overview": overview,
+                "balance_sheet": balance_sheet,
+                "income_statement": income_statement,
+                "cash_flow": cash_flow,
+            }
+
+    def cache_statements(self, test_cache, symbol: str, latest_quarter: str):
+        """Cache an annual report and a raw latest quarter for every statement."""
+        for data_type, model in STATEMENT_MODELS.items():
+            test_cache.set_quarterly_payload(
+                data_type,
+                symbol,
+                [{"fiscalDateEnding": latest_quarter, "reportedCurrency": "USD"}],
+            )
+            getattr(test_cache, f"set_{data_type}")(
+                symbol,
+                [
+                    model(
+                        fiscal_date_ending="2023-09-30",
+                        reported_currency="USD",
+                        annual_report=True,
+                    )
+                ],
+            )
+
+    def overview(self, latest_quarter: str | None) -> StockMetaData:
+        return StockMetaData(symbol="AAPL", name="Apple", latest_quarter=latest_quarter)
+
+    def test_plan_compares_latest_cached_period(self, isolated_cache):
+        """Test that only statements older than LatestQuarter are planned."""
+        self.cache_statements(isolated_cache, "AAPL", "2023-12-31")
+        isolated_cache.set_quarterly_payload(
+            "cash_flow",
+            "AAPL",
+            [{"fiscalDateEnding": "2023-09-30", "reportedCurrency": "USD"}],
+        )
+
+        plan = plan_refresh("AAPL", self.overview("2023-12-31"))
+
+        assert plan.cached_periods == {
+            "balance_sheet": "2023-12-31",
+            "cash_flow": "2023-09-30",
+            "income_statement": "2023-12-31",
+        }
+        assert plan.statements_to_fetch == ["cash_flow"]
+        assert plan.api_calls == 1
+
+    def test_current_symbol_costs_no_call(self, isolated_cache, fetchers):
+        """Test that a fresh overview and current statements are not fetched again."""
+        self.cache_statements(isolated_cache, "AAPL", "2023-12-31")
+        isolated_cache.set_overview("AAPL", self.overview("2023-12-31"))
+        metadata = isolated_cache.get_entry_metadata("balance_sheet", "AAPL")
+        metadata.fetched_at = "2000-01-01T00:00:00"
+
+        plan = refresh_ticker("AAPL")
+
+        assert plan.api_calls == 0
+        assert not any(fetcher.called for fetcher in fetchers.values())
+        # Statements confirmed current get a new TTL
+        assert not isolated_cache.policy.is_expired(
+            isolated_cache.get_entry_metadata("balance_sheet", "AAPL")
+        )
+
+    def test_missing_latest_quarter_keeps_ttl_running(self, isolated_cache, fetchers):
+        """Test that statements are not revalidated without a LatestQuarter."""
+        self.cache_statements(isolated_cache, "AAPL", "2023-12-31")
+        isolated_cache.set_overview("AAPL", self.overview(None))
+        isolated_cache.set_fetched_at("balance_sheet", "AAPL", "2000-01-01T00:00:00")
+        fetched_at = isolated_cache.get_entry_metadata("cash_flow", "AAPL").fetched_at
+
+        plan = refresh_ticker("AAPL")
+
+        # Only the expired statement is fetched, the others keep their fetch time
+        assert plan.statements_to_fetch == ["balance_sheet"]
+        fetchers["balance_sheet"].assert_called_once_with("AAPL")
+        assert (
+            isolated_cache.get_entry_metadata("cash_flow", "AAPL").fetched_at
+            == fetched_at
+        )
+
+    def test_new_quarter_refetches_statements(self, isolated_cache, fetchers):
+        """Test that a stale overview announcing a new quarter triggers the statements."""
+        self.cache_statements(isolated_cache, "AAPL", "2023-12-31")
+        fetchers["overview"].return_value = DataResult(
+            self.overview("2024-03-31"), from_cache=False
+        )
+
+        plan = refresh_ticker("AAPL")
+
+        assert plan.overview_fetched
+        assert plan.statements_to_fetch == [
+            "balance_sheet",
+            "cash_flow",
+            "income_statement",
+        ]
+        assert plan.api_calls == 4
+        for data_type in ("balance_sheet", "income_statement", "cash_flow"):
+            fetchers[data_type].assert_called_once_with("AAPL")
+
+    def test_unpublished_quarter_is_not_refetched(self, isolated_cache, fetchers):
+        """Test that statements already fetched against LatestQuarter wait for its TTL."""
+        isolated_cache.set_overview("AAPL", self.overview("2024-03-31"))
+        self.cache_statements(isolated_cache, "AAPL", "2023-12-31")
+
+        plan = refresh_ticker("AAPL")
+
+        assert plan.statements_to_fetch == []
+        assert plan.api_calls == 0
+
+        isolated_cache.set_fetched_at("cash_flow", "AAPL", "2000-01-01T00:00:00")
+        plan = plan_refresh("AAPL", self.overview("2024-03-31"))
+
+        assert plan.statements_to_fetch == ["cash_flow"]
+
+    def test_throttled_overview_skips_statements(self, isolated_cache, fetchers):
+        """Test that no statement is requested while the API is rate limited."""
+        fetchers["overview"].return_value = ThrottledResult(None, "rate limited")
+
+        plan = refresh_ticker("AAPL")
+
+        assert plan.api_calls == 1
+        assert not any(fetchers[name].called for name in ("balance_sheet", "cash_flow"))
+
+    def test_universe_refresh_costs_one_call_per_current_symbol(
+        self, isolated_cache, fetchers
+    ):
+        """Test that symbols without a new period only pay for their overview."""
+        for symbol in ("AAPL", "MSFT", "NVDA"):
+            self.cache_statements(isolated_cache, symbol, "2023-12-31")
+        fetchers["overview"].return_value = DataResult(
+            self.overview("2023-12-31"), from_cache=False
+        )
+
+        with patch.object(isolated_cache, "flush", wraps=isolated_cache.flush) as flush:
+            plans = refresh_universe(["AAPL", "MSFT", "NVDA"], batch_size=2)
+
+        assert [plan.symbol for plan in plans] == ["AAPL", "MSFT", "NVDA"]
+        assert sum(plan.api_calls for plan in plans) == 3
+        assert not any(
+            fetcher.called for name, fetcher in fetchers.items() if name != "overview"
+        )
+        # Once after the first batch of two symbols and once at the end
+        assert flush.call_count == 2
+
+    def test_universe_refresh_does_not_defer_other_writes(
+        self, isolated_cache, fetchers
+    ):
+        """Test that writes made while a universe refresh runs persist right away."""
+        self.cache_statements(isolated_cache, "AAPL", "2023-12-31")
+        fetchers["overview"].return_value = DataResult(
+            self.overview("2023-12-31"), from_cache=False
+        )
+        persisted = []
+
+        def on_plan(plan):
+            isolated_cache.set_overview(
+                "MSFT", StockMetaData(symbol="MSFT", name="Microsoft")
+            )
+            persisted.append(isolated_cache.backend.get("overview", "MSFT"))
+
+        refresh_universe(["AAPL"], on_plan=on_plan)
+
+        assert persisted[0] is not None
@@ -0,0 +1,53 @@
+from features.fundamental_data.response_archive import ResponseArchive
+
+
+class TestResponseArchive:
+    """Test suite for the content-addressed archive of raw API responses."""
+
+    def test_identical_bodies_share_one_object(self, tmp_path):
+        """Test that bodies are stored once per content and read back unchanged."""
+        archive = ResponseArchive(tmp_path)
+        first = archive.store(
+            "OVERVIEW", {"symbol": "AAPL"}, {"Symbol": "AAPL", "a": 1}
+        )
+        second = archive.store(
+            "OVERVIEW", {"symbol": "AAPL"}, {"a": 1, "Symbol": "AAPL"}
+        )
+
+        assert first.digest == second.digest
+        assert archive.load(first.digest) == {"Symbol": "AAPL", "a": 1}
+        stats = archive.stats()
+        assert stats["responses"] == 2
+        assert stats["objects"] == 1
+        assert stats["compressed_bytes"] > 0
+
+    def test_entries_are_keyed_by_endpoint_symbol_and_time(self, tmp_path):
+        """Test that the index is filtered by endpoint and symbol in fetch order."""
+        archive = ResponseArchive(tmp_path)
+        archive.store(
+            "OVERVIEW", {"symbol": "AAPL"}, {"v": 2}, fetched_at="2024-02-01T00:00:00"
+        )
+        archive.store(
+            "OVERVIEW", {"symbol": "AAPL"}, {"v": 1}, fetched_at="2024-01-01T00:00:00"
+        )
+        archive.store("OVERVIEW", {"symbol": "MSFT"}, {"v": 3})
+        archive.store(
+            "FX_MONTHLY", {"from_symbol": "EUR", "to_symbol": "USD"}, {"v": 4}
+        )
+
+        entries = archive.entries("OVERVIEW", "AAPL")
+        assert [archive.load(entry.digest) for entry in entries] == [{"v": 1}, {"v": 2}]
+        assert archive.entries(symbol="EUR")[0].function == "FX_MONTHLY"
+
+        latest = {(entry.function, entry.symbol): entry for entry in archive.latest()}
+        assert len(latest) == 3
+        assert archive.load(latest[("OVERVIEW", "AAPL")].digest) == {"v": 2}
+
+    def test_incomplete_index_record_is_ignored(self, tmp_path):
+        """Test that a torn index line left by a crash does not break reading."""
+        archive = ResponseArchive(tmp_path)
+        archive.store("OVERVIEW", {"symbol": "AAPL"}, {"v": 1})
+        with open(archive.index_path, "ab") as f:
+            f.write(b'{"function": "OVER')
+
+        assert len(archive.entries()) == 1
@@ -0,0 +1,86 @@
+import threading
+import time
+
+from features.fundamental_data.single_flight import SingleFlight
+
+
+def wait_for_waiters(single_flight: SingleFlight, key, count: int):
+    """Block until `count` callers wait on the call running for a key."""
+    deadline = time.monotonic() + 5
+    while single_flight.waiters(key) != count:
+        assert time.monotonic() < deadline, "callers did not join the running call"
+        time.sleep(0.001)
+
+
+class TestSingleFlight:
+    """Test suite for coalescing concurrent calls."""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test that callers arriving while a call runs get its result."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return ["AAPL"]
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(single_flight.do("key", fetch))
+            )
+            for _ in range(3)
+        ]
+        threads[0].start()
+        wait_for_waiters(single_flight, "key", 0)
+        for thread in threads[1:]:
+            thread.start()
+        wait_for_waiters(single_flight, "key", 2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert results == [["AAPL"]] * 3
+        assert results[0] is results[1]
+        assert single_flight.coalesced == 2
+        assert single_flight.waiters("key") is None
+
+    def test_errors_are_shared_and_not_remembered(self):
+        """Test that waiters see the exception and a later call runs again."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise ValueError("API down")
+
+        errors = []
+
+        def call():
+            try:
+                single_flight.do("key", failing)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(2)]
+        threads[0].start()
+        wait_for_waiters(single_flight, "key", 0)
+        threads[1].start()
+        wait_for_waiters(single_flight, "key", 1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(errors) == 2
+        assert single_flight.do("key", lambda: "recovered") == "recovered"
+
+    def test_different_keys_run_independently(self):
+        """Test that calls with different keys are not coalesced."""
+        single_flight = SingleFlight()
+
+        assert single_flight.do("a", lambda: 1) == 1
+        assert single_flight.do("b", lambda: 2) == 2
+        assert single_flight.coalesced == 0
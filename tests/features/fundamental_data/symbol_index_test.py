@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import pytest
+
+from features.fundamental_data import symbol_index
+from features.fundamental_data.cache import PersistentCache
+from features.fundamental_data.symbol_index import SymbolIndex
+
+
+class TestSymbolIndex:
+    """Test suite for the symbol search index."""
+
+    @pytest.fixture
+    def index(self):
+        index = SymbolIndex()
+        index.add("AAPL", "Apple Inc")
+        index.add("APLE", "Apple Hospitality REIT Inc")
+        index.add("AA", "Alcoa Corp")
+        index.add("MSFT", "Microsoft Corporation")
+        return index
+
+    def test_ranks_exact_before_prefix_before_token(self, index):
+        """Test that an exact symbol comes first, then prefixes, then name matches."""
+        assert index.search("aa") == ["AA", "AAPL"]
+        assert index.search("apple") == ["AAPL", "APLE"]
+        assert index.search("ap") == ["APLE", "AAPL"]
+
+    def test_partial_name_match(self, index):
+        """Test that partly typed company names match, after whole-word matches."""
+        assert index.search("app") == ["AAPL", "APLE"]
+        assert index.search("micro") == ["MSFT"]
+        assert index.search("apple hosp") == ["APLE"]
+        assert index.search("alc") == ["AA"]
+
+    def test_query_containing_full_name(self, index):
+        """Test that a query spelling out a company name matches it."""
+        assert index.search("Apple Inc stock") == ["AAPL"]
+
+    def test_fuzzy_name_match(self, index):
+        """Test that misspelled names fall back to trigram similarity."""
+        assert index.search("microsft") == ["MSFT"]
+        assert index.search("amazon") == []
+
+    def test_limit_skips_fuzzy_matches(self, index):
+        """Test that the limit truncates ranked results."""
+        assert index.search("apple", limit=1) == ["AAPL"]
+
+    def test_limit_stops_before_lower_ranks(self, index):
+        """Test that lower ranks are not evaluated once the limit is filled."""
+        with (
+            patch.object(index, "_token_matches") as tokens,
+            patch.object(index, "_fuzzy_matches") as fuzzy,
+        ):
+            assert index.search("a", limit=2) == ["AA", "AAPL"]
+
+        tokens.assert_not_called()
+        fuzzy.assert_not_called()
+
+    def test_common_trigrams_only_confirm_fuzzy_candidates(self, index):
+        """Test that trigrams shared by many names still count for found candidates."""
+        index.add("MU", "Micron Technology")
+
+        with patch.object(symbol_index, "MAX_TRIGRAM_POSTINGS", 1):
+            assert index.search("microsft") == ["MSFT"]
+
+    def test_replace_and_remove(self, index):
+        """Test that re-adding a symbol replaces its postings."""
+        index.add("AA", "Alcoa Aluminum")
+        assert index.search("alcoa corp") == []
+        assert index.search("aluminum") == ["AA"]
+
+        index.remove("AA")
+        assert "AA" not in index
+        assert index.search("aa") == ["AAPL"]
+
+    def test_cache_search_uses_index(self, tmp_path):
+        """Test that add_symbol_results keeps the cache index current across reloads."""
+        path = str(tmp_path / "cache.db")
+        cache = PersistentCache(path, backend="sqlite")
+        cache.add_symbol_results(
+            [
+                {"1. symbol": "APLE", "2. name": "Apple Hospitality REIT Inc"},
+                {"1. symbol": "AAPL", "2. name": "Apple Inc"},
+            ]
+        )
+        cache.close()
+
+        reopened = PersistentCache(path, backend="sqlite")
+        results = reopened.search_symbols("Apple")
+
+        assert [result["1. symbol"] for result in results] == ["AAPL", "APLE"]
+        assert reopened.search_symbols("Tesla") is None
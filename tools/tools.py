@@ -1,56 +1,52 @@
-import requests
 from mcp_server import mcp
-from urllib.parse import quote_plus
-from features.fundamental_data.alphavantage_adapter import AlphaVantageAPI
+from features.fundamental_data.http_client import AlphaVantageError
 from features.fundamental_data.model import FundamentalData
-from config.env import ALPHAVANTAGE_API_KEY
+from features.fundamental_data.provider import get_provider
 
 
 @mcp.tool()
 def get_stock_price(symbol: str) -> float:
-    """Get the price of a stock ticket symbol via alphavantage API"""
+    """Get the price of a stock ticket symbol via the configured data provider"""
     print(f"Getting stock price for {symbol}")
-    url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={ALPHAVANTAGE_API_KEY}"
-    response = requests.get(url)
-    data = response.json()
-    return data
+    try:
+        return get_provider().get_stock_quote(symbol)
+    except AlphaVantageError as e:
+        # Rate limits and API errors are reported to the agent instead of raised
+        return {"error": str(e)}
 
 
 @mcp.tool()
 def get_ticker_overview(symbol: str) -> FundamentalData:
-    """Get the overview of a stock ticket symbol via alphavantage API"""
-    return AlphaVantageAPI.get_ticker_overview(symbol)
+    """Get the overview of a stock ticket symbol via the configured data provider"""
+    return get_provider().get_ticker_overview(symbol)
 
 
 @mcp.tool()
 def get_stock_ticker(search_string: str) -> str:
-    """Get the stock ticker symbol for a given search string via alphavantage API"""
+    """Get the stock ticker symbol for a given search string via the configured data provider"""
     print(f"Getting stock ticker symbol for {search_string}")
 
-    search_string = quote_plus(search_string)
-    url = f"https://www.alphavantage.co/query?function=SYMBOL_SEARCH&keywords={search_string}&apikey={ALPHAVANTAGE_API_KEY}"
-    response = requests.get(url)
-    data = response.json()
+    matches = get_provider().get_ticker_symbol(search_string).data
 
-    if data["bestMatches"]:
-        return data["bestMatches"][0]["1. symbol"]
+    if matches:
+        return matches[0]["1. symbol"]
     else:
         return "No stock ticker symbol found"
 
 
 @mcp.tool()
 def get_ticker_balance_sheet(symbol: str) -> FundamentalData:
-    """Get the balance sheet of a stock ticket symbol via alphavantage API"""
-    return AlphaVantageAPI.get_balance_sheet(symbol)
+    """Get the balance sheet of a stock ticket symbol via the configured data provider"""
+    return get_provider().get_balance_sheet(symbol)
 
 
 @mcp.tool()
 def get_ticker_cash_flow(symbol: str) -> FundamentalData:
-    """Get the cash flow of a stock ticket symbol via alphavantage API"""
-    return AlphaVantageAPI.get_cash_flow(symbol)
+    """Get the cash flow of a stock ticket symbol via the configured data provider"""
+    return get_provider().get_cash_flow(symbol)
 
 
 @mcp.tool()
 def get_ticker_income_statement(symbol: str) -> FundamentalData:
-    """Get the income statement of a stock ticket symbol via alphavantage API"""
-    return AlphaVantageAPI.get_income_statement(symbol)
+    """Get the income statement of a stock ticket symbol via the configured data provider"""
+    return get_provider().get_income_statement(symbol)
@@ -7,12 +7,14 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import END, START, StateGraph
 
 from config.env import GOOGLE_API_KEY
-from features.fundamental_data.alphavantage_adapter import AlphaVantageAPI
+from features.fundamental_data.alphavantage_adapter import DataResult
 from features.fundamental_data.model import FundamentalData
+from features.fundamental_data.periods import ANNUAL_ONLY
 from features.fundamental_data.processor import (
+    convert_time_series_to_usd,
     get_fundamental_data_time_series,
-    process_fundamental_data_to_usd,
 )
+from features.fundamental_data.provider import get_provider
 from features.llm.google_genai import get_google_genai_llm
 from features.evaluation.value_evaluation import evaluate
 from features.research.firecrawl_adapter import FirecrawlAdapter
@@ -21,6 +23,13 @@ from ui.cli import get_cli
 from workflow.model import ResearchState
 from workflow.prompts import GenericPrompts
 
+TICKER_DATA_LABELS = {
+    "overview": "Company overview",
+    "balance_sheet": "Balance sheet",
+    "income_statement": "Income statement",
+    "cash_flow": "Cash flow",
+}
+
 
 class Workflow:
     def __init__(self):
@@ -30,6 +39,7 @@ class Workflow:
         self.prompts = GenericPrompts()
         self.pdf_agent = PdfAgent()
         self.cli = get_cli()
+        self.provider = get_provider()
 
     def _build_workflow(self):
         graph_builder = StateGraph(ResearchState)
@@ -100,8 +110,8 @@ class Workflow:
         )
 
         try:
-            # Get search results from Alpha Vantage
-            search_result = AlphaVantageAPI.get_ticker_symbol(search_query)
+            # Get search results from the data provider
+            search_result = self.provider.get_ticker_symbol(search_query)
 
             if not search_result.data:
                 self.cli.show_progress_error("No matching stocks found.")
@@ -125,7 +135,7 @@ class Workflow:
                 )
             else:
                 self.cli.show_progress_success_api(
-                    f"Found {len(search_result.data)} matching stocks from Alpha Vantage API"
+                    f"Found {len(search_result.data)} matching stocks from {self.provider.name}"
                 )
 
                 # Let user select from results
@@ -168,89 +178,20 @@ class Workflow:
         )
 
         try:
-            # Fetch all fundamental data
-            self.cli.show_progress_start("Fetching company overview...")
-            overview_result = AlphaVantageAPI.get_ticker_overview(state.ticker_symbol)
-            if overview_result.data:
-                if overview_result.from_cache:
-                    cache_time = (
-                        overview_result.cache_timestamp[:19]
-                        if overview_result.cache_timestamp
-                        else "unknown time"
-                    )
-                    self.cli.show_progress_success_cached(
-                        f"Company overview retrieved from cache (saved at {cache_time})"
-                    )
-                else:
-                    self.cli.show_progress_success_api(
-                        "Company overview retrieved from Alpha Vantage API"
-                    )
-            else:
-                self.cli.show_progress_warning("Company overview not available")
-
-            self.cli.show_progress_start("Fetching balance sheet data...")
-            balance_sheet_result = AlphaVantageAPI.get_balance_sheet(
-                state.ticker_symbol
+            # Fetch all fundamental data concurrently, reporting each as it arrives
+            self.cli.show_progress_start(
+                "Fetching company overview, balance sheet, income statement and cash flow..."
             )
-            if balance_sheet_result.data and len(balance_sheet_result.data) > 0:
-                periods_count = len(balance_sheet_result.data)
-                if balance_sheet_result.from_cache:
-                    cache_time = (
-                        balance_sheet_result.cache_timestamp[:19]
-                        if balance_sheet_result.cache_timestamp
-                        else "unknown time"
-                    )
-                    self.cli.show_progress_success_cached(
-                        f"Balance sheet retrieved ({periods_count} periods) from cache (saved at {cache_time})"
-                    )
-                else:
-                    self.cli.show_progress_success_api(
-                        f"Balance sheet retrieved ({periods_count} periods) from Alpha Vantage API"
-                    )
-            else:
-                self.cli.show_progress_warning("Balance sheet data not available")
-
-            self.cli.show_progress_start("Fetching income statement...")
-            income_statement_result = AlphaVantageAPI.get_income_statement(
-                state.ticker_symbol
+            # The analysis runs on annual periods; quarterly reports stay unparsed
+            results = self.provider.get_ticker_data(
+                state.ticker_symbol,
+                on_result=self._report_ticker_data_result,
+                periods=ANNUAL_ONLY,
             )
-            if income_statement_result.data and len(income_statement_result.data) > 0:
-                periods_count = len(income_statement_result.data)
-                if income_statement_result.from_cache:
-                    cache_time = (
-                        income_statement_result.cache_timestamp[:19]
-                        if income_statement_result.cache_timestamp
-                        else "unknown time"
-                    )
-                    self.cli.show_progress_success_cached(
-                        f"Income statement retrieved ({periods_count} periods) from cache (saved at {cache_time})"
-                    )
-                else:
-                    self.cli.show_progress_success_api(
-                        f"Income statement retrieved ({periods_count} periods) from Alpha Vantage API"
-                    )
-            else:
-                self.cli.show_progress_warning("Income statement data not available")
-
-            self.cli.show_progress_start("Fetching cash flow data...")
-            cash_flow_result = AlphaVantageAPI.get_cash_flow(state.ticker_symbol)
-            if cash_flow_result.data and len(cash_flow_result.data) > 0:
-                periods_count = len(cash_flow_result.data)
-                if cash_flow_result.from_cache:
-                    cache_time = (
-                        cash_flow_result.cache_timestamp[:19]
-                        if cash_flow_result.cache_timestamp
-                        else "unknown time"
-                    )
-                    self.cli.show_progress_success_cached(
-                        f"Cash flow retrieved ({periods_count} periods) from cache (saved at {cache_time})"
-                    )
-                else:
-                    self.cli.show_progress_success_api(
-                        f"Cash flow retrieved ({periods_count} periods) from Alpha Vantage API"
-                    )
-            else:
-                self.cli.show_progress_warning("Cash flow data not available")
+            overview_result = results["overview"]
+            balance_sheet_result = results["balance_sheet"]
+            income_statement_result = results["income_statement"]
+            cash_flow_result = results["cash_flow"]
 
             # Create fundamental data object using the actual data from results
             fundamental_data = FundamentalData(
@@ -270,6 +211,32 @@ class Workflow:
             self.cli.show_progress_error(f"Error analyzing fundamental data: {str(e)}")
             return {}
 
+    def _report_ticker_data_result(self, data_type: str, result: DataResult):
+        """Show where a fetched data type came from, or that it is missing."""
+        label = TICKER_DATA_LABELS[data_type]
+        if not result.data:
+            if data_type == "overview":
+                self.cli.show_progress_warning(f"{label} not available")
+            else:
+                self.cli.show_progress_warning(f"{label} data not available")
+            return
+
+        retrieved = f"{label} retrieved"
+        if data_type != "overview":
+            retrieved += f" ({len(result.data)} periods)"
+
+        if result.from_cache:
+            cache_time = (
+                result.cache_timestamp[:19]
+                if result.cache_timestamp
+                else "unknown time"
+            )
+            self.cli.show_progress_success_cached(
+                f"{retrieved} from cache (saved at {cache_time})"
+            )
+        else:
+            self.cli.show_progress_success_api(f"{retrieved} from {self.provider.name}")
+
     def _analyze_ticker_data(self, state: ResearchState) -> dict:
         """Analyze fundamental data for the selected ticker."""
         if not state.ticker_symbol or not state.fundamental_data:
@@ -288,11 +255,25 @@ class Workflow:
             and state.fundamental_data.income_statement[0].reported_currency
             != state.fundamental_data.overview.currency
         ):
-            exchange_rate = AlphaVantageAPI.get_currency_ratio(
-                state.fundamental_data.income_statement[0].reported_currency
-            )
-            fundamental_data_time_series = process_fundamental_data_to_usd(
-                exchange_rate, fundamental_data_time_series
+            # Each period is converted at the rate of its own fiscal date
+            currencies = {
+                period_data.reported_currency
+                for period_data in fundamental_data_time_series
+            }
+            fx_rates = self.provider.get_fx_rates(currencies)
+            fallback_rates = {
+                currency: self.provider.get_currency_ratio(currency)
+                for currency in currencies
+                if currency not in fx_rates
+            }
+            # Rates the API could not provide, e.g. when rate limited, are skipped
+            fallback_rates = {
+                currency: rate
+                for currency, rate in fallback_rates.items()
+                if rate is not None
+            }
+            fundamental_data_time_series = convert_time_series_to_usd(
+                fundamental_data_time_series, fx_rates, fallback_rates
             )
 
         # Limit to analysis years